@@ -0,0 +1 @@
+__version__ = '.'.join(map(str, (0, 0, 1)))
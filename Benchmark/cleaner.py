@@ -0,0 +1,79 @@
+from pandas import DataFrame
+from pandas.core.dtypes.common import is_numeric_dtype
+
+from Data.cleaner import find_negatives
+
+from .common import timed
+from .synthetic import bitcoin_frame, kaggle_rows
+
+
+def legacy_negatives(df: DataFrame) -> DataFrame:
+    """
+
+    Negative value removal as done by clean_bitcoin before the single-pass validation.
+
+    Args:
+        df: Raw Bitcoin DataFrame.
+
+    Returns:
+        The filtered DataFrame.
+
+    """
+    for column in df.columns:
+        if not is_numeric_dtype(df[column]):
+            continue
+
+        if any(df[column] < 0):
+            df = df[df[column] >= 0]
+
+    return df
+
+
+def single_pass_negatives(df: DataFrame) -> DataFrame:
+    """
+
+    Negative value removal as done by clean_bitcoin.
+
+    Args:
+        df: Raw Bitcoin DataFrame.
+
+    Returns:
+        The filtered DataFrame.
+
+    """
+    invalid, _ = find_negatives(df)
+
+    return df[~invalid]
+
+
+def bench_validation(rows: int = kaggle_rows, repeat: int = 3) -> dict:
+    """
+
+    Compares the legacy per-column filtering with the single-pass validation.
+
+    Args:
+        rows: Number of synthetic rows.
+        repeat: Number of runs of each implementation.
+
+    Returns:
+        Wall times in seconds of both implementations and the speedup.
+
+    """
+    df: DataFrame = bitcoin_frame(rows)
+
+    legacy_t, legacy_df = timed(legacy_negatives, df, repeat)
+    single_t, single_df = timed(single_pass_negatives, df, repeat)
+
+    # Both must remove exactly the same rows
+    assert legacy_df.index.equals(single_df.index)
+
+    return {
+        'rows': rows,
+        'legacy': legacy_t,
+        'single_pass': single_t,
+        'speedup': legacy_t / single_t,
+    }
+
+
+if __name__ == '__main__':
+    print(bench_validation())
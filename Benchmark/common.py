@@ -0,0 +1,89 @@
+from os import path
+from resource import getrusage, RUSAGE_SELF
+from sys import platform
+from time import perf_counter
+from tracemalloc import start, stop, get_traced_memory, is_tracing, reset_peak
+from typing import Callable, Any
+
+
+def measure(func: Callable, *args: Any, **kwargs: Any) -> tuple[dict, Any]:
+    """
+
+    Runs the given function once, tracing its allocations.
+    NumPy and Pandas buffers are reported to tracemalloc, so their size is included.
+
+    Args:
+        func: Function to measure.
+        *args: Arguments given to the function.
+        **kwargs: Keyword arguments given to the function.
+
+    Returns:
+        The wall time in seconds and the peak traced memory in MB, along with the output of the function.
+
+    """
+    tracing: bool = is_tracing()
+
+    if not tracing:
+        start()
+
+    # Only the allocations made from here count
+    reset_peak()
+    base, _ = get_traced_memory()
+
+    t0: float = perf_counter()
+    res: Any = func(*args, **kwargs)
+    wall: float = perf_counter() - t0
+
+    _, peak = get_traced_memory()
+
+    if not tracing:
+        stop()
+
+    return {
+        'wall': wall,
+        'peak_mb': (peak - base) / 2 ** 20,
+    }, res
+
+
+def timed(func: Callable[[Any], Any], arg: Any, repeat: int) -> tuple[float, Any]:
+    """
+
+    Args:
+        func: Function to time.
+        arg: Input of the function.
+        repeat: Number of runs, the best one is kept.
+
+    Returns:
+        The best wall time in seconds, along with the output of the function.
+
+    """
+    best: float = float('inf')
+    res: Any = None
+
+    for _ in range(repeat):
+        t0: float = perf_counter()
+        res = func(arg)
+        best = min(best, perf_counter() - t0)
+
+    return best, res
+
+
+def peak_rss_mb() -> float:
+    """
+
+    Unlike tracemalloc, this includes the memory allocated by Arrow and other native libraries.
+    On Linux, the peak of the current address space is read, since the peak reported by getrusage
+    carries over the peak of the parent process when a process is spawned.
+
+    Returns:
+        The peak resident set size of this process so far, in MB.
+
+    """
+    if path.exists('/proc/self/status'):
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 2 ** 10
+
+    # Reported in bytes on macOS, and in KB elsewhere
+    return getrusage(RUSAGE_SELF).ru_maxrss / (2 ** 20 if platform == 'darwin' else 2 ** 10)
@@ -0,0 +1,97 @@
+from numpy import resize
+from pandas import DatetimeIndex, Series, date_range, to_datetime
+from typing import Callable
+
+from Data.manifest import Source, sources
+from Data.timestamps import date_formats, to_timestamps
+
+from .common import timed
+from .synthetic import kaggle_rows
+
+
+# Rows parsed for each daily source, the daily files are repeated to reach a measurable size
+daily_rows: int = 250_000
+
+
+def date_strings(source: Source, rows: int) -> Series:
+    """
+
+    Generates raw date strings in the format of the given source.
+    Daily dates cycle over 2017 to 2023, so that two-digit years stay in the same century.
+
+    Args:
+        source: Data source whose format is used.
+        rows: Number of strings to generate.
+
+    Returns:
+        The generated strings.
+
+    """
+    if source == 'bitcoin':
+        dates: DatetimeIndex = date_range('2017-08-17', periods=rows, freq='min')
+    else:
+        dates = date_range('2017-01-01', '2023-12-31', freq='D')
+
+    return Series(resize(dates.strftime(date_formats[source]).to_numpy(), rows), dtype='str')
+
+
+# Parsing as done by each cleaner before the shared timestamp parsing
+legacy_parsers: dict[Source, Callable[[Series], Series]] = {
+    'bitcoin': lambda s: to_datetime(s),
+    'dxy': lambda s: to_datetime(s.map(lambda d: f"{d[:-2]}20{d[-2:]}"), format="%m/%d/%Y"),
+    'fearGreed': lambda s: to_datetime(s, format="%d-%m-%Y"),
+    'fedFunds': lambda s: to_datetime(s, format="%Y-%m-%d"),
+    'sentiment': lambda s: to_datetime(s, format="%Y-%m-%d"),
+}
+
+
+def bench_source(source: Source, rows: int, repeat: int = 3) -> dict:
+    """
+
+    Compares the legacy parsing of a source with the shared vectorized parsing.
+
+    Args:
+        source: Data source to parse.
+        rows: Number of date strings.
+        repeat: Number of runs of each implementation.
+
+    Returns:
+        Wall times in seconds of both implementations and the speedup.
+
+    """
+    strings: Series = date_strings(source, rows)
+
+    legacy_t, legacy_res = timed(legacy_parsers[source], strings, repeat)
+    vector_t, vector_res = timed(lambda s: to_timestamps(s, source), strings, repeat)
+
+    # Both must give the same instants
+    assert (DatetimeIndex(legacy_res).as_unit('ns') == vector_res).all()
+
+    return {
+        'rows': rows,
+        'legacy': legacy_t,
+        'vectorized': vector_t,
+        'speedup': legacy_t / vector_t,
+    }
+
+
+def bench_dates(bitcoin_rows: int = kaggle_rows, rows: int = daily_rows, repeat: int = 3) -> dict[Source, dict]:
+    """
+
+    Args:
+        bitcoin_rows: Number of minute timestamps parsed for Bitcoin.
+        rows: Number of dates parsed for each daily source.
+        repeat: Number of runs of each implementation.
+
+    Returns:
+        The results of bench_source for every source.
+
+    """
+    return {
+        source: bench_source(source, bitcoin_rows if source == 'bitcoin' else rows, repeat) for source in sources
+    }
+
+
+if __name__ == '__main__':
+    for name, res in bench_dates().items():
+        print(name, res)
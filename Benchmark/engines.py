@@ -0,0 +1,108 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from os import path
+from pandas import DataFrame, read_parquet
+from pandas.testing import assert_frame_equal
+from time import perf_counter
+from typing import Callable
+
+from Data.cleaner import clean_bitcoin, clean_bitcoin_stream, clean_dxy, clean_fear_greed, clean_fed_funds, \
+    clean_sentiment, clean_source
+from Data.io import dir_path
+from Data.manifest import Source, sources
+
+from .common import peak_rss_mb
+
+
+# Pandas cleaners, run as get_data runs them
+pandas_cleaners: dict[Source, Callable] = {
+    'bitcoin': clean_bitcoin,
+    'dxy': clean_dxy,
+    'fearGreed': clean_fear_greed,
+    'fedFunds': clean_fed_funds,
+    'sentiment': clean_sentiment,
+}
+
+# Relative difference allowed between the floats written by two engines. Arrow parses each decimal
+# to the nearest float, the default parser of pandas can be one bit off, which it is for about a quarter of the cells
+float_rtol: float = 1e-15
+
+# Compared implementations, the streaming pandas cleaner only exists for Bitcoin
+runners: dict[str, Callable[[Source], object]] = {
+    'pandas': lambda source: pandas_cleaners[source](),
+    'pandas_stream': lambda source: clean_bitcoin_stream(),
+    'arrow': lambda source: clean_source(source, 'arrow'),
+}
+
+
+def run(source: Source, runner: str) -> dict:
+    """
+
+    Cleans the source once, meant to be run in a fresh process so that its peak RSS is its own.
+
+    Args:
+        source: Data source to clean.
+        runner: Name of the implementation in runners.
+
+    Returns:
+        The wall time in seconds, the peak RSS in MB, and the RSS growth in MB over the peak before cleaning.
+
+    """
+    base: float = peak_rss_mb()
+
+    t0: float = perf_counter()
+    runners[runner](source)
+    wall: float = perf_counter() - t0
+
+    peak: float = peak_rss_mb()
+
+    return {
+        'wall': wall,
+        'peak_rss_mb': peak,
+        'rss_growth_mb': peak - base,
+    }
+
+
+def bench_engines() -> dict[Source, dict]:
+    """
+
+    Compares the pandas and arrow cleaners side by side on the raw files present in the Data directory.
+    Sources without a raw file are skipped. Every run rewrites the clean file of its source with the same content,
+    except for the floats, which the engines parse to within one bit of each other, see float_rtol.
+    Must be run from the directory holding config.json.
+
+    Returns:
+        The results of run for each implementation of each source.
+
+    """
+    res: dict[Source, dict] = {}
+
+    for source in sources:
+        if not path.exists(path.join(dir_path, source, "data.csv")):
+            continue
+
+        res[source] = {}
+        expected: DataFrame | None = None
+
+        for runner in runners:
+            if runner == 'pandas_stream' and source != 'bitcoin':
+                continue
+
+            # Spawned, so that the process does not start with the memory of this one
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                res[source][runner] = executor.submit(run, source, runner).result()
+
+            df: DataFrame = read_parquet(path.join(dir_path, source, "clean.parquet"))
+
+            # Every implementation must write the same data, up to the last bit of the floats
+            if expected is None:
+                expected = df
+            else:
+                assert_frame_equal(df, expected, check_exact=False, rtol=float_rtol, atol=0)
+
+    return res
+
+
+if __name__ == '__main__':
+    for name, results in bench_engines().items():
+        print(name, results)
@@ -0,0 +1,93 @@
+from subprocess import run, CompletedProcess
+from sys import executable, exit
+
+
+# Modules whose import time is measured, Server is what the package entry point imports
+entry_modules: tuple[str, ...] = ('Server', 'Data', 'Train', 'Observer', 'Sentiment', 'Crawler')
+
+# Maximum import time of the entry point in seconds, before any model is loaded
+startup_budget: float = 1.0
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+
+    Imports the module in a fresh interpreter with -X importtime.
+    Must be run from the directory holding config.json, as the Config package reads it on import.
+
+    Args:
+        module: Module to import.
+
+    Returns:
+        The cumulative import time in microseconds of every module imported along with it.
+
+    Raises:
+        RuntimeError: If the module could not be imported.
+
+    """
+    res: CompletedProcess = run(
+        [executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+
+    if res.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{res.stderr}")
+
+    times: dict[str, int] = {}
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def bench_imports(modules: tuple[str, ...] = entry_modules, top: int = 5) -> dict[str, dict]:
+    """
+
+    Args:
+        modules: Modules to import, each in its own interpreter.
+        top: Number of slowest third party modules reported for each module.
+
+    Returns:
+        The import time in seconds of each module, along with its slowest top-level dependencies.
+
+    """
+    report: dict[str, dict] = {}
+
+    # Modules already imported by the interpreter on startup
+    startup: set[str] = set(import_times('sys'))
+
+    for module in modules:
+        times: dict[str, int] = import_times(module)
+
+        # Only top-level packages, their submodules are included in their cumulative time
+        roots: dict[str, int] = {
+            name: t for name, t in times.items() if '.' not in name and name != module and name not in startup
+        }
+
+        report[module] = {
+            'seconds': times[module] / 1e6,
+            'slowest': {
+                name: t / 1e6 for name, t in sorted(roots.items(), key=lambda item: -item[1])[:top]
+            },
+        }
+
+    return report
+
+
+if __name__ == '__main__':
+    results: dict[str, dict] = bench_imports()
+
+    for name, res in results.items():
+        print(name, res)
+
+    # Fail when the entry point regresses past the budget
+    if results['Server']['seconds'] > startup_budget:
+        print(f"Server import took {results['Server']['seconds']:.2f}s, over the {startup_budget}s budget")
+        exit(1)
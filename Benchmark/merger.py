@@ -0,0 +1,111 @@
+from functools import reduce
+from numpy import interp, nan
+from pandas import DataFrame, merge, merge_asof
+
+from Data.merger import merge as aligned_merge
+
+from .common import measure
+from .synthetic import clean_bitcoin_frame, daily_frames, kaggle_rows
+
+
+def to_minutes(df: DataFrame, interpolate: bool = False) -> DataFrame:
+    """
+
+    Args:
+        df: Daily series.
+        interpolate: True to interpolate the values in time instead of forward filling them.
+
+    Returns:
+        The series resampled into minutes, as the cleaners used to save it.
+
+    """
+    if interpolate:
+        return df.resample('min').asfreq().interpolate(method='time')
+
+    return df.resample('min').ffill()
+
+
+def reduce_merge(bitcoin: DataFrame, *minutes: DataFrame) -> DataFrame:
+    """
+
+    Chained left merges of minute series, as done by get_data before the as-of join.
+
+    Args:
+        bitcoin: Cleaned BTC data.
+        *minutes: Series resampled into minutes.
+
+    Returns:
+        The merged DataFrame.
+
+    """
+    df: DataFrame = reduce(
+        lambda left, right: merge(left, right, how='left', left_index=True, right_index=True),
+        (bitcoin, *minutes)
+    )
+    df.dropna(inplace=True)
+
+    return df
+
+
+def reduce_asof(bitcoin: DataFrame, *daily: DataFrame) -> DataFrame:
+    """
+
+    Chained as-of joins of daily series, as done by get_data before the single aligned join.
+
+    Args:
+        bitcoin: Cleaned BTC data.
+        *daily: Series at their native frequency.
+
+    Returns:
+        The merged DataFrame.
+
+    """
+
+    def join(left: DataFrame, right: DataFrame) -> DataFrame:
+        if right.columns[0] == 'sentiment':
+            df: DataFrame = left.copy()
+            df['sentiment'] = interp(left.index.asi8, right.index.asi8, right['sentiment'].to_numpy(), left=nan, right=nan)
+
+            return df
+
+        df: DataFrame = merge_asof(left, right, left_index=True, right_index=True)
+        df.loc[df.index > right.index[-1], right.columns] = nan
+
+        return df
+
+    df: DataFrame = reduce(join, daily, bitcoin)
+    df.dropna(inplace=True)
+
+    return df
+
+
+def bench_merge(rows: int = kaggle_rows) -> dict:
+    """
+
+    Compares the chained merges with the single aligned join used by get_data.
+
+    Args:
+        rows: Number of synthetic BTC rows.
+
+    Returns:
+        Wall time in seconds and peak memory in MB of each implementation.
+
+    """
+    bitcoin: DataFrame = clean_bitcoin_frame(rows)
+    daily: tuple[DataFrame, ...] = daily_frames(bitcoin.index)
+    minutes: tuple[DataFrame, ...] = tuple(to_minutes(df, df.columns[0] == 'sentiment') for df in daily)
+
+    res: dict = {'rows': rows}
+
+    res['reduce_merge'], expected = measure(reduce_merge, bitcoin, *minutes)
+    res['reduce_asof'], _ = measure(reduce_asof, bitcoin, *daily)
+    res['aligned'], df = measure(aligned_merge, bitcoin, *daily)
+
+    # All of them must produce the same rows
+    assert df.index.equals(expected.index)
+
+    return res
+
+
+if __name__ == '__main__':
+    print(bench_merge())
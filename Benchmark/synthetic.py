@@ -0,0 +1,127 @@
+from numpy import int64, ndarray, maximum, minimum
+from numpy.random import default_rng, Generator
+from pandas import DataFrame, DatetimeIndex, date_range
+
+
+# Number of rows in the Kaggle Bitcoin dataset
+kaggle_rows: int = 3_126_000
+
+
+def candles(rows: int, rng: Generator) -> DataFrame:
+    """
+
+    Args:
+        rows: Number of minute candles to generate.
+        rng: Random generator.
+
+    Returns:
+        The generated candles, with the same columns as the Kaggle CSV, indexed by their minute timestamps.
+
+    """
+    # Random walk of the price
+    open_: ndarray = 20_000 + rng.normal(0, 5, rows).cumsum()
+    close: ndarray = open_ + rng.normal(0, 5, rows)
+    spread: ndarray = rng.exponential(5, rows)
+    volume: ndarray = rng.exponential(20, rows)
+    trades: ndarray = rng.integers(0, 2_000, rows, dtype=int64)
+
+    return DataFrame(
+        {
+            'open': open_,
+            'high': maximum(open_, close) + spread,
+            'low': minimum(open_, close) - spread,
+            'close': close,
+            'volume': volume,
+            'quote_asset_volume': volume * close,
+            'number_of_trades': trades,
+            'taker_buy_base_asset_volume': volume / 2,
+            'taker_buy_quote_asset_volume': volume * close / 2,
+        },
+        index=date_range('2017-08-17', periods=rows, freq='min', name='timestamp')
+    )
+
+
+def bitcoin_frame(rows: int = kaggle_rows, seed: int = 0, negative_ratio: float = 1e-5) -> DataFrame:
+    """
+
+    Generates a raw Bitcoin DataFrame, with the same columns as the Kaggle CSV.
+
+    Args:
+        rows: Number of minute candles to generate.
+        seed: Seed of the random generator.
+        negative_ratio: Ratio of the rows holding an invalid negative value.
+
+    Returns:
+        The generated DataFrame, with string timestamps as read from the CSV.
+
+    """
+    rng: Generator = default_rng(seed)
+
+    df: DataFrame = candles(rows, rng).reset_index()
+    df['timestamp'] = df['timestamp'].astype(str)
+
+    # Corrupt some of the values
+    bad: ndarray = rng.choice(rows, int(rows * negative_ratio), replace=False)
+    df.loc[bad, 'volume'] *= -1
+
+    return df
+
+
+def clean_bitcoin_frame(rows: int = kaggle_rows, seed: int = 0) -> DataFrame:
+    """
+
+    Generates a cleaned Bitcoin DataFrame, as saved by clean_bitcoin.
+    The timestamps are generated directly, instead of being parsed back from strings.
+
+    Args:
+        rows: Number of minute candles to generate.
+        seed: Seed of the random generator.
+
+    Returns:
+        The generated DataFrame, indexed by its minute timestamps.
+
+    """
+    return candles(rows, default_rng(seed))
+
+
+def daily_frames(index: DatetimeIndex, seed: int = 0) -> tuple[DataFrame, DataFrame, DataFrame, DataFrame]:
+    """
+
+    Generates the cleaned daily series covering the given minute index, as saved by their cleaners.
+
+    Args:
+        index: Minute index to cover.
+        seed: Seed of the random generator.
+
+    Returns:
+        The DXY, FNG, FedRate and sentiment DataFrames.
+
+    """
+    rng: Generator = default_rng(seed)
+    days: DatetimeIndex = date_range(index[0].floor('D'), index[-1].ceil('D'), freq='D', name='timestamp')
+    weeks: DatetimeIndex = days[::7]
+
+    return (
+        DataFrame({'open_dxy': 100 + rng.normal(0, 0.3, days.size).cumsum()}, index=days),
+        DataFrame({'fng': rng.integers(0, 100, days.size)}, index=days),
+        DataFrame({'fed_rate': rng.uniform(0, 5, days.size)}, index=days),
+        DataFrame({'sentiment': rng.uniform(-1, 1, weeks.size)}, index=weeks),
+    )
+
+
+def clean_frames(rows: int = kaggle_rows, seed: int = 0) -> tuple[DataFrame, ...]:
+    """
+
+    Generates every cleaned source of the merged dataset.
+
+    Args:
+        rows: Number of minute candles to generate.
+        seed: Seed of the random generator.
+
+    Returns:
+        The Bitcoin, DXY, FNG, FedRate and sentiment DataFrames, in the order they are merged.
+
+    """
+    bitcoin: DataFrame = clean_bitcoin_frame(rows, seed)
+
+    return bitcoin, *daily_frames(bitcoin.index, seed)
@@ -0,0 +1,254 @@
+from datetime import datetime, timezone
+from importlib import import_module
+from importlib.metadata import version
+from json import dumps, loads
+from os import cpu_count, environ, listdir, makedirs, path
+from platform import platform, python_version
+from resource import getrusage, RUSAGE_CHILDREN, RUSAGE_SELF, struct_rusage
+from runpy import run_path
+from shutil import copy, copytree
+from subprocess import CompletedProcess, run
+from sys import argv, executable, platform as sys_platform
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from .common import peak_rss_mb
+
+
+# Root of the repository
+root_path: str = path.dirname(path.dirname(path.realpath(__file__)))
+
+# Version of the repository, the results of each release are kept in their own file
+release: str = run_path(path.join(root_path, "__version__.py"))['__version__']
+
+# Number of rows of the synthetic datasets
+sizes: tuple[int, ...] = (100_000, 1_000_000, 10_000_000)
+
+# Number of folds of the test stages
+test_folds: int = 5
+
+# Stages, in the order they run, each a function called with its keyword arguments.
+# The data stages come first, the trainers read the feature store they build.
+stages: dict[str, tuple[str, str, dict]] = {
+    'get_data': ('Data', 'get_data', {}),
+    'get_data_cached': ('Data', 'get_data', {}),
+    'materialize': ('Data', 'materialize', {}),
+    'lr_train': ('Train', 'lr_train', {'no_save': True}),
+    'lgr_train': ('Train', 'lgr_train', {'no_save': True}),
+    'elr_train': ('Train', 'elr_train', {'no_save': True}),
+    'elr_train_path': ('Train', 'elr_train', {'no_save': True, 'search': 'path'}),
+    'lr_test': ('Train', 'lr_test', {'n': test_folds}),
+    'lgr_test': ('Train', 'lgr_test', {'n': test_folds}),
+    'elr_test': ('Train', 'elr_test', {'n': test_folds}),
+}
+
+# Largest dataset of the stages whose time grows too fast to be measured on the largest sizes.
+# The halving search of the elastic net takes minutes on 100k rows, and hours past a million.
+max_rows: dict[str, int] = {
+    'elr_train': 1_000_000,
+    'elr_test': 1_000_000,
+}
+
+# Libraries whose versions are recorded along with the results
+libraries: tuple[str, ...] = ('numpy', 'pandas', 'pyarrow', 'scikit-learn', 'scipy')
+
+
+def write_sources(rows: int) -> None:
+    """
+
+    Writes synthetic cleaned sources in the Data directory, as saved by their cleaners.
+    Without raw files nor manifests, get_data takes them as they are and merges them.
+
+    Args:
+        rows: Number of minute candles.
+
+    """
+    from Data.io import dir_path
+    from Data.manifest import sources
+
+    from .synthetic import clean_frames
+
+    for source, df in zip(sources, clean_frames(rows)):
+        makedirs(path.join(dir_path, source), exist_ok=True)
+        df.to_parquet(path.join(dir_path, source, "clean.parquet"))
+
+
+def cpu_seconds(usage: struct_rusage) -> float:
+    """
+
+    Args:
+        usage: Resource usage.
+
+    Returns:
+        The user and system CPU time in seconds.
+
+    """
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_stage(module: str, function: str, kwargs: dict) -> dict:
+    """
+
+    Runs a stage once, meant to be run in a fresh process so that its peak RSS is its own.
+
+    Args:
+        module: Module of the function.
+        function: Function of the stage.
+        kwargs: Keyword arguments of the function.
+
+    Returns:
+        The wall time and CPU time in seconds, the average number of busy CPUs,
+        the peak RSS in MB, the RSS growth in MB over the peak before the stage,
+        and the largest peak RSS in MB of the worker processes.
+
+    """
+    func = getattr(import_module(module), function)
+
+    base: float = peak_rss_mb()
+    self0: struct_rusage = getrusage(RUSAGE_SELF)
+    children0: struct_rusage = getrusage(RUSAGE_CHILDREN)
+
+    t0: float = perf_counter()
+    func(**kwargs)
+    wall: float = perf_counter() - t0
+
+    # Imported here, so that the peak RSS before the stage does not count the models
+    from Train.common import shutdown_workers
+
+    shutdown_workers()
+
+    self1: struct_rusage = getrusage(RUSAGE_SELF)
+    children1: struct_rusage = getrusage(RUSAGE_CHILDREN)
+    cpu: float = cpu_seconds(self1) - cpu_seconds(self0) + cpu_seconds(children1) - cpu_seconds(children0)
+    peak: float = peak_rss_mb()
+
+    return {
+        'wall': wall,
+        'cpu': cpu,
+        'cpu_util': cpu / wall if wall else 0.0,
+        'peak_rss_mb': peak,
+        'rss_growth_mb': peak - base,
+        # Reported in bytes on macOS, and in KB elsewhere
+        'workers_peak_rss_mb': children1.ru_maxrss / (2 ** 20 if sys_platform == 'darwin' else 2 ** 10),
+    }
+
+
+def workspace(dest: str) -> None:
+    """
+
+    Copies the code of the repository, and its configuration, without any of its data or models.
+    The stages run there, so that they never touch the data of the repository. The packages hold no sub-packages.
+
+    Args:
+        dest: Directory of the copy.
+
+    """
+    for name in listdir(root_path):
+        src: str = path.join(root_path, name)
+
+        if path.exists(path.join(src, "__init__.py")):
+            copytree(
+                src,
+                path.join(dest, name),
+                ignore=lambda _, names: [n for n in names if not n.endswith('.py')]
+            )
+        elif name.endswith('.py'):
+            copy(src, path.join(dest, name))
+
+    config_path: str = path.join(root_path, "config.json")
+    copy(config_path if path.exists(config_path) else path.join(root_path, "example_config.json"), path.join(dest, "config.json"))
+
+
+def spawn(dest: str, module: str, function: str, kwargs: dict) -> dict:
+    """
+
+    Args:
+        dest: Directory of the workspace.
+        module: Module of the function.
+        function: Function of the stage.
+        kwargs: Keyword arguments of the function.
+
+    Returns:
+        The result of run_stage, run in a new interpreter within the workspace.
+        The return code and the last line of the error output if the stage failed.
+
+    """
+    proc: CompletedProcess = run(
+        [executable, '-m', 'Benchmark.training', dumps([module, function, kwargs])],
+        cwd=dest,
+        env={**environ, 'PYTHONPATH': dest},
+        capture_output=True,
+        text=True
+    )
+
+    if proc.returncode:
+        return {
+            'returncode': proc.returncode,
+            'error': (proc.stderr.strip().splitlines() or [''])[-1],
+        }
+
+    # The stage may print, the result is the last line
+    return loads(proc.stdout.strip().splitlines()[-1])
+
+
+def bench_training(
+        rows: tuple[int, ...] = sizes,
+        names: tuple[str, ...] | None = None,
+        output: str | None = None
+) -> dict:
+    """
+
+    Measures every stage on synthetic datasets of increasing size, each stage in its own process.
+    Results are written as JSON, named after the release, so that releases can be compared.
+
+    Args:
+        rows: Numbers of rows of the synthetic datasets.
+        names: Stages to run, in the order of stages, all of them by default.
+        output: Path of the JSON results, Benchmark/results/training-<release>.json by default.
+
+    Returns:
+        The environment, along with the results of run_stage for the generation and every stage of every size.
+        Stages are skipped on the sizes above their max_rows.
+
+    """
+    output = output if output is not None else path.join(root_path, "Benchmark", "results", f"training-{release}.json")
+    selected: list[str] = [name for name in stages if names is None or name in names]
+
+    res: dict = {
+        'release': release,
+        'date': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': python_version(),
+            'platform': platform(),
+            'cpus': cpu_count(),
+            **{library: version(library) for library in libraries},
+        },
+        'stages': {name: {'function': f"{stages[name][0]}.{stages[name][1]}", 'kwargs': stages[name][2]} for name in selected},
+        'sizes': {},
+    }
+
+    for n in rows:
+        with TemporaryDirectory() as dest:
+            workspace(dest)
+
+            size: dict = {'generate': spawn(dest, 'Benchmark.training', 'write_sources', {'rows': n})}
+
+            for name in selected:
+                size[name] = spawn(dest, *stages[name]) if n <= max_rows.get(name, n) else {'skipped': True}
+
+        res['sizes'][str(n)] = size
+
+        # Written after every size, the largest ones take the longest
+        makedirs(path.dirname(output), exist_ok=True)
+
+        with open(output, 'w') as file:
+            file.write(dumps(res, indent=4))
+
+    return res
+
+
+if __name__ == '__main__':
+    if len(argv) > 1:
+        print(dumps(run_stage(*loads(argv[1]))))
+    else:
+        print(dumps(bench_training(), indent=4))
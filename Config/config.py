@@ -99,8 +99,11 @@ class ObserverConfig:
 
 
     save: Save the model if it has incremental learning.
+
+    online: Serve the incremental learning models, updated with each closed candle.
     """
     save: float
+    online: bool = False
 
 
 @dataclass(frozen=True)
@@ -3,12 +3,15 @@ from __future__ import annotations
 from re import compile as compile_re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Literal, Annotated
-from duckduckgo_search import DDGS
+from functools import cache
+from typing import Literal, Annotated, TYPE_CHECKING
 
 from Config import config
 from Utils import convert_to_dataclass
 
+if TYPE_CHECKING:
+    from duckduckgo_search import DDGS
+
 # ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIEHNNMeliSm7M5QF4IfkYZJvhnC2VA1CcIrlloq8xPfn
 # Type of search regions
 Region = Literal[
@@ -53,10 +56,30 @@ DateBound = Annotated[str, compile_re(
     r"^\d{4}-(((0[13578]|(10|12))-(0[1-9]|[1-2]\d|3[0-1]))|(02-(0[1-9]|[1-2]\d))|((0[469]|11)-(0[1-9]|[1-2]\d|30)))$"
 )]
 
-# Handles searching
-browser: DDGS = DDGS(
-    proxies=config.proxies,
-)
+
+@cache
+def get_browser() -> DDGS:
+    """
+
+    The search client is only created on the first query, as importing it is slow.
+
+    Returns:
+        The client that handles searching.
+
+    """
+    from duckduckgo_search import DDGS
+
+    return DDGS(
+        proxies=config.proxies,
+    )
+
+
+def __getattr__(name: str) -> DDGS:
+    # Kept for the users of the former module-level client
+    if name == 'browser':
+        return get_browser()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass
@@ -187,7 +210,7 @@ def query_news(
                     'date': datetime.strptime(doc['date'], "%Y-%m-%dT%H:%M:%S%z"),
                 }
             ),
-            browser.news(
+            get_browser().news(
                 keywords=keywords,
                 max_results=max_results,
                 safesearch=safe_search,
@@ -227,7 +250,7 @@ def query_text(
     return list(
         map(
             lambda doc: convert_to_dataclass(SpiderTextResponse, doc),
-            browser.text(
+            get_browser().text(
                 keywords=keywords,
                 max_results=max_results,
                 safesearch=safe_search,
@@ -287,7 +310,7 @@ def query_images(
     return list(
         map(
             lambda doc: convert_to_dataclass(SpiderImageResponse, doc),
-            browser.images(
+            get_browser().images(
                 keywords=keywords,
                 layout=layout,
                 license_image=license_image,
@@ -345,7 +368,7 @@ def query_videos(
                     'published': datetime.strptime(doc['published'][:-1], "%Y-%m-%dT%H:%M:%S.%f"),
                 }
             ),
-            browser.videos(
+            get_browser().videos(
                 keywords=keywords,
                 resolution=resolution,
                 duration=duration,
@@ -383,7 +406,7 @@ def query_translate(
     return list(
         map(
             lambda doc: convert_to_dataclass(SpiderTranslateResponse, doc),
-            browser.translate(
+            get_browser().translate(
                 keywords=keywords,
                 from_=from_lang,
                 to=to_lang
@@ -414,7 +437,7 @@ def query_suggestions(
     return list(
         map(
             lambda doc: convert_to_dataclass(SpiderSuggestionResponse, doc),
-            browser.suggestions(
+            get_browser().suggestions(
                 keywords=keywords,
                 region=region
             )
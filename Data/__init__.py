@@ -1,13 +1,39 @@
-from .cleaner import load_clean_dxy, \
-    load_clean_bitcoin, \
-    load_clean_fed_funds, \
-    clean_fed_funds, \
-    clean_dxy, \
-    clean_bitcoin, \
-    clean_fear_greed, \
-    load_clean_fear_greed, \
-    clean_sentiment, \
-    load_clean_sentiment
-
-from .merger import get_data, get_split_data, target_labels
-from .io import save_parquet
+from Utils import lazy_exports
+
+
+# Exported names, the submodules defining them are only imported on first use
+exports: dict[str, tuple[str, str]] = {
+    **{
+        name: ('.cleaner', name) for name in (
+            'load_clean_dxy',
+            'load_clean_bitcoin',
+            'load_clean_fed_funds',
+            'clean_fed_funds',
+            'clean_dxy',
+            'clean_bitcoin',
+            'clean_bitcoin_stream',
+            'clean_fear_greed',
+            'load_clean_fear_greed',
+            'clean_sentiment',
+            'load_clean_sentiment',
+            'clean_all',
+            'clean_workers',
+            'Engine',
+        )
+    },
+    **{name: ('.merger', name) for name in ('get_data', 'get_split_data', 'update_data', 'refresh_data', 'target_labels')},
+    **{name: ('.io', name) for name in ('save_parquet', 'read_partitioned')},
+    **{
+        name: ('.schema', name) for name in (
+            'Precision', 'compact', 'epoch_minute', 'to_epoch_minutes', 'from_epoch_minutes'
+        )
+    },
+    **{name: ('.store', name) for name in ('materialize', 'load_features', 'get_split_features')},
+    **{name: ('.manifest', name) for name in ('is_fresh', 'dataset_hash')},
+    **{name: ('.timestamps', name) for name in ('parse_epoch', 'to_timestamps')},
+    **{name: ('.batches', name) for name in ('iter_batches', 'batch_rows', 'feature_columns')},
+}
+
+__all__: list[str] = list(exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, exports)
@@ -0,0 +1,372 @@
+from io import BytesIO
+from numpy import argsort, diff, empty, flatnonzero, ndarray, ones
+from os import path
+from pandas import Series, Timedelta, Timestamp, NaT
+from pyarrow import Array, ChunkedArray, DataType, Table, array, concat_tables, float64, int64, scalar, timestamp
+from pyarrow.compute import and_, fill_null, greater, greater_equal, invert, is_null, less, less_equal, or_, \
+    sum as arrow_sum
+from pyarrow.csv import ConvertOptions, InvalidRow, ParseOptions, ReadOptions, open_csv, read_csv
+from pyarrow.types import is_floating, is_integer
+from typing import Iterable
+
+from .io import dir_path, load_bitcoin, load_fear_greed, save_parquet_stream
+from .manifest import Source, save_manifest
+from .schema import minute_ns
+from .timestamps import date_formats
+
+
+# Timestamp column of the raw file of each source
+raw_timestamps: dict[Source, str] = {
+    'bitcoin': 'timestamp',
+    'dxy': 'Date',
+    'fearGreed': 'timestamp',
+    'fedFunds': 'date',
+    'sentiment': 'timestamp',
+}
+
+# Types of the raw columns that are not inferred. The reader infers the types from the first block of the file,
+# which would not hold for the whole Bitcoin file
+raw_types: dict[Source, dict[str, DataType]] = {
+    'bitcoin': {
+        'open': float64(),
+        'high': float64(),
+        'low': float64(),
+        'close': float64(),
+        'volume': float64(),
+        'quote_asset_volume': float64(),
+        'number_of_trades': int64(),
+        'taker_buy_base_asset_volume': float64(),
+        'taker_buy_quote_asset_volume': float64(),
+    },
+}
+
+# Number of cleaned rows taken from the raw Bitcoin table at once while writing
+take_rows: int = 262_144
+
+# Dates kept from the daily sources, same as the pandas cleaners
+kept_dates: tuple[Timestamp, Timestamp] = (Timestamp('2017-01-01'), Timestamp('2023-12-31'))
+
+
+def count(mask: Array | ChunkedArray) -> int:
+    """
+
+    Args:
+        mask: Boolean array.
+
+    Returns:
+        The number of true values in the mask.
+
+    """
+    return int(arrow_sum(mask).as_py() or 0)
+
+
+def read_raw(source: Source) -> Table:
+    """
+
+    Reads the raw CSV file of the source straight into an Arrow table, parsing its timestamps while reading.
+    The whole table is held in memory. Its floats are the nearest to their decimals,
+    the default parser of pandas misses some of them by one bit.
+    The Bitcoin and FNG files are downloaded first if missing.
+
+    Args:
+        source: Data source.
+
+    Returns:
+        The raw table, with the timestamp column as timestamp[ns].
+
+    """
+    file_path: str = path.join(dir_path, source, "data.csv")
+
+    # Downloaded by the pandas loaders
+    if not path.exists(file_path):
+        if source == 'bitcoin':
+            load_bitcoin(1).close()
+        elif source == 'fearGreed':
+            load_fear_greed()
+
+    convert: ConvertOptions = ConvertOptions(
+        column_types={**raw_types.get(source, {}), raw_timestamps[source]: timestamp('ns')},
+        timestamp_parsers=[date_formats[source]]
+    )
+    short: list[str] = []
+
+    def pad_short(row: InvalidRow) -> str:
+        # Rows missing trailing values are kept with nulls, as pandas does
+        if row.actual_columns < row.expected_columns:
+            short.append(row.text + ',' * (row.expected_columns - row.actual_columns))
+            return 'skip'
+
+        return 'error'
+
+    table: Table = open_csv(
+        file_path,
+        parse_options=ParseOptions(invalid_row_handler=pad_short),
+        convert_options=convert
+    ).read_all()
+
+    if short:
+        table = concat_tables([
+            table,
+            read_csv(
+                BytesIO('\n'.join(short).encode()),
+                read_options=ReadOptions(column_names=table.column_names),
+                convert_options=ConvertOptions(column_types=table.schema, timestamp_parsers=convert.timestamp_parsers)
+            )
+        ])
+
+    return table
+
+
+def with_pandas_metadata(table: Table) -> Table:
+    """
+
+    Args:
+        table: Cleaned table, with its timestamp column last.
+
+    Returns:
+        The table with the same schema and metadata as the pandas cleaners write, the timestamp being the index.
+
+    """
+    ts: str = table.column_names[-1]
+
+    # Only the schema of an empty frame is converted, the columns already have the same types
+    return table.replace_schema_metadata(Table.from_pandas(table.slice(0, 0).to_pandas().set_index(ts)).schema.metadata)
+
+
+def in_kept_dates(table: Table) -> Table:
+    """
+
+    Args:
+        table: Daily table.
+
+    Returns:
+        The rows of the table within the kept dates.
+
+    """
+    stamps: ChunkedArray = table.column('timestamp')
+
+    return table.filter(and_(
+        greater_equal(stamps, scalar(kept_dates[0], type=timestamp('ns'))),
+        less_equal(stamps, scalar(kept_dates[1], type=timestamp('ns')))
+    ))
+
+
+def after(table: Table, since: Timestamp | None) -> Table:
+    """
+
+    Args:
+        table: Cleaned table.
+        since: Last timestamp already cleaned.
+
+    Returns:
+        The rows of the table after since, all of them if since is None.
+
+    """
+    if since is None:
+        return table
+
+    return table.filter(greater(table.column('timestamp'), scalar(Timestamp(since), type=timestamp('ns'))))
+
+
+def save_clean(table: Table, source: Source, append: bool = False) -> Table:
+    """
+
+    Saves the cleaned table as the pandas cleaners do.
+
+    Args:
+        table: Cleaned table sorted by its timestamp column, which comes last.
+        source: Data source.
+        append: If True the rows are appended to the existing clean data, otherwise they replace it.
+
+    Returns:
+        The saved table.
+
+    """
+    table = with_pandas_metadata(table)
+
+    if not append:
+        save_parquet_stream((table,), source)
+    elif table.num_rows:
+        save_parquet_stream((table,), source, append=True)
+
+    save_manifest(source)
+
+    return table
+
+
+def clean_bitcoin_table(since: Timestamp | None = None) -> dict:
+    """
+
+    Same as clean_bitcoin, running on Arrow compute kernels instead of pandas.
+    The cleaned rows are taken from the raw table and written a slice at a time,
+    so the cleaned data is never held in memory next to the raw data.
+
+    Args:
+        since: If given, only the rows after it are cleaned and appended to the existing clean data.
+
+    Returns:
+        Statistics of the cleaning process, same as clean_bitcoin.
+
+    """
+    ts: str = 'timestamp'
+    table: Table = read_raw('bitcoin')
+    stats: dict = {}
+
+    # Initial data size
+    init_size: int = table.num_rows
+
+    stats['init_size'] = init_size
+    stats['init_shape'] = (init_size, table.num_columns)
+    stats['missing_vals'] = Series(
+        {c: count(is_null(table.column(c), nan_is_null=True)) for c in table.column_names}, dtype='int64'
+    )
+
+    # Rows holding a negative value in any of the numeric columns
+    invalid: ChunkedArray | None = None
+    neg_counts: dict[str, int] = {}
+
+    for name in table.column_names:
+        column: ChunkedArray = table.column(name)
+
+        if name == ts or not (is_integer(column.type) or is_floating(column.type)):
+            continue
+
+        negative: ChunkedArray = fill_null(less(column, 0), False)
+
+        neg_counts[name] = count(negative)
+        invalid = negative if invalid is None else or_(invalid, negative)
+
+    stats['neg_counts'] = Series(neg_counts, dtype='int64')
+    stats['has_invalid'] = bool(stats['neg_counts'].any())
+
+    # Rows kept so far, the table itself is never filtered, the kept rows are only taken while writing
+    keep: ndarray = ~invalid.to_numpy(zero_copy_only=False) if stats['has_invalid'] else ones(init_size, dtype=bool)
+    stamps: ndarray = table.column(ts).cast(int64()).to_numpy()
+
+    # Skip the rows that are already cleaned
+    if since is not None:
+        keep &= stamps > Timestamp(since).as_unit('ns').value
+
+    rows: ndarray = flatnonzero(keep)[::-1]
+    prev_sz: int = rows.size
+
+    # Stable sort of the reversed rows, so that the latest row of each timestamp comes first and is the one kept
+    rows = rows[argsort(stamps[rows], kind='stable')]
+    stamps = stamps[rows]
+
+    first: ndarray = empty(stamps.size, dtype=bool)
+    first[:1] = True
+    first[1:] = stamps[1:] != stamps[:-1]
+
+    # Remove duplicated timestamps, the rows are sorted by timestamp
+    rows = rows[first]
+    stamps = stamps[first]
+
+    dup_sz: int = prev_sz - rows.size
+
+    stats['dup_timestamps'] = dup_sz
+
+    ts_diff: ndarray = diff(stamps)
+    invalid_ts: int = int(stamps.size > 0) + int((ts_diff != minute_ns).sum())
+
+    stats['invalid_timestamps'] = invalid_ts
+    stats['max_timestamp_dif'] = Timedelta(int(ts_diff.max()), unit='ns') if ts_diff.size else NaT
+    stats['bad_perc'] = ((invalid_ts + dup_sz) / init_size) * 100
+
+    # The timestamp is the index, stored last
+    table = with_pandas_metadata(table.select([*(c for c in table.column_names if c != ts), ts]))
+
+    # Nothing to add to the existing clean data
+    if rows.size or since is None:
+        slices: Iterable[Table] = (
+            table.take(rows[i:i + take_rows]) for i in range(0, rows.size, take_rows)
+        ) if rows.size else (table.slice(0, 0),)
+
+        save_parquet_stream(slices, 'bitcoin', append=since is not None)
+
+    save_manifest('bitcoin')
+
+    return stats
+
+
+def clean_dxy_table(since: Timestamp | None = None) -> Table:
+    """
+
+    Same as clean_dxy, running on Arrow compute kernels instead of pandas.
+
+    Args:
+        since: If given, only the rows after it are kept and appended to the existing clean data.
+
+    Returns:
+        Table containing the cleaned DXY data, only the new rows if since is given.
+
+    """
+    table: Table = read_raw('dxy').select([' Open', 'Date']).rename_columns(['open_dxy', 'timestamp'])
+
+    return save_clean(after(table.sort_by('timestamp'), since), 'dxy', since is not None)
+
+
+def clean_sentiment_table(since: Timestamp | None = None) -> Table:
+    """
+
+    Same as clean_sentiment, running on Arrow compute kernels instead of pandas.
+
+    Args:
+        since: If given, only the rows after it are kept and appended to the existing clean data.
+
+    Returns:
+        Table containing the cleaned sentiment data, only the new rows if since is given.
+
+    """
+    table: Table = in_kept_dates(
+        read_raw('sentiment').select(['data', 'timestamp']).rename_columns(['sentiment', 'timestamp'])
+    )
+
+    # Missing values are interpolated from their neighbors when joined
+    table = table.filter(invert(is_null(table.column('sentiment'), nan_is_null=True)))
+
+    return save_clean(after(table.sort_by('timestamp'), since), 'sentiment', since is not None)
+
+
+def clean_fed_funds_table(since: Timestamp | None = None) -> Table:
+    """
+
+    Same as clean_fed_funds, running on Arrow compute kernels instead of pandas.
+
+    Args:
+        since: If given, only the rows after it are kept and appended to the existing clean data.
+
+    Returns:
+        Table containing the cleaned FedRate data, only the new rows if since is given.
+
+    """
+    table: Table = in_kept_dates(
+        read_raw('fedFunds').select([' value', 'date']).rename_columns(['fed_rate', 'timestamp'])
+    )
+
+    return save_clean(after(table.sort_by('timestamp'), since), 'fedFunds', since is not None)
+
+
+def clean_fear_greed_table(since: Timestamp | None = None) -> Table:
+    """
+
+    Same as clean_fear_greed, running on Arrow compute kernels instead of pandas.
+
+    Args:
+        since: If given, only the rows after it are kept and appended to the existing clean data.
+
+    Returns:
+        Table containing the cleaned FNG data, only the new rows if since is given.
+
+    """
+    table: Table = read_raw('fearGreed').select(['value', 'timestamp']).rename_columns(['fng', 'timestamp'])
+
+    # This fng value is based on the bitcoin upward trend in 2017
+    missing: Table = Table.from_arrays(
+        [array([50], type=table.schema.field('fng').type), array([kept_dates[0]], type=timestamp('ns'))],
+        names=['fng', 'timestamp']
+    )
+
+    table = in_kept_dates(concat_tables([missing, table]))
+
+    return save_clean(after(table.sort_by('timestamp'), since), 'fearGreed', since is not None)
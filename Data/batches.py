@@ -0,0 +1,138 @@
+from numpy import empty, int8, ndarray
+from os import path
+from pandas import Timestamp
+from pyarrow import Table, concat_tables
+from pyarrow.dataset import Dataset, Expression, ParquetFileFragment
+from typing import Iterator
+
+from .io import dir_path, open_partitioned, range_filter
+from .manifest import is_fresh
+from .merger import get_data, target_labels
+from .schema import Precision
+
+
+# Number of rows in each block by default
+batch_rows: int = 65_536
+
+
+def first_minute(fragment: ParquetFileFragment) -> int:
+    """
+
+    Args:
+        fragment: File of the merged dataset.
+
+    Returns:
+        The first epoch minute in the file, read from the statistics of its footer.
+
+    """
+    return fragment.metadata.row_group(0).column(
+        fragment.metadata.schema.names.index('timestamp')
+    ).statistics.min
+
+
+def feature_columns(columns: list[str] | None = None) -> list[str]:
+    """
+
+    Builds the merged dataset first if it is missing or stale.
+
+    Args:
+        columns: Requested feature columns, all the non-target columns by default.
+
+    Returns:
+        The feature columns of X, in the order iter_batches yields them.
+
+    """
+    if not path.exists(path.join(dir_path, "clean")) or not is_fresh('merged'):
+        get_data()
+
+    return [
+        c for c in (columns if columns is not None else open_partitioned().schema.names)
+        if c not in ('timestamp', 'year', 'month', *target_labels)
+    ]
+
+
+def to_block(
+        table: Table,
+        features: list[str],
+        logistic: bool,
+        precision: Precision
+) -> tuple[ndarray, ndarray]:
+    """
+
+    Args:
+        table: Rows of the block.
+        features: Columns of X.
+        logistic: If True, Y is the logistic target instead of the regression targets.
+        precision: Type of X, and of Y for the regression targets.
+
+    Returns:
+        The X and Y arrays of the block.
+
+    """
+    x: ndarray = empty((table.num_rows, len(features)), dtype=precision)
+
+    # Column by column, so no temporary of the whole block is created
+    for i, column in enumerate(features):
+        x[:, i] = table.column(column).to_numpy()
+
+    if logistic:
+        return x, ((table.column('open').to_numpy() - table.column('close').to_numpy()) < 0).astype(int8)
+
+    y: ndarray = empty((table.num_rows, len(target_labels)), dtype=precision)
+
+    for i, column in enumerate(target_labels):
+        y[:, i] = table.column(column).to_numpy()
+
+    return x, y
+
+
+def iter_batches(
+        batch_size: int = batch_rows,
+        start: Timestamp | str | None = None,
+        end: Timestamp | str | None = None,
+        columns: list[str] | None = None,
+        logistic: bool = False,
+        precision: Precision = 'float64'
+) -> Iterator[tuple[ndarray, ndarray]]:
+    """
+
+    Streams the merged dataset as (X, Y) blocks in chronological order, without loading the whole of it.
+    Only one block and the record batches it is built from are held in memory at a time,
+    so models with partial_fit or built from sufficient statistics can train on more data than fits in RAM.
+    The merged dataset is built first if it is missing or stale.
+
+    Args:
+        batch_size: Number of rows in each block, only the last block may be smaller.
+        start: First timestamp to read, inclusive.
+        end: Last timestamp to read, inclusive.
+        columns: Feature columns of X, all the non-target columns by default.
+        logistic: If True, Y is the logistic target (open - close) < 0 as 0 or 1, computed per block.
+            Otherwise, Y holds the close, high, and low targets.
+        precision: Type of X, and of Y for the regression targets.
+
+    Returns:
+        Iterator over the X and Y blocks.
+
+    """
+    features: list[str] = feature_columns(columns)
+    data: Dataset = open_partitioned()
+    condition: Expression | None = range_filter(start, end)
+
+    # Features and targets may share columns, each is only read once
+    read: list[str] = list(dict.fromkeys([*features, *(('open', 'close') if logistic else target_labels)]))
+
+    pending: Table | None = None
+
+    # Partitions are listed in no particular order, and their files never overlap
+    for fragment in sorted(data.get_fragments(filter=condition), key=first_minute):
+        for batch in fragment.to_batches(schema=data.schema, columns=read, filter=condition):
+            table: Table = Table.from_batches([batch])
+            pending = table if pending is None else concat_tables([pending, table])
+
+            while pending.num_rows >= batch_size:
+                yield to_block(pending.slice(0, batch_size), features, logistic, precision)
+
+                pending = pending.slice(batch_size)
+
+    if pending is not None and pending.num_rows:
+        yield to_block(pending, features, logistic, precision)
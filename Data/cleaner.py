@@ -1,21 +1,243 @@
-from os import path
-from pandas import DataFrame, Series, Timedelta, to_datetime, \
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed
+from os import path, cpu_count
+from pandas import DataFrame, Series, Timedelta, \
     read_parquet, concat, Timestamp, to_numeric
+from numpy import ndarray, zeros
 from pandas.core.dtypes.common import is_numeric_dtype
-
+from pyarrow import Table
+from pyarrow.parquet import read_table
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from typing import Callable, Iterator, Literal
+
+from .arrow_cleaner import clean_bitcoin_table, clean_dxy_table, clean_sentiment_table, \
+    clean_fed_funds_table, clean_fear_greed_table
+from .manifest import Source, sources, save_manifest, is_fresh
+from .timestamps import to_timestamps
 from .io import load_fed_funds, load_bitcoin, load_dxy, \
-    save_parquet, dir_path, load_fear_greed, load_sentiment
+    save_parquet, save_parquet_stream, append_parquet, dir_path, load_fear_greed, load_sentiment
+
+
+# Number of raw CSV rows held in memory at once when streaming the Bitcoin data
+bitcoin_chunk_size: int = 250_000
+
+# Library running the cleaning, arrow avoids the copies of the pandas steps and writes the same files,
+# but for floats that pandas parses one bit off
+Engine = Literal['pandas', 'arrow']
+
+# Number of processes cleaning the sources in parallel on refresh
+clean_workers: int = min(len(sources), cpu_count() or 1)
+
+
+def find_negatives(df: DataFrame) -> tuple[ndarray, Series]:
+    """
+
+    Validates all the numeric columns of the given DataFrame in a single pass, without filtering it.
+
+    Args:
+        df: DataFrame to validate.
+
+    Returns:
+        The boolean mask of the rows holding a negative value,
+        along with the number of negative values in each numeric column.
+
+    """
+    invalid: ndarray = zeros(len(df.index), dtype=bool)
+    counts: dict[str, int] = {}
+
+    for column in df.columns:
+        if not is_numeric_dtype(df[column]):
+            continue
+
+        negative: ndarray = df[column].to_numpy() < 0
+
+        counts[column] = int(negative.sum())
+        invalid |= negative
+
+    return invalid, Series(counts, dtype='int64')
+
+
+def clean_bitcoin_stream(chunk_size: int = bitcoin_chunk_size, since: Timestamp | None = None) -> dict:
+    """
+
+    Cleans the Bitcoin dataset chunk by chunk and saves it,
+    keeping the peak memory bounded by the chunk size rather than the file size.
+    The raw file must be ordered by timestamp (ascending or descending), as the Kaggle file is.
+
+    Args:
+        chunk_size: Number of raw rows read per chunk.
+        since: If given, only the rows after it are cleaned and appended to the existing clean data.
+
+    Returns:
+        Statistics of the cleaning process, same as clean_bitcoin.
+
+    Raises:
+        ValueError: If the raw file is not ordered by timestamp.
+
+    """
+    stats: dict = {
+        'init_size': 0,
+        'missing_vals': None,
+        'neg_counts': None,
+        'has_invalid': False,
+        'dup_timestamps': 0,
+        'invalid_timestamps': 0,
+        'max_timestamp_dif': None,
+    }
+
+    # Timestamp column name
+    ts: str = 'timestamp'
+
+    # Cleaned chunks are written here first, since their order in the file may be descending
+    parts_path: str = mkdtemp(dir=path.join(dir_path, "bitcoin"))
+
+    # (first timestamp, last timestamp, file path) of each cleaned chunk
+    parts: list[tuple[Timestamp, Timestamp, str]] = []
+
+    # Rows of the last timestamp of a chunk, they may be duplicated at the start of the next one
+    carry: DataFrame | None = None
+
+    def write_part(part: DataFrame) -> None:
+        """
+
+        Removes the duplicates of the given chunk, sorts it, and writes it to the parts folder.
+
+        Args:
+            part: Chunk with parsed timestamps.
+
+        """
+        prev_sz: int = len(part.index)
+
+        # Remove duplicated timestamps
+        part = part.drop_duplicates(ts, keep="last")
+
+        stats['dup_timestamps'] += prev_sz - len(part.index)
+
+        if part.empty:
+            return
+
+        # Sort the entries by their timestamp
+        part = part.sort_values(ts, ascending=True).set_index(ts)
+
+        part_path: str = path.join(parts_path, f"{len(parts)}.parquet")
+        part.to_parquet(part_path)
+        parts.append((part.index[0], part.index[-1], part_path))
+
+    def read_parts() -> Iterator[Table]:
+        """
+
+        Yields the cleaned chunks in ascending timestamp order, and collects the timestamp statistics.
+
+        """
+        invalid_ts: int = 0
+        max_difs: list[Timedelta] = []
+        prev: Timestamp | None = since
+
+        for _, _, part_path in parts:
+            table: Table = read_table(part_path)
+            stamps: Series = table.column(ts).to_pandas()
+
+            # Differences, including the one across the border with the previous chunk
+            ts_diff: Series = (stamps if prev is None else concat([Series([prev]), stamps])).diff()
+            ts_diff = ts_diff if prev is None else ts_diff.iloc[1:]
+
+            invalid_ts += (ts_diff != Timedelta(minutes=1)).sum()
+            max_difs.append(ts_diff.max())
+            prev = stamps.iloc[-1]
+
+            yield table
+
+        stats['invalid_timestamps'] = invalid_ts
+        stats['max_timestamp_dif'] = Series(max_difs, dtype='timedelta64[ns]').max()
+
+    try:
+        for chunk in load_bitcoin(chunk_size):
+            stats['init_size'] += len(chunk.index)
+            stats['init_shape'] = (stats['init_size'], chunk.shape[1])
+
+            missing: Series = chunk.isna().sum()
+            stats['missing_vals'] = missing if stats['missing_vals'] is None \
+                else stats['missing_vals'].add(missing, fill_value=0)
+
+            # Remove negative values
+            invalid, neg_counts = find_negatives(chunk)
+
+            stats['neg_counts'] = neg_counts if stats['neg_counts'] is None \
+                else stats['neg_counts'].add(neg_counts, fill_value=0)
 
+            if neg_counts.any():
+                stats['has_invalid'] = True
+                chunk = chunk[~invalid]
 
-def clean_bitcoin() -> tuple[DataFrame, dict]:
+            # Convert string timestamps to DateTime
+            chunk[ts] = to_timestamps(chunk[ts], 'bitcoin')
+
+            # Skip the rows that are already cleaned
+            if since is not None:
+                chunk = chunk[chunk[ts] > since]
+
+            if carry is not None:
+                chunk = concat([carry, chunk])
+
+            if chunk.empty:
+                continue
+
+            # Hold back the rows of the last timestamp, so duplicates across the border are found
+            tail: Series = chunk[ts] == chunk[ts].iloc[-1]
+            carry = chunk[tail]
+
+            write_part(chunk[~tail])
+
+        if carry is not None:
+            write_part(carry)
+
+        parts.sort(key=lambda p: p[0])
+
+        # Chunks of an ordered file never overlap
+        for (_, last, _), (first, _, _) in zip(parts, parts[1:]):
+            if first <= last:
+                raise ValueError("Bitcoin data is not ordered by timestamp, use clean_bitcoin without chunk_size")
+
+        # Nothing to add to the existing clean data
+        if parts or since is None:
+            save_parquet_stream(read_parts(), "bitcoin", append=since is not None)
+    finally:
+        rmtree(parts_path, ignore_errors=True)
+
+    save_manifest('bitcoin')
+
+    stats['bad_perc'] = ((stats['invalid_timestamps'] + stats['dup_timestamps']) / stats['init_size']) * 100
+
+    return stats
+
+
+def clean_bitcoin(
+        chunk_size: int | None = None,
+        since: Timestamp | None = None,
+        engine: Engine = 'pandas'
+) -> tuple[DataFrame, dict]:
     """
 
     Cleans the Bitcoin dataset and saves it.
 
+    Args:
+        chunk_size: If given, the dataset is cleaned in a streaming fashion using clean_bitcoin_stream.
+        since: If given, only the rows after it are cleaned and appended to the existing clean data.
+        engine: Library running the cleaning, arrow always writes the data in slices and ignores chunk_size.
+
     Returns:
-        DataFrame containing the cleaned BTC data.
+        DataFrame containing the cleaned BTC data, only the new rows if since is given.
 
     """
+    if chunk_size or engine == 'arrow':
+        stream_stats: dict = clean_bitcoin_table(since) if engine == 'arrow' else clean_bitcoin_stream(chunk_size, since)
+
+        return read_parquet(
+            path.join(dir_path, "bitcoin", "clean.parquet"),
+            filters=[('timestamp', '>', since)] if since is not None else None
+        ), stream_stats
+
     df: DataFrame = load_bitcoin()
     stats: dict = {}
 
@@ -32,20 +254,20 @@ def clean_bitcoin() -> tuple[DataFrame, dict]:
     stats['missing_vals'] = df.isna().sum()
 
     # Remove negative values
-    has_neg: bool = False
-
-    for column in df.columns:
-        if not is_numeric_dtype(df[column]):
-            continue
+    invalid, neg_counts = find_negatives(df)
 
-        if any(df[column] < 0):
-            has_neg = True
-            df = df[df[column] >= 0]
+    stats['neg_counts'] = neg_counts
+    stats['has_invalid'] = bool(neg_counts.any())
 
-    stats['has_invalid'] = has_neg
+    if stats['has_invalid']:
+        df = df[~invalid]
 
     # Convert string timestamps to DateTime
-    df[ts] = to_datetime(df[ts])
+    df[ts] = to_timestamps(df[ts], 'bitcoin')
+
+    # Skip the rows that are already cleaned
+    if since is not None:
+        df = df[df[ts] > since]
 
     prev_sz: int = len(df.index)
 
@@ -70,23 +292,31 @@ def clean_bitcoin() -> tuple[DataFrame, dict]:
     # Set the timestamp column as the index
     df.set_index(ts, inplace=True)
 
-    save_parquet(
-        df,
-        "bitcoin"
-    )
+    if since is not None:
+        append_parquet(df, "bitcoin")
+    else:
+        save_parquet(df, "bitcoin")
+
+    save_manifest('bitcoin')
 
     return df, stats
 
 
-def clean_dxy() -> DataFrame:
+def clean_dxy(since: Timestamp | None = None, engine: Engine = 'pandas') -> DataFrame:
     """
 
     Cleans the DXY dataset and saves it.
 
+    Args:
+        since: If given, only the rows after it are kept and appended to the existing clean data.
+        engine: Library running the cleaning.
+
     Returns:
-        DataFrame containing the cleaned DXY data.
+        DataFrame containing the cleaned DXY data, only the new rows if since is given.
 
     """
+    if engine == 'arrow':
+        return clean_dxy_table(since).to_pandas()
 
     # Timestamp column name
     ts: str = 'timestamp'
@@ -102,33 +332,42 @@ def clean_dxy() -> DataFrame:
     # Drop irrlevant columns
     df.drop([" High", " Low", " Close"], inplace=True, axis=1)
 
-    # Complete the year
-    df[ts] = df[ts].map(lambda d: f"{d[:-2]}20{d[-2:]}")
-
-    # Convert the timestamp column to a datetime object
-    df[ts] = to_datetime(df[ts], format="%m/%d/%Y")
+    # Convert the timestamp column to a datetime object, two-digit years are completed by the format
+    df[ts] = to_timestamps(df[ts], 'dxy')
 
-    # Set the timestamp column as the index (for df.resample to work)
+    # Set the timestamp column as the index, the series is kept at its native frequency
     df.set_index(ts, inplace=True)
 
-    # Resample the DataFrame into minute intervals and forward fill the values
-    df = df.resample('min').ffill()
+    # The file is ordered from the latest date
+    df.sort_index(inplace=True)
 
     # Save file
-    save_parquet(df, 'dxy')
+    if since is not None:
+        df = df[df.index > since]
+        append_parquet(df, 'dxy')
+    else:
+        save_parquet(df, 'dxy')
+
+    save_manifest('dxy')
 
     return df
 
 
-def clean_sentiment() -> DataFrame:
+def clean_sentiment(since: Timestamp | None = None, engine: Engine = 'pandas') -> DataFrame:
     """
 
         Cleans the sentiment dataset and saves it.
 
+        Args:
+            since: If given, only the rows after it are kept and appended to the existing clean data.
+            engine: Library running the cleaning.
+
         Returns:
-            DataFrame containing the cleaned sentiment data.
+            DataFrame containing the cleaned sentiment data, only the new rows if since is given.
 
         """
+    if engine == 'arrow':
+        return clean_sentiment_table(since).to_pandas()
 
     # Timestamp column name
     ts: str = 'timestamp'
@@ -141,35 +380,45 @@ def clean_sentiment() -> DataFrame:
     }, inplace=True)
 
     # Convert the timestamp column to a datetime object
-    df[ts] = to_datetime(df[ts], format="%Y-%m-%d")
+    df[ts] = to_timestamps(df[ts], 'sentiment')
 
     # Extract only useful dates
     df = df[(Timestamp('2017-01-01') <= df[ts]) & (df[ts] <= Timestamp('2023-12-31'))]
 
-    # Set the timestamp column as the index (for df.resample to work)
+    # Set the timestamp column as the index, the series is kept at its native frequency
     df.set_index(ts, inplace=True)
+    df.sort_index(inplace=True)
 
-    # Resample the DataFrame into minute intervals and forward fill the values
-    df = df.resample('min').asfreq()
-
-    # Fill NaN values with the average of the neighboring values
-    df = df.interpolate(method='time')
+    # Missing values are interpolated from their neighbors when joined
+    df = df.dropna()
 
     # Save file
-    save_parquet(df, 'sentiment')
+    if since is not None:
+        df = df[df.index > since]
+        append_parquet(df, 'sentiment')
+    else:
+        save_parquet(df, 'sentiment')
+
+    save_manifest('sentiment')
 
     return df
 
 
-def clean_fed_funds() -> DataFrame:
+def clean_fed_funds(since: Timestamp | None = None, engine: Engine = 'pandas') -> DataFrame:
     """
 
     Cleans the federal funds dataset and saves it.
 
+    Args:
+        since: If given, only the rows after it are kept and appended to the existing clean data.
+        engine: Library running the cleaning.
+
     Returns:
-        DataFrame containing the cleaned FedRate data.
+        DataFrame containing the cleaned FedRate data, only the new rows if since is given.
 
     """
+    if engine == 'arrow':
+        return clean_fed_funds_table(since).to_pandas()
 
     # Timestamp column name
     ts: str = 'timestamp'
@@ -183,32 +432,42 @@ def clean_fed_funds() -> DataFrame:
     }, inplace=True)
 
     # Convert the timestamp column to a datetime object
-    df[ts] = to_datetime(df[ts], format="%Y-%m-%d")
+    df[ts] = to_timestamps(df[ts], 'fedFunds')
 
     # Extract only useful dates
     df = df[(Timestamp('2017-01-01') <= df[ts]) & (df[ts] <= Timestamp('2023-12-31'))]
 
-    # Set the timestamp column as the index (for df.resample to work)
+    # Set the timestamp column as the index, the series is kept at its native frequency
     df.set_index(ts, inplace=True)
-
-    # Resample the DataFrame into minute intervals and forward fill the values
-    df = df.resample('min').ffill()
+    df.sort_index(inplace=True)
 
     # Save file
-    save_parquet(df, 'fedFunds')
+    if since is not None:
+        df = df[df.index > since]
+        append_parquet(df, 'fedFunds')
+    else:
+        save_parquet(df, 'fedFunds')
+
+    save_manifest('fedFunds')
 
     return df
 
 
-def clean_fear_greed() -> DataFrame:
+def clean_fear_greed(since: Timestamp | None = None, engine: Engine = 'pandas') -> DataFrame:
     """
 
     Cleans the fear and greed dataset and saves it.
 
+    Args:
+        since: If given, only the rows after it are kept and appended to the existing clean data.
+        engine: Library running the cleaning.
+
     Returns:
-        DataFrame containing the cleaned FNG data.
+        DataFrame containing the cleaned FNG data, only the new rows if since is given.
 
     """
+    if engine == 'arrow':
+        return clean_fear_greed_table(since).to_pandas()
 
     # Timestamp column name
     ts: str = 'timestamp'
@@ -233,7 +492,7 @@ def clean_fear_greed() -> DataFrame:
     df = concat([missing_df, df]).reset_index(drop=True)
 
     # Convert the timestamp column to a datetime object
-    df[ts] = to_datetime(df[ts], format="%d-%m-%Y")
+    df[ts] = to_timestamps(df[ts], 'fearGreed')
 
     # Extract only useful dates
     df = df[(Timestamp('2017-01-01') <= df[ts]) & (df[ts] <= Timestamp('2023-12-31'))]
@@ -241,18 +500,99 @@ def clean_fear_greed() -> DataFrame:
     # Convert index from str to numeric
     df['fng'] = to_numeric(df['fng'])
 
-    # Set the timestamp column as the index (for df.resample to work)
+    # Set the timestamp column as the index, the series is kept at its native frequency
     df.set_index(ts, inplace=True)
-
-    # Resample the DataFrame into minute intervals and forward fill the values
-    df = df.resample('min').ffill()
+    df.sort_index(inplace=True)
 
     # Save file
-    save_parquet(df, 'fearGreed')
+    if since is not None:
+        df = df[df.index > since]
+        append_parquet(df, 'fearGreed')
+    else:
+        save_parquet(df, 'fearGreed')
+
+    save_manifest('fearGreed')
 
     return df
 
 
+def clean_source(source: Source, engine: Engine = 'pandas') -> tuple[Source, str, float]:
+    """
+
+    Cleans a single source and saves it, meant to be run in a worker process.
+    Only the path of the saved file is returned, so the cleaned data is never copied between processes.
+
+    Args:
+        source: Data source to clean.
+        engine: Library running the cleaning.
+
+    Returns:
+        The source, the path to its cleaned parquet file, and the seconds spent cleaning it.
+
+    """
+    cleaner: Callable = {
+        'pandas': {
+            'bitcoin': clean_bitcoin_stream,
+            'dxy': clean_dxy,
+            'fearGreed': clean_fear_greed,
+            'fedFunds': clean_fed_funds,
+            'sentiment': clean_sentiment,
+        },
+        # The tables are not converted to DataFrames
+        'arrow': {
+            'bitcoin': clean_bitcoin_table,
+            'dxy': clean_dxy_table,
+            'fearGreed': clean_fear_greed_table,
+            'fedFunds': clean_fed_funds_table,
+            'sentiment': clean_sentiment_table,
+        },
+    }[engine][source]
+
+    t0: float = perf_counter()
+
+    cleaner()
+
+    return source, path.join(dir_path, source, "clean.parquet"), perf_counter() - t0
+
+
+def clean_all(
+        workers: int = clean_workers,
+        engine: Engine = 'pandas'
+) -> tuple[dict[Source, str], dict[Source, float]]:
+    """
+
+    Cleans all the sources, each in its own process since they are independent.
+
+    Args:
+        workers: Maximum number of worker processes, 1 cleans the sources one after another in this process.
+        engine: Library running the cleaning.
+
+    Returns:
+        The path to the cleaned parquet file of each source, along with the seconds spent cleaning each source.
+
+    """
+    paths: dict[Source, str] = {}
+    timings: dict[Source, float] = {}
+
+    if workers <= 1:
+        for source in sources:
+            _, paths[source], timings[source] = clean_source(source, engine)
+
+        return paths, timings
+
+    # Bitcoin is submitted first, as it takes the longest
+    with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+        futures: list[Future] = [executor.submit(clean_source, source, engine) for source in sources]
+
+        for future in as_completed(futures):
+            source, file_path, seconds = future.result()
+
+            paths[source] = file_path
+            timings[source] = seconds
+
+    return paths, timings
+
+
 def load_clean_fear_greed() -> DataFrame:
     """
 
@@ -264,8 +604,8 @@ def load_clean_fear_greed() -> DataFrame:
     """
     cl_path: str = path.join(dir_path, "fearGreed", "clean.parquet")
 
-    # If we have already cleaned the file, then return it.
-    if path.exists(cl_path):
+    # If we have already cleaned the file from the current raw data, then return it.
+    if path.exists(cl_path) and is_fresh('fearGreed'):
         return read_parquet(cl_path)
 
     return clean_fear_greed()
@@ -282,8 +622,8 @@ def load_clean_fed_funds() -> DataFrame:
     """
     cl_path: str = path.join(dir_path, "fedFunds", "clean.parquet")
 
-    # If we have already cleaned the file, then return it.
-    if path.exists(cl_path):
+    # If we have already cleaned the file from the current raw data, then return it.
+    if path.exists(cl_path) and is_fresh('fedFunds'):
         return read_parquet(cl_path)
 
     return clean_fed_funds()
@@ -301,8 +641,8 @@ def load_clean_dxy() -> DataFrame:
     """
     cl_path: str = path.join(dir_path, "dxy", "clean.parquet")
 
-    # If we have already cleaned the file, then return it.
-    if path.exists(cl_path):
+    # If we have already cleaned the file from the current raw data, then return it.
+    if path.exists(cl_path) and is_fresh('dxy'):
         return read_parquet(cl_path)
 
     return clean_dxy()
@@ -320,8 +660,8 @@ def load_clean_sentiment() -> DataFrame:
     """
     cl_path: str = path.join(dir_path, "sentiment", "clean.parquet")
 
-    # If we have already cleaned the file, then return it.
-    if path.exists(cl_path):
+    # If we have already cleaned the file from the current raw data, then return it.
+    if path.exists(cl_path) and is_fresh('sentiment'):
         return read_parquet(cl_path)
 
     return clean_sentiment()
@@ -331,7 +671,7 @@ def load_clean_bitcoin() -> DataFrame:
     """
 
     Loads the clean bitcoin price Data from 2017 to 2023 and returns it as a DataFrame.
-    If not present, the data is downloaded and cleaned.
+    If not present, the data is downloaded and cleaned chunk by chunk, then read back from the written file.
 
     Returns:
         DataFrame containing the cleaned BTC data.
@@ -339,8 +679,9 @@ def load_clean_bitcoin() -> DataFrame:
     """
     cl_path: str = path.join(dir_path, "bitcoin", "clean.parquet")
 
-    # If we have already cleaned the file, then return it.
-    if path.exists(cl_path):
+    # If we have already cleaned the file from the current raw data, then return it.
+    if path.exists(cl_path) and is_fresh('bitcoin'):
         return read_parquet(cl_path)
 
-    return clean_bitcoin()[0]
+    # The raw file is never loaded whole, only the cleaned rows are
+    return clean_bitcoin(bitcoin_chunk_size)[0]
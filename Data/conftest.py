@@ -0,0 +1,82 @@
+from os import makedirs, path
+from pathlib import Path
+from pandas import DataFrame, DatetimeIndex, date_range
+from pytest import MonkeyPatch, fixture
+from shutil import copy
+
+from Benchmark.synthetic import bitcoin_frame
+
+from . import arrow_cleaner, batches, cleaner, io, manifest, merger, store
+
+
+# Data directory of the repository
+src_path: str = path.dirname(path.realpath(__file__))
+
+# Modules holding their own reference to the Data directory
+data_modules: tuple = (io, arrow_cleaner, batches, cleaner, manifest, merger, store)
+
+# Raw files of the repository copied to the directory of the tests, the other raw files are generated
+copied_files: tuple[str, ...] = ('bitcoin/metadata.json', 'dxy/data.csv', 'fedFunds/data.csv', 'sentiment/data.csv')
+
+# Number of raw Bitcoin rows of the tests
+rows: int = 3_000
+
+# Ratio of the raw Bitcoin rows holding a negative value
+negative_ratio: float = 0.01
+
+
+def write_bitcoin(dest: str, df: DataFrame) -> None:
+    """
+
+    Args:
+        dest: Data directory.
+        df: Raw Bitcoin rows, written as the Kaggle CSV.
+
+    """
+    df.to_csv(path.join(dest, "bitcoin", "data.csv"), index=False)
+
+
+def write_fear_greed(dest: str) -> None:
+    """
+
+    Writes a raw FNG file covering the synthetic Bitcoin rows, as load_fear_greed saves it once downloaded.
+
+    Args:
+        dest: Data directory.
+
+    """
+    days: DatetimeIndex = date_range('2017-08-01', '2017-09-30', freq='D')
+
+    makedirs(path.join(dest, "fearGreed"), exist_ok=True)
+    DataFrame({
+        'value': [(i * 7) % 100 for i in range(days.size)],
+        'value_classification': 'Neutral',
+        'timestamp': days.strftime('%d-%m-%Y'),
+    }).to_csv(path.join(dest, "fearGreed", "data.csv"))
+
+
+@fixture
+def data_dir(tmp_path: Path, monkeypatch: MonkeyPatch) -> str:
+    """
+
+    Args:
+        tmp_path: Directory of the test.
+        monkeypatch: Patches undone after the test.
+
+    Returns:
+        A Data directory holding every raw file, used by all the Data modules in place of their own directory.
+
+    """
+    dest: str = str(tmp_path)
+
+    for module in data_modules:
+        monkeypatch.setattr(module, 'dir_path', dest)
+
+    for name in copied_files:
+        makedirs(path.join(dest, path.dirname(name)), exist_ok=True)
+        copy(path.join(src_path, name), path.join(dest, name))
+
+    write_fear_greed(dest)
+    write_bitcoin(dest, bitcoin_frame(rows, negative_ratio=negative_ratio))
+
+    return dest
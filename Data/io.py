@@ -1,29 +1,48 @@
 from dataclasses import asdict
+from itertools import chain
 from json import dumps
 from opendatasets import download
-from os import path, rename, remove, mkdir
-from pandas import DataFrame, read_csv
+from os import path, rename, remove, mkdir, replace
+from pandas import DataFrame, DatetimeIndex, Timestamp, read_csv
+from pandas.io.parsers import TextFileReader
+from pyarrow import Table, schema, int8, int16, array
+from pyarrow.dataset import Dataset, Expression, Partitioning, dataset, field, partitioning, write_dataset
+from pyarrow.parquet import ParquetFile, ParquetWriter
+from shutil import rmtree
 from requests import get
-from typing import Literal
+from typing import Literal, Iterable
 
 from Config import config
 from Utils import read_json
 
+from .schema import from_epoch_minutes, epoch_minute
+
 
 # Directory path
 dir_path: str = path.dirname(path.realpath(__file__))
 
+# Partitioning of the merged dataset, one directory per month
+month_partitioning: Partitioning = partitioning(
+    schema([('year', int16()), ('month', int8())]),
+    flavor='hive'
+)
+
+# Rows per parquet row group of the merged dataset, one week of minutes.
+# Each row group keeps min/max statistics, so reads of a date range skip the other weeks.
+rows_per_group: int = 10_080
 
-def load_croissant(dir_name: str) -> DataFrame:
+
+def load_croissant(dir_name: str, chunk_size: int | None = None) -> DataFrame | TextFileReader:
     """
 
     If not present locally, the dataset is downloaded.
 
     Args:
         dir_name: Directory of the CroissantML metadata.json file to load.
+        chunk_size: If given, the file is streamed in DataFrames of at most chunk_size rows.
 
     Returns:
-        The loaded DataFrame.
+        The loaded DataFrame, or an iterator over its chunks if chunk_size is given.
 
     """
 
@@ -36,7 +55,7 @@ def load_croissant(dir_name: str) -> DataFrame:
 
     # If we have already downloaded the file, then return it.
     if path.exists(cl_path):
-        return read_csv(cl_path)
+        return read_csv(cl_path, chunksize=chunk_size)
 
     url: str = meta_data['url']
     folder_name: str = url.split('/')[-1]
@@ -58,19 +77,22 @@ def load_croissant(dir_name: str) -> DataFrame:
     remove(path.join(dest_path, folder_name))
 
     # Return re-read the file
-    return load_croissant(dir_name)
+    return load_croissant(dir_name, chunk_size)
 
 
-def load_bitcoin() -> DataFrame:
+def load_bitcoin(chunk_size: int | None = None) -> DataFrame | TextFileReader:
     """
     Loads the bitcoin price Data from 2017 to 2023 and returns it as a DataFrame.
     If not present locally, the dataset is downloaded.
 
+    Args:
+        chunk_size: If given, the data is streamed in DataFrames of at most chunk_size rows.
+
     Returns:
-        DataFrame containing the training BTC data.
+        DataFrame containing the training BTC data, or an iterator over its chunks.
 
     """
-    return load_croissant("bitcoin")
+    return load_croissant("bitcoin", chunk_size)
 
 
 def load_sentiment() -> DataFrame:
@@ -171,3 +193,242 @@ def save_parquet(
 
     """
     df.to_parquet(path.join(dir_path, folder, f"{file_name if file_name else 'clean'}.parquet"))
+
+
+def save_parquet_stream(
+        tables: Iterable[Table],
+        folder: Literal['bitcoin', 'dxy', 'fedFunds', 'inflation', 'fearGreed', 'sentiment'] = '',
+        file_name: str = None,
+        append: bool = False
+) -> None:
+    """
+    The tables are written one after the other into a single parquet file,
+    so that only one table has to be held in memory at a time.
+    The schema of the first table (or of the existing file when appending) is used for the whole file.
+
+    Args:
+        tables: Tables to save, in the order they should appear in the file.
+        folder: Folder to save the file in. From a list of predefined folders.
+        file_name: File name to save the data in, no extension. Default is clean.
+        append: If True and the file exists, the tables are added after its current content.
+
+    """
+    file_path: str = path.join(dir_path, folder, f"{file_name if file_name else 'clean'}.parquet")
+
+    if append and path.exists(file_path):
+        existing: ParquetFile = ParquetFile(file_path)
+
+        # Row groups of the existing file are copied one at a time
+        tables = chain(
+            (existing.read_row_group(i) for i in range(existing.num_row_groups)),
+            tables
+        )
+
+    # Write next to the file and swap at the end, so readers never see a partial file
+    tmp_path: str = f"{file_path}.tmp"
+    writer: ParquetWriter | None = None
+
+    try:
+        for table in tables:
+            if writer is None:
+                writer = ParquetWriter(tmp_path, table.schema)
+
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        replace(tmp_path, file_path)
+
+
+def append_parquet(
+        df: DataFrame,
+        folder: Literal['bitcoin', 'dxy', 'fedFunds', 'inflation', 'fearGreed', 'sentiment'] = '',
+        file_name: str = None
+) -> None:
+    """
+    The DataFrame is appended to the parquet file in the appropriate location.
+    If the file does not exist, it is created.
+
+    Args:
+        df: DataFrame to append, its rows must come after the existing ones.
+        folder: Folder to save the file in. From a list of predefined folders.
+        file_name: File name to save the data in, no extension. Default is clean.
+
+    """
+    if df.empty:
+        return
+
+    save_parquet_stream((Table.from_pandas(df),), folder, file_name, append=True)
+
+
+def read_watermarks() -> dict[str, Timestamp]:
+    """
+
+    Returns:
+        The latest timestamp already cleaned for each source, and for the merged dataset.
+
+    """
+    file_path: str = path.join(dir_path, "watermarks.json")
+
+    if not path.exists(file_path):
+        return {}
+
+    return {k: Timestamp(v) for k, v in read_json(file_path).items()}
+
+
+def save_watermarks(marks: dict[str, Timestamp]) -> None:
+    """
+
+    Args:
+        marks: The latest timestamp already cleaned for each source, and for the merged dataset.
+
+    """
+    with open(path.join(dir_path, "watermarks.json"), 'w') as file:
+        file.write(dumps({k: v.isoformat() for k, v in marks.items()}, indent=4))
+
+
+def write_partitioned(df: DataFrame, name: str = 'clean', append: bool = False) -> None:
+    """
+    The DataFrame is saved as a parquet dataset partitioned by year and month.
+
+    Args:
+        df: DataFrame to save, indexed by epoch minutes.
+        name: Directory of the dataset, inside the Data directory.
+        append: If True the rows are added to the dataset, otherwise the dataset is replaced,
+            the previous one being only missing between two renames.
+
+    """
+    dest_path: str = path.join(dir_path, name)
+
+    if append and df.empty:
+        return
+
+    # A replaced dataset is written next to the current one and renamed into place once complete,
+    # so readers never see a partial dataset
+    tmp_path: str = dest_path if append else path.join(dir_path, f".{name}.tmp")
+
+    # Left over by an interrupted write
+    if not append:
+        rmtree(tmp_path, ignore_errors=True)
+
+    try:
+        if not df.empty:
+            stamps: DatetimeIndex = from_epoch_minutes(df.index)
+            table: Table = Table.from_pandas(df)
+
+            table = table.append_column('year', array(stamps.year, type=int16()))
+            table = table.append_column('month', array(stamps.month, type=int8()))
+
+            write_dataset(
+                table,
+                tmp_path,
+                format='parquet',
+                partitioning=month_partitioning,
+                # Unique name per write, so appends never overwrite previous files
+                basename_template=f"part-{df.index[0]}-{{i}}.parquet",
+                existing_data_behavior='overwrite_or_ignore',
+                min_rows_per_group=rows_per_group,
+                max_rows_per_group=rows_per_group,
+            )
+    except BaseException:
+        if not append:
+            rmtree(tmp_path, ignore_errors=True)
+
+        raise
+
+    if append:
+        return
+
+    # A directory cannot replace another one, the previous dataset is moved aside first and deleted last
+    old_path: str = path.join(dir_path, f".{name}.old")
+    rmtree(old_path, ignore_errors=True)
+
+    if path.exists(dest_path):
+        rename(dest_path, old_path)
+
+    if path.exists(tmp_path):
+        rename(tmp_path, dest_path)
+
+    rmtree(old_path, ignore_errors=True)
+
+
+def open_partitioned(name: str = 'clean') -> Dataset:
+    """
+
+    Args:
+        name: Directory of the dataset, inside the Data directory.
+
+    Returns:
+        The dataset saved by write_partitioned, no data is read yet.
+
+    """
+    return dataset(path.join(dir_path, name), format='parquet', partitioning=month_partitioning)
+
+
+def range_filter(
+        start: Timestamp | str | None = None,
+        end: Timestamp | str | None = None
+) -> Expression | None:
+    """
+
+    Args:
+        start: First timestamp to keep, inclusive.
+        end: Last timestamp to keep, inclusive.
+
+    Returns:
+        The filter of a dataset saved by write_partitioned, on both its partitions and its rows.
+        None if neither bound is given.
+
+    """
+    ts: str = 'timestamp'
+    condition: Expression | None = None
+
+    if start is not None:
+        start = Timestamp(start)
+        condition = (field('year') > start.year) | ((field('year') == start.year) & (field('month') >= start.month))
+        condition &= field(ts) >= epoch_minute(start)
+
+    if end is not None:
+        end = Timestamp(end)
+        end_condition: Expression = (field('year') < end.year) | ((field('year') == end.year) & (field('month') <= end.month))
+        end_condition &= field(ts) <= epoch_minute(end)
+        condition = end_condition if condition is None else condition & end_condition
+
+    return condition
+
+
+def read_partitioned(
+        name: str = 'clean',
+        start: Timestamp | str | None = None,
+        end: Timestamp | str | None = None,
+        columns: list[str] | None = None
+) -> DataFrame:
+    """
+    Reads a dataset saved by write_partitioned. Partitions outside the date range are never opened,
+    row groups outside of it are skipped using their statistics, and only the given columns are decoded.
+
+    Args:
+        name: Directory of the dataset, inside the Data directory.
+        start: First timestamp to read, inclusive.
+        end: Last timestamp to read, inclusive.
+        columns: Columns to read, all of them by default. The index is always read.
+
+    Returns:
+        The read DataFrame, indexed by epoch minutes.
+
+    """
+    data: Dataset = open_partitioned(name)
+    ts: str = 'timestamp'
+
+    # Partition columns are only used for the filtering
+    columns = [ts, *(c for c in (columns if columns is not None else data.schema.names) if c not in (ts, 'year', 'month'))]
+
+    df: DataFrame = data.to_table(columns=columns, filter=range_filter(start, end)).to_pandas()
+
+    # Partitions are not read in their chronological order
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    return df
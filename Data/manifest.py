@@ -0,0 +1,205 @@
+from hashlib import sha256
+from json import dumps
+from os import path, stat, stat_result
+from typing import Literal
+
+from Utils import read_json
+
+from .io import dir_path
+
+
+# Cleaned data sources, named after their folders
+Source = Literal['bitcoin', 'dxy', 'fearGreed', 'fedFunds', 'sentiment']
+
+# Data sources in the order they are merged
+sources: tuple[Source, ...] = ('bitcoin', 'dxy', 'fearGreed', 'fedFunds', 'sentiment')
+
+# Version of each cleaner and of the merger, bump it whenever its output changes
+cleaner_versions: dict[str, int] = {
+    'bitcoin': 1,
+    'dxy': 1,
+    'fearGreed': 1,
+    'fedFunds': 1,
+    'sentiment': 1,
+    'merged': 1,
+}
+
+# Size of the blocks read while hashing
+block_size: int = 1 << 20
+
+
+def file_digest(file_path: str) -> str:
+    """
+
+    Args:
+        file_path: Path to the file to hash.
+
+    Returns:
+        The SHA-256 hex digest of the file content.
+
+    """
+    digest = sha256()
+
+    with open(file_path, 'rb') as file:
+        while block := file.read(block_size):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def manifest_path(source: Source | Literal['merged']) -> str:
+    """
+
+    Args:
+        source: Data source, or merged for the merged dataset.
+
+    Returns:
+        Path to the manifest stored next to the cleaned data.
+
+    """
+    if source == 'merged':
+        return path.join(dir_path, "clean.manifest.json")
+
+    return path.join(dir_path, source, "clean.manifest.json")
+
+
+def read_manifest(source: Source | Literal['merged']) -> dict | None:
+    """
+
+    Args:
+        source: Data source, or merged for the merged dataset.
+
+    Returns:
+        The manifest of the cleaned data, None if there is none.
+
+    """
+    file_path: str = manifest_path(source)
+
+    return read_json(file_path) if path.exists(file_path) else None
+
+
+def raw_fingerprint(source: Source, known: dict | None = None) -> dict | None:
+    """
+
+    The raw file is only hashed if its size or modification time differ from the known fingerprint.
+
+    Args:
+        source: Data source.
+        known: Previously recorded fingerprint of the raw file.
+
+    Returns:
+        The size, modification time and hash of the raw file, None if it does not exist.
+
+    """
+    raw_path: str = path.join(dir_path, source, "data.csv")
+
+    if not path.exists(raw_path):
+        return None
+
+    st: stat_result = stat(raw_path)
+
+    if known is not None and known['size'] == st.st_size and known['mtime'] == st.st_mtime_ns:
+        return known
+
+    return {
+        'size': st.st_size,
+        'mtime': st.st_mtime_ns,
+        'sha256': file_digest(raw_path),
+    }
+
+
+def source_digest(source: Source) -> str | None:
+    """
+
+    Args:
+        source: Data source.
+
+    Returns:
+        Identifier of the raw content and cleaner version the cleaned data was built from.
+
+    """
+    manifest: dict | None = read_manifest(source)
+
+    if manifest is None:
+        return None
+
+    return f"{manifest['raw']['sha256'] if manifest['raw'] else None}:{manifest['version']}"
+
+
+def save_manifest(source: Source | Literal['merged']) -> None:
+    """
+
+    Records what the cleaned data was built from. Must be called after the data is saved.
+
+    Args:
+        source: Data source, or merged for the merged dataset.
+
+    """
+    if source == 'merged':
+        manifest: dict = {
+            'version': cleaner_versions[source],
+            'inputs': {s: source_digest(s) for s in sources},
+        }
+    else:
+        prev: dict | None = read_manifest(source)
+        manifest: dict = {
+            'version': cleaner_versions[source],
+            'raw': raw_fingerprint(source, prev['raw'] if prev else None),
+        }
+
+    with open(manifest_path(source), 'w') as file:
+        file.write(dumps(manifest, indent=4))
+
+
+def is_fresh(source: Source | Literal['merged']) -> bool:
+    """
+
+    Args:
+        source: Data source, or merged for the merged dataset.
+
+    Returns:
+        True if the cleaned data was built from the current raw file and cleaner version.
+        The merged dataset is fresh if all of its inputs are fresh and unchanged since it was merged.
+
+    """
+    manifest: dict | None = read_manifest(source)
+
+    # Cleaned before manifests existed, only kept if there is no raw file to rebuild from
+    if manifest is None:
+        return source != 'merged' and raw_fingerprint(source) is None
+
+    if manifest['version'] != cleaner_versions[source]:
+        return False
+
+    if source == 'merged':
+        return all(is_fresh(s) for s in sources) and manifest['inputs'] == {s: source_digest(s) for s in sources}
+
+    current: dict | None = raw_fingerprint(source, manifest['raw'])
+
+    # The raw file was removed after cleaning, there is nothing to rebuild from
+    if current is None or manifest['raw'] is None:
+        return current is None
+
+    if current['sha256'] != manifest['raw']['sha256']:
+        return False
+
+    # Only touched, remember the new modification time to avoid hashing it again
+    if current is not manifest['raw']:
+        save_manifest(source)
+
+    return True
+
+
+def dataset_hash() -> str | None:
+    """
+
+    Returns:
+        Identifier of the content of the merged dataset, None if it was never merged.
+
+    """
+    manifest: dict | None = read_manifest('merged')
+
+    if manifest is None:
+        return None
+
+    return sha256(dumps(manifest, sort_keys=True).encode()).hexdigest()
@@ -1,68 +1,326 @@
-from functools import reduce
-from pandas import merge
+from numpy import interp, nan, ndarray, searchsorted, zeros, isnan, logical_and, float64
+from pandas import DatetimeIndex, notna
+from time import perf_counter
 
 from .cleaner import *
-from .io import save_parquet, dir_path
+from .manifest import sources, save_manifest, is_fresh
+from .schema import Precision, compact, epoch_minute
+from .io import write_partitioned, read_partitioned, read_watermarks, save_watermarks, dir_path
 
 
 # List of target labels
 target_labels: list[str] = ['close', 'high', 'low']
 
 
-def get_data(refresh: bool = False) -> DataFrame:
+def align(index: DatetimeIndex, right: DataFrame, interpolate: bool = False) -> tuple[dict[str, ndarray], ndarray]:
+    """
+
+    Aligns a series stored at its native frequency with a minute index, without building a DataFrame.
+    Minutes outside the range of the series have no value.
+
+    Args:
+        index: Sorted minute index.
+        right: Sorted daily or weekly series.
+        interpolate: If True the values are linearly interpolated in time, otherwise the last known value is used.
+
+    Returns:
+        The aligned columns, along with the mask of the minutes that have a value for every column.
+
+    """
+    x: ndarray = index.asi8
+    xp: ndarray = right.index.as_unit(index.unit).asi8
+
+    if xp.size == 0:
+        return {c: right[c].to_numpy() for c in right.columns}, zeros(x.size, dtype=bool)
+
+    if interpolate:
+        columns: dict[str, ndarray] = {
+            c: interp(x, xp, right[c].to_numpy(dtype=float64), left=nan, right=nan) for c in right.columns
+        }
+        valid: ndarray = logical_and.reduce([~isnan(v) for v in columns.values()])
+
+        return columns, valid
+
+    # Position of the last known value of each minute
+    pos: ndarray = searchsorted(xp, x, side='right') - 1
+
+    # Values are not carried past the end of the series
+    valid: ndarray = (pos >= 0) & (x <= xp[-1])
+    pos[~valid] = 0
+
+    columns: dict[str, ndarray] = {c: right[c].to_numpy()[pos] for c in right.columns}
+
+    for v in columns.values():
+        valid &= notna(v)
+
+    return columns, valid
+
+
+def merge(
+        bitcoin: DataFrame,
+        dxy: DataFrame,
+        fear_greed: DataFrame,
+        fed_funds: DataFrame,
+        sentiment: DataFrame
+) -> DataFrame:
+    """
+
+    Joins all the series onto the BTC minute index in a single step.
+    Rows missing any value are filtered out while building the result.
+
+    Args:
+        bitcoin: Cleaned BTC minute data.
+        dxy: Cleaned DXY data.
+        fear_greed: Cleaned FNG data.
+        fed_funds: Cleaned FedRate data.
+        sentiment: Cleaned sentiment data.
+
+    Returns:
+        The merged DataFrame, without the rows that are missing values.
+
+    """
+    index: DatetimeIndex = bitcoin.index
+
+    # Remove invalid rows
+    keep: ndarray = ~bitcoin.isna().any(axis=1).to_numpy()
+    columns: dict[str, ndarray] = {}
+
+    for right, interpolate in (
+            (dxy, False),
+            (fear_greed, False),
+            (fed_funds, False),
+            (sentiment, True)
+    ):
+        aligned, valid = align(index, right, interpolate)
+
+        keep &= valid
+        columns.update(aligned)
+
+    # The filtered arrays are used as they are, without being consolidated into another copy
+    return DataFrame(
+        {
+            **{c: bitcoin[c].to_numpy()[keep] for c in bitcoin.columns},
+            **{c: v[keep] for c, v in columns.items()},
+        },
+        index=index[keep],
+        copy=False
+    )
+
+
+def update_data(engine: Engine = 'pandas') -> DataFrame:
+    """
+
+    Cleans only the rows of each source that are newer than its high-water-mark,
+    and appends the newly mergeable rows to the merged dataset.
+    Sources without a high-water-mark are cleaned from scratch.
+
+    Args:
+        engine: Library running the cleaning.
+
+    Returns:
+        The rows appended to the merged dataset, in the compact schema.
+
+    """
+    marks: dict[str, Timestamp] = read_watermarks()
+
+    # Clean the new rows of each source
+    new_rows: dict[str, DataFrame] = {
+        'bitcoin': clean_bitcoin(bitcoin_chunk_size, marks.get('bitcoin'), engine)[0],
+        'dxy': clean_dxy(marks.get('dxy'), engine),
+        'fearGreed': clean_fear_greed(marks.get('fearGreed'), engine),
+        'fedFunds': clean_fed_funds(marks.get('fedFunds'), engine),
+        'sentiment': clean_sentiment(marks.get('sentiment'), engine),
+    }
+
+    for name, df in new_rows.items():
+        if not df.empty:
+            marks[name] = df.index[-1]
+
+    # Without the merged dataset, everything must be merged again
+    since: Timestamp | None = marks.get('merged') if path.exists(path.join(dir_path, "clean")) else None
+
+    # BTC rows that were not merged yet, including older ones that lacked a value of another source
+    df: DataFrame = merge(
+        read_parquet(
+            path.join(dir_path, "bitcoin", "clean.parquet"),
+            filters=[('timestamp', '>', since)] if since is not None else None
+        ),
+        load_clean_dxy(),
+        load_clean_fear_greed(),
+        load_clean_fed_funds(),
+        load_clean_sentiment()
+    )
+
+    if not df.empty:
+        marks['merged'] = df.index[-1]
+
+    df = compact(df)
+
+    write_partitioned(df, append=since is not None)
+
+    save_watermarks(marks)
+    save_manifest('merged')
+
+    return df
+
+
+def store_merged(df: DataFrame, frames: tuple[DataFrame, ...]) -> DataFrame:
+    """
+
+    Saves the merged dataset, along with its manifest and the high-water-marks of its sources.
+
+    Args:
+        df: Merged DataFrame.
+        frames: Cleaned sources the DataFrame was merged from, in the order of sources.
+
+    Returns:
+        The merged DataFrame in the compact schema.
+
+    """
+    last: Timestamp | None = df.index[-1] if not df.empty else None
+
+    df = compact(df)
+
+    # Save the cleaned dataset
+    write_partitioned(df)
+    save_manifest('merged')
+
+    # Everything up to here is cleaned and merged
+    save_watermarks({
+        **{
+            name: frame.index[-1] for name, frame in zip(sources, frames) if not frame.empty
+        },
+        **({'merged': last} if last is not None else {})
+    })
+
+    return df
+
+
+def refresh_data(workers: int = clean_workers, engine: Engine = 'pandas') -> tuple[DataFrame, dict[str, float]]:
+    """
+
+    Re-cleans all the sources in parallel, then merges and saves them.
+    The workers hand back the paths of the cleaned files, which are then read once here.
+
+    Args:
+        workers: Maximum number of processes cleaning the sources.
+        engine: Library running the cleaning.
+
+    Returns:
+        The merged DataFrame in the compact schema, along with the seconds spent in each stage.
+        The stages are the cleaning of each source, clean, read, merge, write and total.
+
+    """
+    timings: dict[str, float] = {}
+    t0: float = perf_counter()
+
+    # Clean every source in its own process
+    paths, clean_timings = clean_all(workers, engine)
+
+    timings.update(clean_timings)
+    timings['clean'] = perf_counter() - t0
+
+    # Read the cleaned sources
+    t1: float = perf_counter()
+    frames: tuple[DataFrame, ...] = tuple(read_parquet(paths[source]) for source in sources)
+    timings['read'] = perf_counter() - t1
+
+    t1 = perf_counter()
+    df: DataFrame = merge(*frames)
+    timings['merge'] = perf_counter() - t1
+
+    t1 = perf_counter()
+    df = store_merged(df, frames)
+    timings['write'] = perf_counter() - t1
+
+    timings['total'] = perf_counter() - t0
+
+    return df, timings
+
+
+def get_data(
+        refresh: bool = False,
+        incremental: bool = False,
+        precision: Precision = 'float64',
+        start: Timestamp | str | None = None,
+        end: Timestamp | str | None = None,
+        columns: list[str] | None = None,
+        workers: int = clean_workers,
+        engine: Engine = 'pandas',
+        verbose: bool = False
+) -> DataFrame:
     """
 
     Args:
         refresh: If True, re-cleans the datasets.
+        incremental: If True, only the data newer than the previous update is cleaned and merged.
+        precision: Type of the floating point columns, float32 halves the memory used by the data.
+        start: First timestamp to return, inclusive. Only the needed partitions are read.
+        end: Last timestamp to return, inclusive.
+        columns: Columns to return, all of them by default.
+        workers: Maximum number of processes cleaning the datasets on refresh.
+        engine: Library cleaning the datasets on refresh or incremental update.
+        verbose: True to print the seconds spent in each stage of a refresh, see refresh_data.
 
     Returns:
-        The merged DataFrame of all other DataFrames.
+        The merged DataFrame of all other DataFrames, in the compact schema.
         Suitable for use in training.
 
     """
-    cl_path: str = path.join(dir_path, "clean.parquet")
-
-    # If we have already cleaned the file, then return it.
-    if not refresh and path.exists(cl_path):
-        return read_parquet(cl_path)
-
-    df: DataFrame = reduce(
-        lambda left, right: merge(
-            left,
-            right,
-            how='left',
-            left_index=True,
-            right_index=True
-        ),
-        (
+    cl_path: str = path.join(dir_path, "clean")
+
+    if incremental and not refresh:
+        update_data(engine)
+
+    # If we have already merged the current clean data, then return it.
+    if not refresh and path.exists(cl_path) and is_fresh('merged'):
+        return compact(read_partitioned('clean', start, end, columns), precision)
+
+    df: DataFrame
+
+    if refresh:
+        timings: dict[str, float]
+        df, timings = refresh_data(workers, engine)
+
+        if verbose:
+            for stage, seconds in timings.items():
+                print(f"{stage}: {seconds:.3f}s")
+    else:
+        frames: tuple[DataFrame, ...] = (
             load_clean_bitcoin(),
             load_clean_dxy(),
             load_clean_fear_greed(),
             load_clean_fed_funds(),
             load_clean_sentiment()
-        ) if not refresh else (
-            clean_bitcoin()[0],
-            clean_dxy(),
-            clean_fear_greed(),
-            clean_fed_funds(),
-            clean_sentiment()
         )
-    )
 
-    # Remove invalid rows
-    df.dropna(inplace=True)
+        df = store_merged(merge(*frames), frames)
 
-    # Save the cleaned parquet
-    save_parquet(df)
+    # Apply the requested range and columns to the data in memory
+    df = df.loc[
+        slice(
+            epoch_minute(start) if start is not None else None,
+            epoch_minute(end) if end is not None else None
+        ),
+        columns if columns is not None else df.columns
+    ]
 
-    return df
+    return compact(df, precision)
 
 
-def get_split_data(refresh: bool = False) -> tuple[DataFrame, DataFrame]:
+def get_split_data(
+        refresh: bool = False,
+        precision: Precision = 'float64',
+        start: Timestamp | str | None = None,
+        end: Timestamp | str | None = None
+) -> tuple[DataFrame, DataFrame]:
     """
 
     Args:
         refresh: If True, recleans the datasets.
+        precision: Type of the floating point columns.
+        start: First timestamp to return, inclusive.
+        end: Last timestamp to return, inclusive.
 
     Returns:
         The merged DataFrame split into X and Y DataFrames.
@@ -70,6 +328,6 @@ def get_split_data(refresh: bool = False) -> tuple[DataFrame, DataFrame]:
     """
     global target_labels
 
-    df: DataFrame = get_data(refresh)
+    df: DataFrame = get_data(refresh, precision=precision, start=start, end=end)
 
     return df.drop(target_labels, axis=1), df[target_labels]
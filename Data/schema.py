@@ -0,0 +1,98 @@
+from numpy import int32, int64, ndarray
+from pandas import DataFrame, DatetimeIndex, Index, Timestamp, to_datetime
+from typing import Literal
+
+
+# Precision of the floating point columns
+Precision = Literal['float64', 'float32']
+
+# Integer columns of the merged dataset, along with the smallest type holding their values
+int_schema: dict[str, str] = {
+    'number_of_trades': 'int32',
+    'fng': 'int8',
+}
+
+# Floating point columns of the merged dataset, their type is given by the precision
+float_columns: tuple[str, ...] = (
+    'open',
+    'high',
+    'low',
+    'close',
+    'volume',
+    'quote_asset_volume',
+    'taker_buy_base_asset_volume',
+    'taker_buy_quote_asset_volume',
+    'open_dxy',
+    'fed_rate',
+    'sentiment',
+)
+
+# Nanoseconds in a minute
+minute_ns: int = 60_000_000_000
+
+
+def to_epoch_minutes(index: DatetimeIndex) -> ndarray:
+    """
+
+    Args:
+        index: Minute timestamps.
+
+    Returns:
+        The number of minutes since the epoch of each timestamp, as int32.
+
+    """
+    return (index.as_unit('ns').asi8 // minute_ns).astype(int32)
+
+
+def epoch_minute(timestamp: Timestamp | str) -> int:
+    """
+
+    Args:
+        timestamp: Timestamp or date string.
+
+    Returns:
+        The number of minutes since the epoch of the timestamp.
+
+    """
+    return int(to_epoch_minutes(DatetimeIndex([Timestamp(timestamp)]))[0])
+
+
+def from_epoch_minutes(minutes: ndarray | Index) -> DatetimeIndex:
+    """
+
+    Args:
+        minutes: Number of minutes since the epoch.
+
+    Returns:
+        The corresponding timestamps.
+
+    """
+    return DatetimeIndex(to_datetime(minutes.astype(int64) * minute_ns, unit='ns'), name='timestamp')
+
+
+def compact(df: DataFrame, precision: Precision = 'float64') -> DataFrame:
+    """
+
+    Applies the declared schema of the merged dataset.
+    Integer columns use the smallest type holding their values, and the index
+    holds int32 minutes since the epoch. Columns that are already compact are left as they are.
+
+    Args:
+        df: Merged DataFrame, with either a timestamp or an epoch-minute index.
+        precision: Type of the floating point columns.
+
+    Returns:
+        The compact DataFrame.
+
+    """
+    types: dict[str, str] = {
+        **{c: precision for c in float_columns if c in df.columns},
+        **{c: t for c, t in int_schema.items() if c in df.columns},
+    }
+
+    df = df.astype({c: t for c, t in types.items() if df[c].dtype != t})
+
+    if isinstance(df.index, DatetimeIndex):
+        df = df.set_axis(Index(to_epoch_minutes(df.index), name=df.index.name))
+
+    return df
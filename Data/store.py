@@ -0,0 +1,146 @@
+from json import dumps
+from numpy import ndarray, load
+from numpy.lib.format import open_memmap
+from os import path, makedirs, replace
+from pandas import DataFrame, Index
+
+from Utils import read_json
+
+from .io import dir_path
+from .manifest import dataset_hash
+from .merger import get_data, target_labels
+from .schema import Precision
+
+
+def store_path(precision: Precision = 'float64') -> str:
+    """
+
+    Args:
+        precision: Type of the stored matrices.
+
+    Returns:
+        Path to the feature store directory of the given precision.
+
+    """
+    return path.join(dir_path, "features", precision)
+
+
+def is_stale(precision: Precision = 'float64') -> bool:
+    """
+
+    Args:
+        precision: Type of the stored matrices.
+
+    Returns:
+        True if the feature store is missing or was built from another version of the merged dataset.
+
+    """
+    meta_path: str = path.join(store_path(precision), "meta.json")
+
+    if not path.exists(meta_path):
+        return True
+
+    return read_json(meta_path)['dataset'] != dataset_hash()
+
+
+def materialize(precision: Precision = 'float64', refresh: bool = False) -> str:
+    """
+
+    Writes the X and Y matrices of the merged dataset as contiguous column-major .npy files,
+    so that every process can map the same read-only pages instead of decoding its own copy.
+
+    Args:
+        precision: Type of the stored matrices.
+        refresh: If True, re-cleans the datasets first.
+
+    Returns:
+        Path to the feature store directory.
+
+    """
+    df: DataFrame = get_data(refresh, precision=precision)
+    dest_path: str = store_path(precision)
+    features: list[str] = [c for c in df.columns if c not in target_labels]
+
+    makedirs(dest_path, exist_ok=True)
+
+    for name, columns in (('x', features), ('y', target_labels)):
+        tmp_path: str = path.join(dest_path, f"{name}.tmp.npy")
+        out: ndarray = open_memmap(
+            tmp_path,
+            mode='w+',
+            dtype=precision,
+            shape=(len(df.index), len(columns)),
+            fortran_order=True
+        )
+
+        # Column by column, so no full-size temporary is created
+        for i, column in enumerate(columns):
+            out[:, i] = df[column].to_numpy()
+
+        out.flush()
+        del out
+
+        replace(tmp_path, path.join(dest_path, f"{name}.npy"))
+
+    index_path: str = path.join(dest_path, "index.tmp.npy")
+    open_memmap(index_path, mode='w+', dtype=df.index.dtype, shape=(len(df.index),))[:] = df.index.to_numpy()
+    replace(index_path, path.join(dest_path, "index.npy"))
+
+    # Written last, the store is only valid once its metadata exists
+    with open(path.join(dest_path, "meta.json"), 'w') as file:
+        file.write(dumps({
+            'features': features,
+            'targets': target_labels,
+            'rows': len(df.index),
+            'dataset': dataset_hash(),
+        }, indent=4))
+
+    return dest_path
+
+
+def load_features(precision: Precision = 'float64', refresh: bool = False) -> tuple[ndarray, ndarray, ndarray, dict]:
+    """
+
+    Memory-maps the feature store, materializing it first if it is stale.
+
+    Args:
+        precision: Type of the stored matrices.
+        refresh: If True, re-cleans the datasets and rebuilds the store.
+
+    Returns:
+        The read-only X, Y, and index arrays, along with the store metadata.
+
+    """
+    if refresh or is_stale(precision):
+        materialize(precision, refresh)
+
+    src_path: str = store_path(precision)
+
+    return (
+        load(path.join(src_path, "x.npy"), mmap_mode='r'),
+        load(path.join(src_path, "y.npy"), mmap_mode='r'),
+        load(path.join(src_path, "index.npy"), mmap_mode='r'),
+        read_json(path.join(src_path, "meta.json")),
+    )
+
+
+def get_split_features(precision: Precision = 'float64', refresh: bool = False) -> tuple[DataFrame, DataFrame]:
+    """
+
+    Same as get_split_data, except that the DataFrames are views over the memory-mapped feature store.
+
+    Args:
+        precision: Type of the stored matrices.
+        refresh: If True, re-cleans the datasets and rebuilds the store.
+
+    Returns:
+        The merged data split into X and Y DataFrames.
+
+    """
+    x, y, index, meta = load_features(precision, refresh)
+    idx: Index = Index(index, name='timestamp', copy=False)
+
+    return (
+        DataFrame(x, columns=meta['features'], index=idx, copy=False),
+        DataFrame(y, columns=meta['targets'], index=idx, copy=False),
+    )
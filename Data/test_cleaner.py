@@ -0,0 +1,59 @@
+from os import path
+from pandas import DataFrame, concat, read_parquet
+from pandas.testing import assert_frame_equal
+from pytest import mark
+
+from Benchmark.synthetic import bitcoin_frame
+
+from .cleaner import clean_bitcoin, clean_bitcoin_stream
+from .conftest import negative_ratio, rows, write_bitcoin
+
+
+# Rows of the raw file whose timestamp is repeated by the rows right after them, with other values
+duplicated: tuple[int, ...] = (400, 1_200, 1_201, 2_500)
+
+
+def with_duplicates(df: DataFrame, ascending: bool) -> tuple[DataFrame, int]:
+    """
+
+    Args:
+        df: Raw Bitcoin rows, in ascending order.
+        ascending: False to reverse the order of the rows.
+
+    Returns:
+        The rows with the duplicates inserted, along with a chunk size that splits the first pair of duplicates.
+
+    """
+    dup: DataFrame = df.iloc[list(duplicated)].copy()
+    dup['close'] += 1
+
+    # Each duplicate comes right after its original
+    df = concat([df, dup]).sort_index(kind='stable')
+    df = (df if ascending else df.iloc[::-1]).reset_index(drop=True)
+
+    # The first chunk ends between the two rows of the first pair
+    first: int = int((df['timestamp'] == df['timestamp'].shift()).to_numpy().argmax())
+
+    return df, first
+
+
+@mark.parametrize('ascending', [True, False])
+def test_stream_matches_memory(data_dir: str, ascending: bool) -> None:
+    """
+
+    Streamed in chunks whose borders split duplicated timestamps, the Bitcoin file is cleaned as it is in memory.
+
+    """
+    df, chunk_size = with_duplicates(bitcoin_frame(rows, negative_ratio=negative_ratio), ascending)
+    write_bitcoin(data_dir, df)
+    clean_path: str = path.join(data_dir, "bitcoin", "clean.parquet")
+
+    _, memory_stats = clean_bitcoin()
+    expected: DataFrame = read_parquet(clean_path)
+
+    stream_stats: dict = clean_bitcoin_stream(chunk_size)
+    actual: DataFrame = read_parquet(clean_path)
+
+    assert actual.index.is_unique and actual.index.is_monotonic_increasing
+    assert stream_stats['dup_timestamps'] == memory_stats['dup_timestamps'] == len(duplicated)
+    assert_frame_equal(actual, expected, check_freq=False)
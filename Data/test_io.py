@@ -0,0 +1,74 @@
+from os import listdir
+from pandas import DataFrame, DatetimeIndex, concat, date_range
+from pandas.testing import assert_frame_equal
+from pytest import mark
+
+from .io import read_partitioned, write_partitioned
+from .schema import epoch_minute, to_epoch_minutes
+
+
+# Bounds of the reads, inclusive, None for an open bound
+ranges: list[tuple[str | None, str | None]] = [
+    (None, None),
+    ('2017-02-10 12:00', None),
+    (None, '2017-03-01'),
+    ('2017-01-31 23:59', '2017-03-01 00:00'),
+    ('2017-02-10', '2017-02-10'),
+]
+
+
+def minutes_frame(start: str, end: str) -> DataFrame:
+    """
+
+    Args:
+        start: First minute.
+        end: Last minute.
+
+    Returns:
+        A frame of every fifth minute between the bounds, indexed by epoch minutes as the merged dataset is.
+
+    """
+    stamps: DatetimeIndex = date_range(start, end, freq='5min')
+    df: DataFrame = DataFrame({'close': range(stamps.size), 'fng': 1.5}, index=to_epoch_minutes(stamps))
+    df.index.name = 'timestamp'
+
+    return df
+
+
+@mark.parametrize('start, end', ranges)
+def test_range_read(data_dir: str, start: str | None, end: str | None) -> None:
+    """
+
+    A range read, across months, gives the rows and columns of the saved frame within the bounds.
+
+    """
+    df: DataFrame = minutes_frame('2017-01-20', '2017-03-10')
+    write_partitioned(df)
+
+    expected: DataFrame = df.loc[
+        epoch_minute(start) if start is not None else None:epoch_minute(end) if end is not None else None,
+        ['close']
+    ]
+
+    assert_frame_equal(read_partitioned('clean', start, end, ['close']), expected)
+
+
+def test_append_and_replace(data_dir: str) -> None:
+    """
+
+    Appended rows are read after the existing ones, and a replaced dataset holds only the new rows,
+    without any temporary directory left over.
+
+    """
+    old: DataFrame = minutes_frame('2017-01-20', '2017-02-05')
+    new: DataFrame = minutes_frame('2017-02-05 00:05', '2017-02-20')
+
+    write_partitioned(old)
+    write_partitioned(new, append=True)
+
+    assert_frame_equal(read_partitioned('clean'), concat([old, new]))
+
+    write_partitioned(new)
+
+    assert_frame_equal(read_partitioned('clean'), new)
+    assert not [name for name in listdir(data_dir) if name.startswith('.')]
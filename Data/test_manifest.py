@@ -0,0 +1,77 @@
+from os import path, stat, utime
+from pytest import MonkeyPatch
+
+from .cleaner import clean_dxy, clean_sentiment
+from .manifest import cleaner_versions, dataset_hash, is_fresh, read_manifest
+from .merger import get_data
+
+
+def add_line(file_path: str, line: str) -> None:
+    """
+
+    Args:
+        file_path: Path of the raw file.
+        line: Line added at the end of the file.
+
+    """
+    with open(file_path, 'r') as file:
+        content: str = file.read()
+
+    with open(file_path, 'w') as file:
+        file.write(f"{content.rstrip()}\n{line}\n")
+
+
+def test_source_manifest(data_dir: str, monkeypatch: MonkeyPatch) -> None:
+    """
+
+    A cleaned source stays fresh when its raw file is only touched,
+    and is rebuilt once its raw content or its cleaner version changes.
+
+    """
+    raw_path: str = path.join(data_dir, "dxy", "data.csv")
+
+    assert not is_fresh('dxy')
+
+    clean_dxy()
+
+    assert is_fresh('dxy')
+
+    # Same content, only the modification time changes, which the manifest records without rebuilding
+    mtime: int = stat(raw_path).st_mtime_ns + 10 ** 9
+    utime(raw_path, ns=(mtime, mtime))
+
+    assert is_fresh('dxy')
+    assert read_manifest('dxy')['raw']['mtime'] == mtime
+
+    add_line(raw_path, "01/01/16, 99.00, 99.10, 98.90, 99.00")
+
+    assert not is_fresh('dxy')
+
+    clean_dxy()
+    monkeypatch.setitem(cleaner_versions, 'dxy', cleaner_versions['dxy'] + 1)
+
+    assert not is_fresh('dxy')
+
+
+def test_merged_manifest(data_dir: str) -> None:
+    """
+
+    The merged dataset is stale once one of its sources is cleaned from new raw content.
+
+    """
+    get_data(refresh=True, workers=1)
+    merged: str | None = dataset_hash()
+
+    assert is_fresh('merged')
+
+    add_line(path.join(data_dir, "sentiment", "data.csv"), "2024-01-07,0.5")
+
+    assert not is_fresh('merged')
+
+    clean_sentiment()
+
+    assert is_fresh('sentiment') and not is_fresh('merged')
+
+    get_data()
+
+    assert is_fresh('merged') and dataset_hash() != merged
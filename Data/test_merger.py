@@ -0,0 +1,37 @@
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest import mark
+
+from Benchmark.synthetic import bitcoin_frame
+
+from .conftest import negative_ratio, rows, write_bitcoin
+from .io import read_watermarks
+from .merger import get_data
+from .schema import epoch_minute
+
+
+# Raw Bitcoin rows present before the incremental update
+first_rows: int = 2_000
+
+
+@mark.parametrize('engine', ['pandas', 'arrow'])
+def test_incremental_matches_refresh(data_dir: str, engine: str) -> None:
+    """
+
+    Appending the rows added to the raw file since the last update gives the dataset a full refresh builds.
+
+    """
+    raw: DataFrame = bitcoin_frame(rows, negative_ratio=negative_ratio)
+
+    write_bitcoin(data_dir, raw.iloc[:first_rows])
+    get_data(refresh=True, workers=1, engine=engine)
+
+    write_bitcoin(data_dir, raw)
+    incremental: DataFrame = get_data(incremental=True, engine=engine)
+
+    assert epoch_minute(read_watermarks()['merged']) == incremental.index[-1]
+    assert incremental.index[-1] > epoch_minute(raw['timestamp'].iloc[first_rows - 1])
+
+    refreshed: DataFrame = get_data(refresh=True, workers=1, engine=engine)
+
+    assert_frame_equal(incremental, refreshed)
@@ -0,0 +1,77 @@
+from functools import cache
+from numpy import ndarray
+from pandas import DatetimeIndex, Index, Series
+from pyarrow import Array, ChunkedArray, array, int64, timestamp
+from pyarrow.compute import StrptimeOptions, cast, strptime
+
+from .manifest import Source
+
+
+# Explicit format of the raw timestamps of each source
+date_formats: dict[Source, str] = {
+    'bitcoin': '%Y-%m-%d %H:%M:%S',
+    'dxy': '%m/%d/%y',
+    'fearGreed': '%d-%m-%Y',
+    'fedFunds': '%Y-%m-%d',
+    'sentiment': '%Y-%m-%d',
+}
+
+# Formats that are plain ISO 8601, these are parsed by a cast which is faster than strptime
+iso_formats: frozenset[str] = frozenset({'%Y-%m-%d %H:%M:%S', '%Y-%m-%d'})
+
+# Value of a missing timestamp, same as NaT
+nat: int = -2 ** 63
+
+
+@cache
+def strptime_options(fmt: str) -> StrptimeOptions:
+    """
+
+    Args:
+        fmt: strptime format, two-digit years (%y) are placed in 1969-2068.
+
+    Returns:
+        The parsing options of the format, built once per format.
+
+    """
+    return StrptimeOptions(fmt, unit='ns', error_is_null=False)
+
+
+def parse_epoch(values: Series | Index | ndarray | Array | ChunkedArray, fmt: str) -> ndarray:
+    """
+
+    Parses date strings in a single vectorized call, without any Python callback per row.
+
+    Args:
+        values: Date strings. String Series backed by Arrow are parsed without a copy.
+        fmt: Explicit strptime format of the values.
+
+    Returns:
+        The nanoseconds since the epoch of each value as int64, missing values hold NaT.
+
+    Raises:
+        ArrowInvalid: If a value does not match the format.
+
+    """
+    strings: Array | ChunkedArray = values if isinstance(values, (Array, ChunkedArray)) else array(values)
+
+    if fmt in iso_formats:
+        parsed: Array | ChunkedArray = cast(strings, timestamp('ns'))
+    else:
+        parsed = strptime(strings, options=strptime_options(fmt))
+
+    return parsed.cast(int64()).fill_null(nat).to_numpy()
+
+
+def to_timestamps(values: Series | Index | ndarray | Array | ChunkedArray, source: Source) -> DatetimeIndex:
+    """
+
+    Args:
+        values: Raw date strings of the source.
+        source: Data source the values come from, which gives their format.
+
+    Returns:
+        The parsed timestamps, viewing the parsed epoch values without a copy.
+
+    """
+    return DatetimeIndex(parse_epoch(values, date_formats[source]).view('datetime64[ns]'))
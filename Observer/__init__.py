@@ -3,9 +3,7 @@ from __future__ import annotations
 from concurrent.futures import ThreadPoolExecutor, wait, Future
 from dataclasses import dataclass, asdict
 from datetime import datetime
-
-from numpy import ravel, ndarray
-from pandas import DataFrame
+from typing import TYPE_CHECKING
 
 from Sentiment import SentimentResponse
 from .bitcoin import fetch as btc_fetch, KlineResponse
@@ -13,9 +11,12 @@ from .dxy import fetch as dxy_fetch, DxyResponse
 from .fng import fetch as fng_fetch, FngResponse
 from .fed_fund import fetch as fed_rate_fetch, FedFundResponse
 
-from Data import target_labels
 from Utils import convert_to_dataclass
 
+if TYPE_CHECKING:
+    from numpy import ndarray
+    from pandas import DataFrame
+
 
 # Key used by the fed rate observation refresh
 fed_rate_key: str = 'fed_rate'
@@ -50,6 +51,8 @@ class Observation:
             Observer object as an un-tampered DataFrame.
 
         """
+        from pandas import DataFrame
+
         df: DataFrame = DataFrame(
             {k: [v] for k, v in asdict(self).items()},
         )
@@ -64,6 +67,7 @@ class Observation:
             A DataFrame representation of the observation, without the targets.
 
         """
+        from Data import target_labels
 
         df: DataFrame = self._to_def()
         df.drop(target_labels, axis=1, inplace=True)
@@ -80,12 +84,13 @@ class Observation:
             The separated X and Y components as DataFrames
 
         """
+        from Data import target_labels
+
         df: DataFrame = self._to_def()
 
+        # Same direction labels as the logistic model is trained on, 1 if the price went up
         if logistic:
-            return df.drop(target_labels, axis=1), ravel(
-                (df['open'] - df['close']).map(lambda v: -1 if v < 0 else int(0 < v))
-            )
+            return df.drop(target_labels, axis=1), ((df['open'] - df['close']) < 0).to_numpy(dtype=int)
 
         return df.drop(target_labels, axis=1), df[target_labels]
 
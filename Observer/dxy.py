@@ -1,10 +1,15 @@
+from __future__ import annotations
+
 from datetime import datetime
 from dataclasses import dataclass
-from yfinance import Ticker
+from typing import TYPE_CHECKING
 
 from Config import config
 from Utils import convert_to_dataclass
 
+if TYPE_CHECKING:
+    from yfinance import Ticker
+
 
 @dataclass(frozen=True)
 class DxyResponse:
@@ -25,6 +30,8 @@ def fetch() -> DxyResponse:
         The latest DXY response.
 
     """
+    # yfinance is slow to import, so it is only imported on the first fetch
+    from yfinance import Ticker
 
     dxy: Ticker = Ticker("DX-Y.NYB", proxy=config.proxies['https_y'])
     data: dict = dxy.info
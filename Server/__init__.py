@@ -1,14 +1,14 @@
+from __future__ import annotations
+
 from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime, timedelta
 from flask import Flask, Response
 from flask_cors import CORS, cross_origin
 from json import dumps
 from multiprocessing import Process, Queue
-from numpy import ndarray
 from threading import Thread
 from time import sleep, time
-from pandas import options
-from sklearn.pipeline import Pipeline
+from typing import TYPE_CHECKING
 
 import Train
 from Config import config
@@ -16,6 +16,11 @@ from Observer import observe, Observation, fed_rate_key
 from Sentiment import general_sentiment, SentimentResponse
 from Utils import every, join_jsons, format_sse
 
+if TYPE_CHECKING:
+    from numpy import ndarray
+    from Train.compiled import CompiledModel
+    from Train.online import OnlineModel
+
 
 app: Flask = Flask(__name__)
 cors: CORS = CORS(app)
@@ -28,18 +33,22 @@ lr_q: Queue = Queue()
 lgr_q: Queue = Queue()
 elr_q: Queue = Queue()
 observation_q: Queue = Queue()
-lr_model: Pipeline = Train.lr_load()
-lgr_model: Pipeline = Train.lgr_load()
-elr_model: Pipeline = Train.elr_load()
+
+# Models are loaded by start, so that importing the server stays fast
+lr_model: CompiledModel | OnlineModel | None = None
+lgr_model: CompiledModel | OnlineModel | None = None
+elr_model: CompiledModel | None = None
 
 
 def run(
         name: str,
-        pipeline: Pipeline,
+        pipeline: CompiledModel | OnlineModel,
         fed_rate: dict,
         q: Queue,
         observation_q: Queue,
         logistic: bool = False,
+        online: bool = False,
+        version: str | None = None,
 ) -> None:
     """
 
@@ -50,6 +59,9 @@ def run(
         q: Queue that holds the multiprocessing output.
         observation_q: Queue that holds prediction values.
         logistic: True for logistic learning.
+        online: True if the model learns from each closed candle, it is then saved every observer.save seconds.
+        version: Registry version of the model, see Train.registry.
+            Any version promoted later is swapped in before the next prediction.
 
     """
 
@@ -107,6 +119,11 @@ def run(
 
         return dumps(data)
 
+    # Last candle learned from, sentiment of the previous cycle, and last time the model was saved
+    last_learned: datetime | None = None
+    last_sentiment: SentimentResponse | None = None
+    last_save: float = time()
+
     # Loop indefinitely & push to queue
     while True:
         # Initial time
@@ -125,7 +142,25 @@ def run(
 
         cur_observation.apply_sentiment(sentiment)
 
-        y_pred = pipeline.predict(
+        # The previous candle is closed, so its targets are known.
+        # It is learned with the sentiment it was predicted with, the current one on the first cycle.
+        if online and prev_observation.timestamp != last_learned:
+            prev_observation.apply_sentiment(last_sentiment if last_sentiment is not None else sentiment)
+            pipeline.partial_fit(*prev_observation.to_train_df(logistic))
+            last_learned = prev_observation.timestamp
+
+            if t0 - last_save >= config.observer.save:
+                Train.online_save(pipeline)
+                last_save = t0
+
+        last_sentiment = sentiment
+
+        # A newly promoted version replaces the model between two predictions, the process keeps running
+        if not online:
+            pipeline, version = Train.registry_refresh(name, pipeline, version)
+
+        # The compiled models read the fields of the observation directly, without building a DataFrame
+        y_pred = pipeline.predict_row(vars(cur_observation)) if not online else pipeline.predict(
             cur_observation.to_df()
         )
 
@@ -203,11 +238,13 @@ def info() -> Response:
 
 def start_model(
     name: str,
-    pipeline: Pipeline,
+    pipeline: CompiledModel | OnlineModel,
     fed_rate: dict,
     q: Queue,
     observation_q: Queue,
     logistic: bool = False,
+    online: bool = False,
+    version: str | None = None,
 ) -> None:
     """
 
@@ -220,17 +257,37 @@ def start_model(
         q: Queue that holds the multiprocessing output.
         observation_q: Queue holding observations.
         logistic: True for logistic learning.
+        online: True if the model learns from each closed candle.
+        version: Registry version of the model.
 
     """
     # Start the run cycle
-    run(name, pipeline, fed_rate, q, observation_q, logistic)
+    run(name, pipeline, fed_rate, q, observation_q, logistic, online, version)
 
 
 def start() -> None:
     global g_fed_rate, lr_q, lr_model, lgr_q, lgr_model, elr_q, elr_model, observation_q
 
+    from pandas import options
+
     options.display.max_columns = None
 
+    online: bool = config.observer.online
+
+    # Registry version of each model, None when it is not served from the registry
+    lr_version: str | None = None
+    lgr_version: str | None = None
+
+    # Load the models, the online ones are trained over the historical data the first time
+    if online:
+        lr_model = Train.online_load() if Train.online_exists() else Train.online_train()[0]
+        lgr_model = Train.online_load(True) if Train.online_exists(True) else Train.online_train(True)[0]
+    else:
+        lr_model, lr_version = Train.registry_load_served("lr")
+        lgr_model, lgr_version = Train.registry_load_served("lgr")
+
+    elr_model, elr_version = Train.registry_load_served("elr")
+
     # Synchronize the clock
     t0: datetime = datetime.utcnow()
     t1: datetime = t0.replace(second=0, microsecond=0) + timedelta(minutes=1)
@@ -249,13 +306,13 @@ def start() -> None:
     Process(target=total_observation, args=(observation_q, g_fed_rate)).start()
 
     # Start the LR model process
-    Process(target=start_model, args=("lr", lr_model, g_fed_rate, lr_q, observation_q, False)).start()
+    Process(target=start_model, args=("lr", lr_model, g_fed_rate, lr_q, observation_q, False, online, lr_version)).start()
 
     # Start the LGR model process
-    Process(target=start_model, args=("lgr", lgr_model, g_fed_rate, lgr_q, observation_q, True)).start()
+    Process(target=start_model, args=("lgr", lgr_model, g_fed_rate, lgr_q, observation_q, True, online, lgr_version)).start()
 
     # Start the ELR model process
-    Process(target=start_model, args=("elr", elr_model, g_fed_rate, elr_q, observation_q, False)).start()
+    Process(target=start_model, args=("elr", elr_model, g_fed_rate, elr_q, observation_q, False, False, elr_version)).start()
 
     # Do not use reloaded as it starts 2 separate processes (lots of headache)
     app.run(debug=True, port=config.server.port, use_reloader=False)
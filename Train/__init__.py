@@ -1,3 +1,37 @@
-from .linear_regression import load as lr_load, train as lr_train, test as lr_test, save as lr_save
-from .logistic_regression import load as lgr_load, train as lgr_train, test as lgr_test, save as lgr_save
-from .elastic_linear import load as elr_load, train as elr_train, test as elr_test, save as elr_save
+from Utils import lazy_exports
+
+
+# Exported names, the models (and scikit-learn) are only imported on first use
+exports: dict[str, tuple[str, str]] = {
+    **{
+        f"{prefix}_{name}": (module, name)
+        for prefix, module in (
+            ('lr', '.linear_regression'),
+            ('lgr', '.logistic_regression'),
+            ('elr', '.elastic_linear'),
+        )
+        for name in ('load', 'train', 'test', 'save')
+    },
+    **{f"online_{name}": ('.online', name) for name in ('load', 'train', 'save', 'exists')},
+    'OnlineModel': ('.online', 'OnlineModel'),
+    **{
+        f"ols_{name}": ('.sufficient', name)
+        for name in ('train', 'fit', 'accumulate', 'add_range', 'remove_range', 'to_pipeline', 'score')
+    },
+    'Moments': ('.sufficient', 'Moments'),
+    'train_all': ('.orchestrator', 'train_all'),
+    'MemoizedElasticNet': ('.search_cache', 'MemoizedElasticNet'),
+    'search_cache_clear': ('.search_cache', 'clear'),
+    **{f"compiled_{name}": ('.compiled', name) for name in ('load', 'export', 'exists', 'load_or_export')},
+    'CompiledModel': ('.compiled', 'CompiledModel'),
+    **{
+        f"registry_{name}": ('.registry', name)
+        for name in (
+            'register', 'promote', 'current', 'versions', 'metadata', 'load', 'load_compiled', 'refresh', 'load_served'
+        )
+    },
+}
+
+__all__: list[str] = list(exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, exports)
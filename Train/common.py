@@ -1,7 +1,10 @@
 from joblib import dump, load as jload
+from joblib.externals.loky import get_reusable_executor
 from os import path
 from sklearn.pipeline import Pipeline
 
+from .compiled import compilable, export
+
 
 # Directory path
 dir_path: str = path.dirname(path.realpath(__file__))
@@ -23,9 +26,25 @@ def load(file_name: str) -> Pipeline:
 def save(model: Pipeline, file_name: str) -> None:
     """
 
+    Saves the model, along with its compiled artifact if it is a scaler followed by a linear model.
+
     Args:
         model: Model to save.
         file_name: Name of the file to save the model in, without the sav extension.
 
     """
     dump(model, path.join(dir_path, f"{file_name}.sav"))
+
+    if compilable(model):
+        export(model, file_name)
+
+
+def shutdown_workers() -> None:
+    """
+
+    Stops the worker processes of the grid searches, and waits for them.
+    They idle for minutes before exiting on their own, and the process that started them waits for them on exit.
+    Waiting here also counts their CPU time in the resource usage of the children.
+
+    """
+    get_reusable_executor().shutdown(wait=True)
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+from numpy import asarray, exp, load as np_load, ndarray, savez
+from os import path
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+# Directory of the model files, same as common.dir_path, which is not imported as it imports scikit-learn
+dir_path: str = path.dirname(path.realpath(__file__))
+
+
+class CompiledModel:
+    """
+    Fitted scaler and linear model folded into a single affine map, predicting with numpy alone.
+    The standardized features (x - mean) / scale are linear in x, so the weights become w / scale,
+    and the bias b - mean @ (w / scale).
+
+
+    weights: Weights of the raw features, one column per target.
+
+    bias: Bias of each target.
+
+    features: Names of the features, in the order of the weights.
+
+    classes: Labels of the logistic model, empty for a regression.
+    """
+
+    def __init__(self, weights: ndarray, bias: ndarray, features: ndarray, classes: ndarray) -> None:
+        """
+
+        Args:
+            weights: Weights of the raw features, one column per target.
+            bias: Bias of each target.
+            features: Names of the features, in the order of the weights.
+            classes: Labels of the logistic model, empty for a regression.
+
+        """
+        self.weights: ndarray = weights
+        self.bias: ndarray = bias
+        self.features: list[str] = [str(f) for f in features]
+        self.classes: ndarray = classes
+
+    @property
+    def logistic(self) -> bool:
+        """
+
+        Returns:
+            True if the model predicts the direction of the price.
+
+        """
+        return len(self.classes) > 0
+
+    def decision(self, x: ndarray) -> ndarray:
+        """
+
+        Args:
+            x: Features, one row per observation, in the order of the features attribute.
+
+        Returns:
+            The predicted targets of a regression, the log-odds of a logistic model.
+
+        """
+        return x @ self.weights + self.bias
+
+    def predict(self, x: ndarray) -> ndarray:
+        """
+
+        Args:
+            x: Features, one row per observation, in the order of the features attribute.
+
+        Returns:
+            The predictions, with the same shape as those of the pipeline.
+
+        """
+        z: ndarray = self.decision(x)
+
+        # Same rule as LogisticRegression.predict on two classes
+        if self.logistic:
+            return self.classes[(z[:, 0] > 0).astype(int)]
+
+        return z
+
+    def predict_proba(self, x: ndarray) -> ndarray:
+        """
+
+        Args:
+            x: Features, one row per observation, in the order of the features attribute.
+
+        Returns:
+            The probability of each class, one column per class.
+
+        Raises:
+            ValueError: If the model is a regression.
+
+        """
+        if not self.logistic:
+            raise ValueError("Only a logistic model predicts probabilities")
+
+        p: ndarray = 1 / (1 + exp(-self.decision(x)))
+
+        return asarray([1 - p[:, 0], p[:, 0]]).T
+
+    def row(self, values: Mapping[str, float]) -> ndarray:
+        """
+
+        Args:
+            values: Value of each feature, and possibly of other fields, such as the fields of an observation.
+
+        Returns:
+            A single row of features, in the order of the weights.
+
+        """
+        return asarray([[values[f] for f in self.features]], dtype=float)
+
+    def predict_row(self, values: Mapping[str, float]) -> ndarray:
+        """
+
+        Args:
+            values: Value of each feature, and possibly of other fields, such as the fields of an observation.
+
+        Returns:
+            The prediction of a single row, with the same shape as that of the pipeline on a one-row DataFrame.
+
+        """
+        return self.predict(self.row(values))
+
+
+def file_path(file_name: str) -> str:
+    """
+
+    Args:
+        file_name: Name of the model file, without extension.
+
+    Returns:
+        Path to the compiled artifact of the model.
+
+    """
+    return path.join(dir_path, f"{file_name}.npz")
+
+
+def compile_pipeline(pipeline: Pipeline) -> CompiledModel:
+    """
+
+    Args:
+        pipeline: Fitted pipeline of a StandardScaler followed by a linear model, or a search over one.
+
+    Returns:
+        The pipeline folded into a single affine map.
+
+    """
+    scaler = pipeline['scaler']
+
+    # The halving search of the elastic net predicts with the estimator it refitted
+    model = getattr(pipeline['model'], 'best_estimator_', pipeline['model'])
+
+    # Weights are stored one row per target by scikit-learn, also for a single target
+    coef: ndarray = asarray(model.coef_, dtype=float).reshape(-1, len(scaler.scale_))
+    weights: ndarray = (coef / scaler.scale_).T
+
+    return CompiledModel(
+        weights,
+        asarray(model.intercept_, dtype=float).reshape(-1) - scaler.mean_ @ weights,
+        asarray(scaler.feature_names_in_, dtype=str),
+        asarray(getattr(model, 'classes_', [])),
+    )
+
+
+def compilable(model: object) -> bool:
+    """
+
+    Args:
+        model: Model about to be saved.
+
+    Returns:
+        True if the model is a scaler followed by a linear model, which folds into a single affine map.
+
+    """
+    steps: dict = getattr(model, 'named_steps', {})
+
+    return (
+        set(steps) == {'scaler', 'model'}
+        and hasattr(steps['scaler'], 'scale_')
+        and hasattr(steps['scaler'], 'feature_names_in_')
+        and hasattr(getattr(steps['model'], 'best_estimator_', steps['model']), 'coef_')
+    )
+
+
+def write(model: CompiledModel, dest: str) -> None:
+    """
+
+    Args:
+        model: Compiled model to write.
+        dest: Path of the artifact.
+
+    """
+    # Opened here so that numpy does not add its own extension to the name
+    with open(dest, 'wb') as file:
+        savez(
+            file,
+            weights=model.weights,
+            bias=model.bias,
+            features=asarray(model.features, dtype=str),
+            classes=model.classes,
+        )
+
+
+def read(src: str) -> CompiledModel:
+    """
+
+    Args:
+        src: Path of the artifact.
+
+    Returns:
+        The compiled model from the artifact.
+
+    """
+    # Plain arrays only, nothing is unpickled
+    with np_load(src, allow_pickle=False) as data:
+        return CompiledModel(data['weights'], data['bias'], data['features'], data['classes'])
+
+
+def export(pipeline: Pipeline, file_name: str) -> CompiledModel:
+    """
+
+    Writes the compiled artifact of the pipeline next to its sav file.
+
+    Args:
+        pipeline: Fitted pipeline of a StandardScaler followed by a linear model.
+        file_name: Name of the model file, without extension.
+
+    Returns:
+        The compiled model.
+
+    """
+    compiled: CompiledModel = compile_pipeline(pipeline)
+    write(compiled, file_path(file_name))
+
+    return compiled
+
+
+def exists(file_name: str) -> bool:
+    """
+
+    Args:
+        file_name: Name of the model file, without extension.
+
+    Returns:
+        True if the compiled artifact exists, and is not older than the sav file of the model.
+
+    """
+    npz: str = file_path(file_name)
+    sav: str = path.join(dir_path, f"{file_name}.sav")
+
+    return path.exists(npz) and (not path.exists(sav) or path.getmtime(npz) >= path.getmtime(sav))
+
+
+def load(file_name: str) -> CompiledModel:
+    """
+
+    Args:
+        file_name: Name of the model file, without extension.
+
+    Returns:
+        The compiled model from its artifact.
+
+    """
+    return read(file_path(file_name))
+
+
+def load_or_export(file_name: str) -> CompiledModel:
+    """
+
+    Args:
+        file_name: Name of the model file, without extension.
+
+    Returns:
+        The compiled model, exported from the saved pipeline first if the artifact is missing or stale.
+
+    """
+    if exists(file_name):
+        return load(file_name)
+
+    from .common import load as g_load
+
+    return export(g_load(file_name), file_name)
@@ -0,0 +1,28 @@
+from numpy.random import default_rng
+from pandas import DataFrame
+from pytest import fixture
+
+from Benchmark.synthetic import candles
+
+
+# Number of synthetic minute candles of the tests
+rows: int = 2_000
+
+# Features of the synthetic candles, none of them a multiple of another
+features: list[str] = ['open', 'volume', 'quote_asset_volume', 'number_of_trades']
+
+# Targets of the synthetic candles
+targets: list[str] = ['high', 'low', 'close']
+
+
+@fixture
+def candle_data() -> tuple[DataFrame, DataFrame]:
+    """
+
+    Returns:
+        The features and targets of synthetic minute candles, the same on every call.
+
+    """
+    df: DataFrame = candles(rows, default_rng(0))
+
+    return df[features].astype(float), df[targets]
@@ -5,21 +5,42 @@ from sklearn.metrics import root_mean_squared_error
 from sklearn.model_selection import train_test_split, TimeSeriesSplit, HalvingGridSearchCV
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
+from typing import Literal
 
-from Data import get_split_data
+from Data import get_split_features
 
 from .common import load as g_load, save as g_save
+from .path_search import path_search
+from .search_cache import dataset_dir, MemoizedElasticNet
 
 
 # Name of the model file, without extension
 save_file: str = "elr_model"
 
+# Potential values of alphas and l1
+alpha_values: dict[str, list[float]] = {
+    'alpha': [0.00005, 0.0005, 0.001, 0.01, 0.05, 0.06, 0.08, 1, 2, 3, 5, 8, 10, 20, 50, 100],
+    'l1_ratio': [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 1]
+}
+
+# Number of K-Folds of the search
+cv_folds: int = 16
+
+# Seed of the subsampling of the memoized halving search, fixed so that a rerun fits the same folds and reuses the cached fits
+search_seed: int = 0
+
+# Search of the hyperparameters, either successive halving or one regularization path per fold and l1_ratio
+Search = Literal['halving', 'path']
+
 
 def simple_train(
         x_test: DataFrame,
         x_train: DataFrame,
         y_train: DataFrame,
-        verbose: bool = False
+        verbose: bool = False,
+        n_jobs: int = -1,
+        search: Search = 'halving',
+        memoize: bool = False
 ) -> tuple[Pipeline, DataFrame]:
     """
 
@@ -28,17 +49,40 @@ def simple_train(
         x_train: X_train dataset.
         y_train: Y_train dataset.
         verbose: True to make the training verbose.
+        n_jobs: Number of CPUs used by the model, -1 for all of them.
+        search: Search of the hyperparameters, the path search scores every candidate of the grid,
+            and selects the one an exhaustive grid search would, for a fraction of the work of the successive halving.
+        memoize: True to store every fit of the halving search on disk, and reuse the stored ones,
+            so that an interrupted or extended search only fits the missing (candidate, fold) pairs.
+            Off by default, the fits of a single search are never reused, and storing them costs a write per fit.
+            A memoized search also fixes its subsampling seed, and leaves the train scores out of cv_results_.
 
     Returns:
         The model pipline along with the predicted dataframe.
 
     """
+    if search == 'path':
+        scaler: StandardScaler = StandardScaler().set_output(transform="pandas")
+        x_scaled: DataFrame = scaler.fit_transform(x_train)
+
+        best, _ = path_search(
+            x_scaled.to_numpy(),
+            y_train.to_numpy(),
+            alpha_values['alpha'],
+            alpha_values['l1_ratio'],
+            cv_folds,
+            n_jobs,
+            verbose
+        )
 
-    # Dictionary containing potential values of alphas and l1
-    alpha_values: dict = {
-        'alpha': [0.00005, 0.0005, 0.001, 0.01, 0.05, 0.06, 0.08, 1, 2, 3, 5, 8, 10, 20, 50, 100],
-        'l1_ratio': [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 1]
-    }
+        # Refit on all the training rows, as the grid search does
+        pipeline: Pipeline = Pipeline([('scaler', scaler), ('model', ElasticNet(**best).fit(x_scaled, y_train))])
+
+        return pipeline, DataFrame(pipeline.predict(x_test), columns=["high", "low", "close"])
+
+    # A memoized search subsamples the same rows on every run, so that it fits the same folds and reuses the cached fits.
+    # The train scores would not be reused, each would cost a prediction per fit.
+    resume: dict = {'random_state': search_seed, 'return_train_score': False} if memoize else {}
 
     # Scale the numeric features (all the features in our case), and then pass to model
     pipeline: Pipeline = Pipeline([
@@ -46,13 +90,14 @@ def simple_train(
         (
             'model',
             HalvingGridSearchCV(
-                ElasticNet(),
+                MemoizedElasticNet(cache_dir=dataset_dir()) if memoize else ElasticNet(),
                 alpha_values,
                 scoring='neg_root_mean_squared_error',
-                cv=16,
+                cv=cv_folds,
                 factor=2,
-                n_jobs=-1,
-                verbose=3 if verbose else 0
+                n_jobs=n_jobs,
+                verbose=3 if verbose else 0,
+                **resume
             )
         )
     ])
@@ -64,18 +109,32 @@ def simple_train(
     return pipeline, DataFrame(pipeline.predict(x_test), columns=["high", "low", "close"])
 
 
-def test(n: int) -> list[int]:
+def test(n: int, search: Search = 'halving', incremental: bool = False, budget: int = 1) -> list[int]:
     """
 
     Args:
         n: Number of K-Folds to perform.
+        search: Search of the hyperparameters.
+        incremental: True to walk forward from one fold to the next instead of refitting each,
+            the hyperparameters are then searched once, so the scores differ from those of the refits,
+            see walk_forward.test_elastic_net.
+        budget: Number of CPUs shared by the folds, more than 1 scores them concurrently, see folds.test_folds.
 
     Returns:
         List of root mean squared error scores for each iteration.
 
     """
+    if incremental:
+        from .walk_forward import test_elastic_net
+
+        return test_elastic_net(n)
+
+    if budget > 1:
+        from .folds import test_folds
+
+        return [fold['score'] for fold in test_folds('elr', n, budget, {'search': search})]
 
-    X, y = get_split_data()
+    X, y = get_split_features()
     res: list[int] = []
 
     # Assuming your data is in X and y
@@ -85,14 +144,20 @@ def test(n: int) -> list[int]:
         X_train, X_test = X.iloc[train_index], X.iloc[test_index]
         y_train, y_test = y.iloc[train_index], y.iloc[test_index]
 
-        _, y_pred = simple_train(X_test, X_train, y_train)
+        _, y_pred = simple_train(X_test, X_train, y_train, search=search)
 
         res.append(root_mean_squared_error(y_test, y_pred))
 
     return res
 
 
-def train(*, no_save: bool = False, verbose: bool = False) -> tuple[Pipeline, float]:
+def train(
+        *,
+        no_save: bool = False,
+        verbose: bool = False,
+        search: Search = 'halving',
+        memoize: bool = False
+) -> tuple[Pipeline, float]:
     """
 
     Trains the model and saves it to its designated file.
@@ -100,17 +165,19 @@ def train(*, no_save: bool = False, verbose: bool = False) -> tuple[Pipeline, fl
     Args:
         no_save: True to not save the trained model.
         verbose: True to make the training step verbose.
+        search: Search of the hyperparameters.
+        memoize: True to resume the halving search from the fits stored by a previous run, see simple_train.
 
     Returns:
         The trained model along with its root mean squared error score.
 
     """
 
-    X, y = get_split_data()
+    X, y = get_split_features()
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, shuffle=False)
 
-    pipeline, y_pred = simple_train(X_test, X_train, y_train, verbose)
+    pipeline, y_pred = simple_train(X_test, X_train, y_train, verbose, search=search, memoize=memoize)
 
     # Evaluate the model
     if not no_save:
@@ -0,0 +1,174 @@
+from numpy import array, arange, logaddexp, ndarray, sqrt, zeros
+from numpy.random import Generator, default_rng
+from os import path
+from pandas import DataFrame
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import brier_score_loss
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .common import dir_path
+from .logistic_regression import Mode, get_split_data, load, save, save_file
+
+
+# Number of rows in each minibatch of the SGD
+sgd_batch: int = 4_096
+
+# Maximum number of passes of the SGD over the training rows
+sgd_epochs: int = 50
+
+# The SGD stops once an epoch decreases the loss by less than this fraction
+sgd_tol: float = 1e-4
+
+# Step size of the first epoch, decreasing with the square root of the epoch
+sgd_step: float = 0.5
+
+
+def initial_coef(scaler: StandardScaler) -> tuple[ndarray, float]:
+    """
+
+    Starting point of the fast modes, the saved model re-expressed for the new scaler.
+    The saved model standardized its features with the means and scales of older data,
+    its coefficients are converted so that it predicts the same probabilities on the new standardized features.
+
+    Args:
+        scaler: Scaler fitted on the new training rows.
+
+    Returns:
+        The coefficients and intercept of the saved model, zeros if there is none or its features differ.
+
+    """
+    features: list[str] = list(scaler.feature_names_in_)
+
+    if not path.exists(path.join(dir_path, f"{save_file}.sav")):
+        return zeros(len(features)), 0.0
+
+    saved: Pipeline = load()
+    old: StandardScaler = saved['scaler']
+
+    if list(getattr(old, 'feature_names_in_', [])) != features:
+        return zeros(len(features)), 0.0
+
+    w: ndarray = saved['model'].coef_[0]
+
+    return (
+        w * scaler.scale_ / old.scale_,
+        float(saved['model'].intercept_[0] + w @ ((scaler.mean_ - old.mean_) / old.scale_)),
+    )
+
+
+def sgd_fit(
+        x: ndarray,
+        y: ndarray,
+        w: ndarray,
+        b: float,
+        c: float = 1.0,
+        verbose: bool = False
+) -> tuple[ndarray, float, list[float]]:
+    """
+
+    Minibatch SGD of the L2 regularized log loss that LogisticRegression minimizes.
+    Minibatches are contiguous rows, visited in a random order on every epoch.
+
+    Args:
+        x: Standardized features.
+        y: Labels, 0 or 1.
+        w: Initial coefficients.
+        b: Initial intercept.
+        c: Inverse of the regularization strength, as in LogisticRegression.
+        verbose: True to print the loss of each epoch.
+
+    Returns:
+        The coefficients and intercept, along with the mean loss of each epoch.
+
+    """
+    rng: Generator = default_rng(0)
+    reg: float = 1 / (c * len(x))
+    starts: ndarray = arange(0, len(x), sgd_batch)
+    w = w.copy()
+    losses: list[float] = []
+
+    for epoch in range(sgd_epochs):
+        step: float = sgd_step / sqrt(epoch + 1)
+        total: float = 0.0
+
+        for i in rng.permutation(starts):
+            xb: ndarray = x[i:i + sgd_batch]
+            yb: ndarray = y[i:i + sgd_batch]
+            z: ndarray = xb @ w + b
+
+            # Loss of the batch before its update, computed without overflow
+            total += float((logaddexp(0, z) - yb * z).sum())
+
+            g: ndarray = expit(z) - yb
+            w -= step * (xb.T @ g / len(xb) + reg * w)
+            b -= step * float(g.mean())
+
+        losses.append(total / len(x) + 0.5 * reg * float(w @ w))
+
+        if verbose:
+            print(f"Epoch {epoch + 1}, loss {losses[-1]}")
+
+        # Converged once the loss stops decreasing
+        if len(losses) > 1 and losses[-2] - losses[-1] < sgd_tol * losses[-2]:
+            break
+
+    return w, b, losses
+
+
+def fast_train(mode: Mode, no_save: bool = False, verbose: bool = False) -> tuple[Pipeline, float]:
+    """
+
+    Same as logistic_regression.train, starting from the saved model instead of from zero.
+
+    Args:
+        mode: 'warm' for L-BFGS on the full training rows, 'sgd' for the minibatch SGD.
+        no_save: True to not save the trained model.
+        verbose: True to make the training step verbose.
+
+    Returns:
+        The trained model along with its brier score loss value.
+        With the SGD, the loss of each epoch is kept in the loss_curve_ attribute of the model.
+
+    """
+    X, y = get_split_data()
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, shuffle=False)
+
+    scaler: StandardScaler = StandardScaler().set_output(transform="pandas").fit(X_train)
+    x_scaled: DataFrame = scaler.transform(X_train)
+    w, b = initial_coef(scaler)
+
+    if mode == 'warm':
+        # The coefficients of a previous fit are where a warm start begins
+        model: LogisticRegression = LogisticRegression(
+            max_iter=400,
+            solver='lbfgs',
+            warm_start=True,
+            verbose=3 if verbose else 0
+        )
+        model.coef_ = w[None, :]
+        model.intercept_ = array([b])
+        model.fit(x_scaled, y_train)
+    else:
+        w, b, losses = sgd_fit(x_scaled.to_numpy(), y_train, w, b, verbose=verbose)
+
+        # Same fitted attributes as LogisticRegression.fit sets
+        model = LogisticRegression(max_iter=sgd_epochs)
+        model.classes_ = array([0, 1])
+        model.coef_ = w[None, :]
+        model.intercept_ = array([b])
+        model.n_iter_ = array([len(losses)])
+        model.n_features_in_ = len(w)
+        model.feature_names_in_ = scaler.feature_names_in_
+        model.loss_curve_ = losses
+
+    pipeline: Pipeline = Pipeline([('scaler', scaler), ('model', model)])
+
+    # Evaluate the model
+    if not no_save:
+        save(pipeline)
+
+    return pipeline, brier_score_loss(y_test, pipeline.predict(X_test))
@@ -0,0 +1,120 @@
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from os import cpu_count
+from pandas import DataFrame
+from threadpoolctl import threadpool_limits
+from time import perf_counter
+from tracemalloc import get_traced_memory, is_tracing, reset_peak, start, stop
+
+from Data import load_features
+
+from .common import shutdown_workers
+from .orchestrator import models
+from .walk_forward import folds
+
+
+def run_fold(
+        name: str,
+        end: int,
+        test_start: int,
+        test_end: int,
+        n_jobs: int = 1,
+        options: dict | None = None
+) -> dict:
+    """
+
+    Fits and scores a model on one fold. The data is memory-mapped from the feature store, and the fold rows
+    are contiguous slices of it, so the worker gets views instead of copies of the rows.
+
+    Args:
+        name: Name of the model in orchestrator.models.
+        end: End of the training rows, which start from the first row.
+        test_start: First testing row.
+        test_end: End of the testing rows.
+        n_jobs: Number of CPUs the model may use, including its BLAS threads.
+        options: Keyword arguments of the simple_train function of the model.
+
+    Returns:
+        The score of the fold, the seconds it took, and the peak memory in MB allocated while fitting it.
+        Pages of the feature store are shared with the other workers and not counted.
+
+    """
+    module, loader, score = models[name]
+    tracing: bool = is_tracing()
+
+    if not tracing:
+        start()
+
+    # Only the allocations made from here count
+    reset_peak()
+    base, _ = get_traced_memory()
+    t0: float = perf_counter()
+
+    with threadpool_limits(n_jobs):
+        X, y = loader()
+        y_train, y_test = (
+            (y.iloc[:end], y.iloc[test_start:test_end]) if isinstance(y, DataFrame)
+            else (y[:end], y[test_start:test_end])
+        )
+
+        _, y_pred = module.simple_train(
+            X.iloc[test_start:test_end], X.iloc[:end], y_train, n_jobs=n_jobs, **(options or {})
+        )
+
+    seconds: float = perf_counter() - t0
+    _, peak = get_traced_memory()
+
+    if not tracing:
+        stop()
+
+    if n_jobs > 1:
+        shutdown_workers()
+
+    return {
+        'score': float(score(y_test, y_pred)),
+        'seconds': seconds,
+        'peak_mb': (peak - base) / 2 ** 20,
+        'train_rows': end,
+        'test_rows': test_end - test_start,
+    }
+
+
+def test_folds(
+        name: str,
+        n: int,
+        budget: int = cpu_count() or 1,
+        options: dict | None = None
+) -> list[dict]:
+    """
+
+    Same folds as the test function of the model, scored concurrently in worker processes.
+
+    Args:
+        name: Name of the model in orchestrator.models.
+        n: Number of K-Folds to perform.
+        budget: Number of CPUs shared by the folds, 1 scores them one after another in this process.
+        options: Keyword arguments of the simple_train function of the model.
+
+    Returns:
+        The result of run_fold for each fold, in order.
+
+    """
+    # Built here once if stale, the workers only map it
+    bounds: list[tuple[int, int, int]] = list(folds(load_features()[3]['rows'], n))
+
+    if budget <= 1:
+        return [run_fold(name, *fold, options=options) for fold in bounds]
+
+    workers: int = min(budget, n)
+    n_jobs: int = max(1, budget // workers)
+    res: list[dict | None] = [None] * n
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # The last folds train on the most rows, they are started first
+        futures: dict[Future, int] = {
+            executor.submit(run_fold, name, *bounds[i], n_jobs, options): i for i in reversed(range(n))
+        }
+
+        for future in as_completed(futures):
+            res[futures[future]] = future.result()
+
+    return res
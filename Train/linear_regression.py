@@ -5,7 +5,7 @@ from sklearn.model_selection import train_test_split, TimeSeriesSplit
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
-from Data import get_split_data
+from Data import get_split_features
 
 from .common import load as g_load, save as g_save
 
@@ -18,6 +18,7 @@ def simple_train(
         x_test: DataFrame,
         x_train: DataFrame,
         y_train: DataFrame,
+        n_jobs: int | None = None
 ) -> tuple[Pipeline, DataFrame]:
     """
 
@@ -25,6 +26,7 @@ def simple_train(
         x_test: X_test dataset.
         x_train: X_train dataset.
         y_train: Y_train dataset.
+        n_jobs: Number of CPUs used by the model, None for one and -1 for all of them.
 
     Returns:
         The model pipline along with the predicted dataframe.
@@ -34,7 +36,7 @@ def simple_train(
     # Scale the numeric features (all the features in our case), and then pass to model
     pipeline: Pipeline = Pipeline([
         ('scaler', StandardScaler().set_output(transform="pandas")),
-        ('model', LinearRegression())
+        ('model', LinearRegression(n_jobs=n_jobs))
     ])
 
     # LR model
@@ -43,18 +45,29 @@ def simple_train(
     return pipeline, DataFrame(pipeline.predict(x_test), columns=["high", "low", "close"])
 
 
-def test(n: int) -> list[float]:
+def test(n: int, incremental: bool = False, budget: int = 1) -> list[float]:
     """
 
     Args:
         n: Number of K-Folds to perform.
+        incremental: True to walk forward from one fold to the next instead of refitting each.
+        budget: Number of CPUs shared by the folds, more than 1 scores them concurrently, see folds.test_folds.
 
     Returns:
         List of root mean squared error scores for each iteration.
 
     """
+    if incremental:
+        from .walk_forward import test_ols
 
-    X, y = get_split_data()
+        return test_ols(n)
+
+    if budget > 1:
+        from .folds import test_folds
+
+        return [fold['score'] for fold in test_folds('lr', n, budget)]
+
+    X, y = get_split_features()
     res: list[float] = []
 
     # Assuming your data is in X and y
@@ -83,7 +96,7 @@ def train(no_save: bool = False) -> tuple[Pipeline, float]:
         The trained model along with its root mean squared error score.
 
     """
-    X, y = get_split_data()
+    X, y = get_split_features()
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, shuffle=False)
 
@@ -1,12 +1,13 @@
-from numpy import ravel, ndarray
+from numpy import ndarray
 from pandas import DataFrame
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import brier_score_loss  # Check for other testing methods
 from sklearn.model_selection import train_test_split, TimeSeriesSplit
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
+from typing import Literal
 
-from Data import get_data, target_labels
+from Data import get_split_features
 
 from .common import load as g_load, save as g_save
 
@@ -14,6 +15,9 @@ from .common import load as g_load, save as g_save
 # Name of the model file, without extension
 save_file: str = "lgr_model"
 
+# Training from zero with SAGA, or starting from the saved model with L-BFGS or with a minibatch SGD
+Mode = Literal['full', 'warm', 'sgd']
+
 
 def get_split_data() -> tuple[DataFrame, ndarray]:
     """
@@ -22,21 +26,18 @@ def get_split_data() -> tuple[DataFrame, ndarray]:
         Overrides the usual split, due to the single-dependent-variable nature of LogisticRegression.
 
     """
-    df: DataFrame = get_data()
+    X, y = get_split_features()
 
-    return (
-        df.drop(target_labels, axis=1),
-        ravel(
-            (df['open'] - df['close']).map(lambda v: int(v < 0))
-        )
-    )
+    # 1 if the price went up, vectorized over the whole column
+    return X, ((X['open'] - y['close']) < 0).to_numpy(dtype=int)
 
 
 def simple_train(
         x_test: DataFrame,
         x_train: DataFrame,
         y_train: DataFrame,
-        verbose: bool = False
+        verbose: bool = False,
+        n_jobs: int = -1
 ) -> tuple[Pipeline, DataFrame]:
     """
 
@@ -45,6 +46,7 @@ def simple_train(
         x_train: X_train dataset.
         y_train: Y_train dataset.
         verbose: True to make the training verbose.
+        n_jobs: Number of CPUs used by the model, -1 for all of them.
 
     Returns:
         The model pipline along with the predicted dataframe.
@@ -58,7 +60,7 @@ def simple_train(
             max_iter=400,
             verbose=3 if verbose else 0,
             solver='saga',
-            n_jobs=-1,
+            n_jobs=n_jobs,
             penalty='l2',
         ))
     ])
@@ -69,16 +71,27 @@ def simple_train(
     return pipeline, DataFrame(pipeline.predict(x_test), columns=["direction"])
 
 
-def test(n: int) -> list[float]:
+def test(n: int, incremental: bool = False, budget: int = 1) -> list[float]:
     """
 
     Args:
         n: Number of K-Folds to perform.
+        incremental: True to walk forward from one fold to the next instead of refitting each.
+        budget: Number of CPUs shared by the folds, more than 1 scores them concurrently, see folds.test_folds.
 
     Returns:
         List of accuracy scores for each iteration.
 
     """
+    if incremental:
+        from .walk_forward import test_logistic
+
+        return test_logistic(n)
+
+    if budget > 1:
+        from .folds import test_folds
+
+        return [fold['score'] for fold in test_folds('lgr', n, budget)]
 
     X, y = get_split_data()
     res: list[float] = []
@@ -97,7 +110,7 @@ def test(n: int) -> list[float]:
     return res
 
 
-def train(no_save: bool = False, verbose: bool = False) -> tuple[Pipeline, float]:
+def train(no_save: bool = False, verbose: bool = False, mode: Mode = 'full') -> tuple[Pipeline, float]:
     """
 
     Trains the model and saves it to its designated file.
@@ -105,11 +118,17 @@ def train(no_save: bool = False, verbose: bool = False) -> tuple[Pipeline, float
     Args:
         no_save: True to not save the trained model.
         verbose: True to make the training step verbose.
+        mode: Training mode, the warm and SGD modes start from the saved model, see fast_logistic.fast_train.
 
     Returns:
         The trained model along with its brier score loss value.
 
     """
+    if mode != 'full':
+        from .fast_logistic import fast_train
+
+        return fast_train(mode, no_save, verbose)
+
     X, y = get_split_data()
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, shuffle=False)
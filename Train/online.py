@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from numpy import float64, ndarray, sqrt
+from os import path
+from pandas import DataFrame
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+from sklearn.multioutput import MultiOutputRegressor
+from sklearn.preprocessing import StandardScaler
+
+from Data import batch_rows, feature_columns, iter_batches
+
+from .common import dir_path, load as g_load, save as g_save
+
+
+# Name of the model file of each variant, without extension
+save_files: dict[bool, str] = {
+    False: "lr_online",
+    True: "lgr_online",
+}
+
+# Constant step size, so that the models keep following the market instead of freezing as they see more rows
+learning_rate: float = 1e-3
+
+
+class OnlineModel:
+    """
+    Scaler and SGD model updated one block of observations at a time.
+    The scaler of the features, and of the targets for the regression, are updated along with the model.
+    Can be used in place of the pipelines for prediction.
+    """
+
+    def __init__(self, features: list[str], logistic: bool = False) -> None:
+        """
+
+        Args:
+            features: Feature columns, DataFrames given to the model are reordered to match them.
+            logistic: True for the direction model, otherwise the close, high, and low are predicted.
+
+        """
+        self.features: list[str] = features
+        self.logistic: bool = logistic
+        self.seen: int = 0
+        self.scaler: StandardScaler = StandardScaler()
+
+        # Prices are in the thousands, the regression is fitted on standardized targets
+        self.target_scaler: StandardScaler | None = None if logistic else StandardScaler()
+        self.model: SGDClassifier | MultiOutputRegressor = SGDClassifier(
+            loss='log_loss',
+            learning_rate='constant',
+            eta0=learning_rate
+        ) if logistic else MultiOutputRegressor(SGDRegressor(learning_rate='constant', eta0=learning_rate))
+
+    def to_matrix(self, X: DataFrame | ndarray) -> ndarray:
+        """
+
+        Args:
+            X: Features, either a DataFrame or an array whose columns are ordered as the features.
+
+        Returns:
+            The features as an array.
+
+        """
+        if isinstance(X, DataFrame):
+            return X[self.features].to_numpy(dtype=float64)
+
+        return X
+
+    def partial_fit(self, X: DataFrame | ndarray, y: DataFrame | ndarray) -> OnlineModel:
+        """
+
+        Args:
+            X: Features of the new observations.
+            y: Targets of the new observations, the direction as 0 or 1 for the logistic model.
+
+        Returns:
+            The updated model.
+
+        """
+        x: ndarray = self.to_matrix(X)
+        y = y.to_numpy(dtype=float64) if isinstance(y, DataFrame) else y
+
+        self.scaler.partial_fit(x)
+
+        if self.logistic:
+            self.model.partial_fit(self.scaler.transform(x), y.ravel(), classes=[0, 1])
+        else:
+            self.target_scaler.partial_fit(y)
+            self.model.partial_fit(self.scaler.transform(x), self.target_scaler.transform(y))
+
+        self.seen += len(x)
+
+        return self
+
+    def predict(self, X: DataFrame | ndarray) -> ndarray:
+        """
+
+        Args:
+            X: Features.
+
+        Returns:
+            The predicted direction, or the predicted close, high, and low.
+
+        """
+        x: ndarray = self.scaler.transform(self.to_matrix(X))
+
+        if self.logistic:
+            return self.model.predict(x)
+
+        return self.target_scaler.inverse_transform(self.model.predict(x))
+
+    def predict_proba(self, X: DataFrame | ndarray) -> ndarray:
+        """
+
+        Args:
+            X: Features.
+
+        Returns:
+            The probability of each direction, only for the logistic model.
+
+        """
+        return self.model.predict_proba(self.scaler.transform(self.to_matrix(X)))
+
+
+def train(logistic: bool = False, no_save: bool = False, batch_size: int = batch_rows) -> tuple[OnlineModel, float]:
+    """
+
+    Trains an online model over the whole merged dataset in a single pass, streaming it in blocks.
+    Each block is scored before the model learns from it, as it would be when served.
+
+    Args:
+        logistic: True for the direction model, otherwise the regression model.
+        no_save: True to not save the trained model.
+        batch_size: Number of rows in each block.
+
+    Returns:
+        The trained model along with its score over the blocks it was scored on,
+        the brier score loss for the direction model, otherwise the root mean squared error.
+
+    """
+    model: OnlineModel = OnlineModel(feature_columns(), logistic)
+
+    errors: ndarray | float = 0.0
+    scored: int = 0
+
+    for x, y in iter_batches(batch_size, logistic=logistic):
+        # Nothing to score before the first block
+        if model.seen:
+            err: ndarray = (model.predict_proba(x)[:, 1] - y) if logistic else (model.predict(x) - y)
+            errors = errors + (err ** 2).sum(axis=0)
+            scored += len(x)
+
+        model.partial_fit(x, y)
+
+    if not no_save:
+        save(model)
+
+    if not scored:
+        return model, float('nan')
+
+    # Averaged over the targets as root_mean_squared_error does
+    return model, float(errors / scored) if logistic else float(sqrt(errors / scored).mean())
+
+
+def exists(logistic: bool = False) -> bool:
+    """
+
+    Args:
+        logistic: True for the direction model, otherwise the regression model.
+
+    Returns:
+        True if the model was saved.
+
+    """
+    return path.exists(path.join(dir_path, f"{save_files[logistic]}.sav"))
+
+
+def load(logistic: bool = False) -> OnlineModel:
+    """
+
+    Args:
+        logistic: True for the direction model, otherwise the regression model.
+
+    Returns:
+        The loaded model from the designated file.
+
+    """
+    return g_load(save_files[logistic])
+
+
+def save(model: OnlineModel) -> None:
+    """
+
+    Saves the model into its file.
+
+    Args:
+        model: Model to be saved into the file.
+
+    """
+    g_save(model, save_files[model.logistic])
@@ -0,0 +1,166 @@
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from math import ceil
+from numpy import ndarray
+from os import cpu_count
+from pandas import DataFrame
+from sklearn.metrics import brier_score_loss, root_mean_squared_error
+from sklearn.pipeline import Pipeline
+from threadpoolctl import threadpool_limits
+from time import perf_counter
+from types import ModuleType
+from typing import Callable
+
+from Data import from_epoch_minutes, get_split_features, load_features
+
+from . import elastic_linear, linear_regression, logistic_regression, registry
+from .common import shutdown_workers
+
+
+# Module, data loader, and score of each model, the slowest model comes first so that it starts first
+models: dict[str, tuple[ModuleType, Callable[[], tuple[DataFrame, DataFrame | ndarray]], Callable]] = {
+    'elr': (elastic_linear, get_split_features, root_mean_squared_error),
+    'lgr': (logistic_regression, logistic_regression.get_split_data, brier_score_loss),
+    'lr': (linear_regression, get_split_features, root_mean_squared_error),
+}
+
+# Fraction of the rows kept for testing, the last ones, same as the train function of each model
+test_size: float = 0.3
+
+
+def share_budget(budget: int) -> dict[str, int]:
+    """
+
+    The linear and logistic models barely use more than one CPU, the rest goes to the elastic net grid search.
+    With fewer CPUs than models, each model gets one, and train_all runs at most budget of them at once.
+
+    Args:
+        budget: Number of CPUs shared by the models.
+
+    Returns:
+        The number of CPUs given to each model, at least one, which add up to the budget when it covers every model.
+
+    """
+    jobs: dict[str, int] = {name: 1 for name in models}
+    jobs['elr'] = max(1, budget - len(models) + 1)
+
+    return jobs
+
+
+def fit_model(
+        name: str,
+        split: int,
+        n_jobs: int,
+        no_save: bool,
+        register: bool = False
+) -> tuple[str, Pipeline, float, float]:
+    """
+
+    Fits a model on the first split rows and scores it on the rest.
+    The data is memory-mapped from the feature store, so all the processes share the same pages.
+
+    Args:
+        name: Name of the model in models.
+        split: Number of training rows.
+        n_jobs: Number of CPUs the model may use, including its BLAS threads.
+        no_save: True to not save the trained model.
+        register: True to register the trained model as a new version, and promote it, see registry.register.
+
+    Returns:
+        The name of the model, the trained pipeline, its score, and the seconds spent.
+
+    """
+    module, loader, score = models[name]
+
+    t0: float = perf_counter()
+
+    with threadpool_limits(n_jobs):
+        X, y = loader()
+
+        # Time split, the rows are sorted by timestamp
+        y_train, y_test = (y.iloc[:split], y.iloc[split:]) if isinstance(y, DataFrame) else (y[:split], y[split:])
+
+        pipeline, y_pred = module.simple_train(X.iloc[split:], X.iloc[:split], y_train, n_jobs=n_jobs)
+
+    if n_jobs > 1:
+        shutdown_workers()
+
+    seconds: float = perf_counter() - t0
+    res: float = float(score(y_test, y_pred))
+
+    if not no_save:
+        module.save(pipeline)
+
+    if register:
+        _, _, index, meta = load_features()
+        first, last = from_epoch_minutes(index[[0, split - 1]])
+
+        registry.register(name, pipeline, {score.__name__: res}, (str(first), str(last)), meta['dataset'], seconds)
+
+    return name, pipeline, res, seconds
+
+
+def train_all(
+        no_save: bool = False,
+        budget: int = cpu_count() or 1,
+        refresh: bool = False,
+        register: bool = False
+) -> tuple[dict[str, Pipeline], dict]:
+    """
+
+    Trains all the models at once, each in its own process, and saves them to their designated files.
+    The feature store is built once before the processes start, and the 70/30 time split is computed once.
+
+    Args:
+        no_save: True to not save the trained models.
+        budget: Number of CPUs shared by the models, 1 trains them one after another in this process.
+        refresh: If True, re-cleans the datasets and rebuilds the feature store first.
+        register: True to register the trained models as new versions, which the running server then serves.
+
+    Returns:
+        The trained models, along with a report of their scores and timings.
+
+    """
+    t0: float = perf_counter()
+
+    # Built here once, the workers only map it
+    _, _, _, meta = load_features(refresh=refresh)
+
+    rows: int = meta['rows']
+    split: int = rows - ceil(test_size * rows)
+    jobs: dict[str, int] = share_budget(budget)
+    load_t: float = perf_counter() - t0
+
+    pipelines: dict[str, Pipeline] = {}
+    report: dict = {
+        'rows': rows,
+        'train_rows': split,
+        'test_rows': rows - split,
+        'load': load_t,
+        'models': {},
+    }
+
+    def collect(name: str, pipeline: Pipeline, score: float, seconds: float) -> None:
+        pipelines[name] = pipeline
+        report['models'][name] = {
+            'metric': models[name][2].__name__,
+            'score': float(score),
+            'seconds': seconds,
+            'n_jobs': jobs[name],
+        }
+
+    if budget <= 1:
+        for name in models:
+            collect(*fit_model(name, split, jobs[name], no_save, register))
+    else:
+        # The elastic net is submitted first, the others queue behind it when the budget is smaller than the models
+        with ProcessPoolExecutor(max_workers=min(budget, len(models))) as executor:
+            futures: list[Future] = [
+                executor.submit(fit_model, name, split, jobs[name], no_save, register) for name in models
+            ]
+
+            for future in as_completed(futures):
+                collect(*future.result())
+
+    report['total'] = perf_counter() - t0
+
+    return pipelines, report
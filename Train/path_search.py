@@ -0,0 +1,153 @@
+from joblib import Parallel, delayed
+from numpy import argsort, ascontiguousarray, asarray, empty, flatnonzero, ndarray, sqrt, stack, unravel_index
+from sklearn.linear_model import ElasticNet, enet_path
+from sklearn.model_selection import cross_val_score, KFold
+
+
+# Tolerance of the coordinate descent. Tighter than the default of ElasticNet, as the targets are prices
+# whose large norm makes the default loose enough for a warm-started path to stop at a different score
+path_tol: float = 1e-6
+
+# Relative distance to the best path score under which a candidate is scored again with ElasticNet.
+# Both solvers stop within their tolerance of the optimum, their scores differ by about 1e-6 relative,
+# enough to swap two candidates that are nearly tied.
+rescore_rtol: float = 1e-4
+
+
+def fold_scores(
+        x: ndarray,
+        y: ndarray,
+        train: ndarray,
+        test: ndarray,
+        alphas: ndarray,
+        l1_ratios: list[float]
+) -> ndarray:
+    """
+
+    Walks the regularization path of every l1_ratio on one fold.
+    The centered Gram matrix and X'y of the training rows are computed once, and shared by all the paths.
+    Each alpha is warm-started from the solution of the previous, larger one.
+
+    Args:
+        x: Scaled features.
+        y: Targets, one column per target.
+        train: Training rows of the fold.
+        test: Testing rows of the fold.
+        alphas: Penalties, in decreasing order.
+        l1_ratios: Mixes of the L1 and L2 penalties.
+
+    Returns:
+        The negated root mean squared error of each l1_ratio and alpha on the testing rows, averaged over the targets.
+
+    """
+    x_train: ndarray = x[train]
+    y_train: ndarray = y[train]
+
+    # Centered as ElasticNet does to fit the intercept
+    x_mean: ndarray = x_train.mean(axis=0)
+    y_mean: ndarray = y_train.mean(axis=0)
+    x_train -= x_mean
+    y_train = y_train - y_mean
+
+    gram: ndarray = ascontiguousarray(x_train.T @ x_train)
+    xy: ndarray = x_train.T @ y_train
+
+    x_test: ndarray = x[test]
+    y_test: ndarray = y[test]
+    scores: ndarray = empty((len(l1_ratios), len(alphas)))
+
+    for i, l1_ratio in enumerate(l1_ratios):
+        # Root mean squared error of each target and alpha
+        rmse: list[ndarray] = []
+
+        for t in range(y.shape[1]):
+            _, coefs, _ = enet_path(
+                x_train,
+                ascontiguousarray(y_train[:, t]),
+                l1_ratio=l1_ratio,
+                alphas=alphas,
+                precompute=gram,
+                Xy=ascontiguousarray(xy[:, t]),
+                check_input=False,
+                tol=path_tol
+            )
+
+            # Predictions of all the alphas at once
+            pred: ndarray = x_test @ coefs + (y_mean[t] - x_mean @ coefs)
+            rmse.append(sqrt(((pred - y_test[:, t:t + 1]) ** 2).mean(axis=0)))
+
+        scores[i] = -stack(rmse).mean(axis=0)
+
+    return scores
+
+
+def path_search(
+        x: ndarray,
+        y: ndarray,
+        alphas: list[float],
+        l1_ratios: list[float],
+        cv: int,
+        n_jobs: int = -1,
+        verbose: bool = False
+) -> tuple[dict, ndarray]:
+    """
+
+    Scores every alpha and l1_ratio of the grid with unshuffled K-Folds,
+    walking one regularization path per fold and l1_ratio instead of fitting every candidate from scratch.
+    The candidates within rescore_rtol of the best one are then scored again by fitting ElasticNet on each fold,
+    as GridSearchCV does, and the best of them is selected on those scores.
+    The selection is thus that of GridSearchCV, unless a candidate outside of the band is the best of the grid search,
+    which takes its score to differ from that of the path by more than rescore_rtol.
+
+    Args:
+        x: Scaled features.
+        y: Targets, one column per target.
+        alphas: Penalties of the grid.
+        l1_ratios: Mixes of the L1 and L2 penalties of the grid.
+        cv: Number of folds.
+        n_jobs: Number of folds scored at once, -1 for all the CPUs.
+        verbose: True to print the best parameters.
+
+    Returns:
+        The best parameters, along with the mean score of every alpha (rows) and l1_ratio (columns), in grid order.
+        The scores of the candidates scored again are those of ElasticNet.
+
+    """
+    x = asarray(x, dtype=float)
+    y = asarray(y, dtype=float).reshape(len(x), -1)
+
+    # Paths go from the largest penalty down
+    order: ndarray = argsort(alphas)[::-1]
+    path_alphas: ndarray = asarray(alphas, dtype=float)[order]
+
+    folds: list[ndarray] = Parallel(n_jobs=n_jobs)(
+        delayed(fold_scores)(x, y, train, test, path_alphas, l1_ratios) for train, test in KFold(cv).split(x)
+    )
+
+    # Back to the order of the grid, alphas first as in ParameterGrid
+    mean: ndarray = stack(folds).mean(axis=0)
+    scores: ndarray = mean.T.copy()
+    scores[order] = mean.T
+
+    # Near ties, scored again by the same fits as the grid search, in grid order
+    best_score: float = scores.max()
+
+    for i in flatnonzero(scores.ravel() >= best_score - rescore_rtol * abs(best_score)):
+        a, l1 = unravel_index(i, scores.shape)
+        scores[a, l1] = cross_val_score(
+            ElasticNet(alpha=alphas[a], l1_ratio=l1_ratios[l1]),
+            x,
+            y,
+            scoring='neg_root_mean_squared_error',
+            cv=KFold(cv),
+            n_jobs=n_jobs
+        ).mean()
+
+    # Ties are broken by the first candidate of the grid, as GridSearchCV does
+    a, l1 = unravel_index(scores.argmax(), scores.shape)
+    best: dict = {'alpha': alphas[a], 'l1_ratio': l1_ratios[l1]}
+
+    if verbose:
+        print(f"Best parameters {best}, score {scores[a, l1]}")
+
+    return best, scores
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from json import dumps
+from os import listdir, makedirs, path, replace
+from shutil import rmtree
+from traceback import print_exc
+from typing import TYPE_CHECKING
+
+from Utils import read_json
+
+from .compiled import CompiledModel, compilable, compile_pipeline, dir_path, read, write
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+# Directory of the registry, one sub-directory per model, holding one sub-directory per version
+registry_path: str = path.join(dir_path, "registry")
+
+# Name of the file holding the promoted version of a model
+current_file: str = "CURRENT"
+
+# Model names and versions that failed to load once promoted, refresh keeps serving the current model until the next promotion
+failed: set[tuple[str, str]] = set()
+
+
+def model_path(name: str, version: str | None = None) -> str:
+    """
+
+    Args:
+        name: Name of the model, such as lr, lgr or elr.
+        version: Version of the model, None for the directory of all its versions.
+
+    Returns:
+        Path to the directory of the version.
+
+    """
+    return path.join(registry_path, name) if version is None else path.join(registry_path, name, version)
+
+
+def versions(name: str) -> list[str]:
+    """
+
+    Args:
+        name: Name of the model.
+
+    Returns:
+        The registered versions of the model, oldest first.
+
+    """
+    src: str = model_path(name)
+
+    if not path.isdir(src):
+        return []
+
+    # Unfinished versions are hidden until they are complete
+    return sorted(v for v in listdir(src) if not v.startswith('.') and path.isdir(path.join(src, v)))
+
+
+def current(name: str) -> str | None:
+    """
+
+    Cheap enough to be called before every prediction, it reads a single line.
+
+    Args:
+        name: Name of the model.
+
+    Returns:
+        The promoted version of the model, None if none was promoted.
+
+    """
+    try:
+        with open(path.join(model_path(name), current_file), 'r') as file:
+            return file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def promote(name: str, version: str) -> None:
+    """
+
+    Makes the version the one served. The pointer is replaced atomically,
+    so a reader sees either the previous version or this one, never a partial write.
+
+    Args:
+        name: Name of the model.
+        version: Registered version of the model.
+
+    Raises:
+        ValueError: If the version is not registered, or has no compiled artifact, which the server predicts with.
+
+    """
+    if version not in versions(name):
+        raise ValueError(f"Version {version} of {name} is not registered")
+
+    if not metadata(name, version).get('compiled', False):
+        raise ValueError(f"Version {version} of {name} has no compiled artifact")
+
+    tmp_path: str = path.join(model_path(name), f".{current_file}.tmp")
+
+    with open(tmp_path, 'w') as file:
+        file.write(version)
+
+    replace(tmp_path, path.join(model_path(name), current_file))
+
+
+def register(
+        name: str,
+        pipeline: Pipeline,
+        metrics: dict[str, float],
+        data_range: tuple[str, str],
+        dataset: str | None,
+        seconds: float,
+        serve: bool = True
+) -> str:
+    """
+
+    Stores a new version of the model, with its compiled artifact if it has one, and its metadata.
+    The version is written to a hidden directory renamed into place once complete, so a version is never seen half-written.
+
+    Args:
+        name: Name of the model.
+        pipeline: Trained pipeline.
+        metrics: Score of the model on its testing rows, by metric name.
+        data_range: First and last timestamps of the training rows.
+        dataset: Hash of the merged dataset the model was trained on.
+        seconds: Training time in seconds.
+        serve: True to promote the new version right away.
+
+    Returns:
+        The new version, the UTC time of its registration.
+
+    Raises:
+        ValueError: If the version is to be served but has no compiled artifact, it is registered all the same.
+
+    """
+    from joblib import dump
+
+    version: str = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+    tmp_path: str = model_path(name, f".{version}.tmp")
+
+    makedirs(tmp_path)
+
+    try:
+        dump(pipeline, path.join(tmp_path, "model.sav"))
+
+        if compilable(pipeline):
+            write(compile_pipeline(pipeline), path.join(tmp_path, "model.npz"))
+
+        with open(path.join(tmp_path, "meta.json"), 'w') as file:
+            file.write(dumps({
+                'name': name,
+                'version': version,
+                'data_range': list(data_range),
+                'dataset': dataset,
+                'metrics': metrics,
+                'seconds': seconds,
+                'compiled': compilable(pipeline),
+            }, indent=4))
+
+        replace(tmp_path, model_path(name, version))
+    except BaseException:
+        rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    if serve:
+        promote(name, version)
+
+    return version
+
+
+def metadata(name: str, version: str | None = None) -> dict:
+    """
+
+    Args:
+        name: Name of the model.
+        version: Version of the model, the promoted one by default.
+
+    Returns:
+        The metadata of the version.
+
+    Raises:
+        ValueError: If no version is given and none was promoted.
+
+    """
+    return read_json(path.join(model_path(name, resolve(name, version)), "meta.json"))
+
+
+def resolve(name: str, version: str | None) -> str:
+    """
+
+    Args:
+        name: Name of the model.
+        version: Version of the model, None for the promoted one.
+
+    Returns:
+        The version.
+
+    Raises:
+        ValueError: If no version is given and none was promoted.
+
+    """
+    version = version if version is not None else current(name)
+
+    if version is None:
+        raise ValueError(f"No version of {name} was promoted")
+
+    return version
+
+
+def load(name: str, version: str | None = None) -> Pipeline:
+    """
+
+    Args:
+        name: Name of the model.
+        version: Version of the model, the promoted one by default.
+
+    Returns:
+        The pipeline of the version.
+
+    """
+    from joblib import load as jload
+
+    return jload(path.join(model_path(name, resolve(name, version)), "model.sav"))
+
+
+def load_compiled(name: str, version: str | None = None) -> CompiledModel:
+    """
+
+    Args:
+        name: Name of the model.
+        version: Version of the model, the promoted one by default.
+
+    Returns:
+        The compiled model of the version, loaded with numpy alone.
+
+    """
+    return read(path.join(model_path(name, resolve(name, version)), "model.npz"))
+
+
+def refresh(name: str, model: CompiledModel, version: str | None) -> tuple[CompiledModel, str | None]:
+    """
+
+    Hot swap of a served model, called between two predictions.
+    Versions are immutable once registered, and the pointer is replaced atomically,
+    so the new model is either fully loaded or the current one kept.
+
+    Args:
+        name: Name of the model.
+        model: Model currently served.
+        version: Version currently served, None if it does not come from the registry.
+
+    Returns:
+        The model to serve and its version, the promoted ones if they changed.
+        The current ones if the promoted version cannot be loaded, which is reported once and not tried again.
+
+    """
+    promoted: str | None = current(name)
+
+    if promoted is None or promoted == version or (name, promoted) in failed:
+        return model, version
+
+    try:
+        return load_compiled(name, promoted), promoted
+    except (OSError, KeyError, ValueError):
+        print_exc()
+        failed.add((name, promoted))
+
+        return model, version
+
+
+def load_served(name: str) -> tuple[CompiledModel, str | None]:
+    """
+
+    Args:
+        name: Name of the model.
+
+    Returns:
+        The compiled model to serve and its version, the promoted version if any,
+        otherwise the model saved by its train function, whose version is None.
+
+    """
+    version: str | None = current(name)
+
+    if version is not None:
+        return load_compiled(name, version), version
+
+    from .compiled import load_or_export
+
+    return load_or_export(f"{name}_model"), None
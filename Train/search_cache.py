@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from hashlib import sha256
+from json import dumps
+from numpy import asarray, ascontiguousarray, load as np_load, ndarray, savez
+from os import getpid, listdir, makedirs, path, replace
+from pandas import DataFrame
+from shutil import rmtree
+from sklearn.linear_model import ElasticNet
+
+from Data import dataset_hash
+
+from .common import dir_path
+
+
+# Directory of the cached fits, one sub-directory per merged dataset
+cache_path: str = path.join(dir_path, "search_cache")
+
+# Fitted attributes of ElasticNet stored for each fit
+fitted: tuple[str, ...] = ('coef_', 'intercept_', 'n_iter_', 'dual_gap_')
+
+
+def dataset_dir(dataset: str | None = None) -> str:
+    """
+
+    Args:
+        dataset: Hash of the merged dataset, the current one by default.
+
+    Returns:
+        Path to the cached fits of the dataset.
+
+    """
+    return path.join(cache_path, dataset if dataset is not None else dataset_hash() or "unmerged")
+
+
+def fit_key(params: dict, x: DataFrame | ndarray, y: DataFrame | ndarray) -> str:
+    """
+
+    The rows of a fold are identified by their timestamps, and their values are hashed as well,
+    since the features are scaled with the statistics of the training rows of the outer split.
+
+    Args:
+        params: Parameters of the estimator.
+        x: Features of the training rows of the fold.
+        y: Targets of the training rows of the fold.
+
+    Returns:
+        The key of the fit.
+
+    """
+    digest = sha256(dumps(params, sort_keys=True, default=str).encode())
+
+    # Fold boundaries, in the order of the rows
+    if isinstance(x, DataFrame):
+        digest.update(ascontiguousarray(x.index.to_numpy()).tobytes())
+
+    for values in (x, y):
+        digest.update(ascontiguousarray(asarray(values, dtype=float)).tobytes())
+
+    return digest.hexdigest()
+
+
+class MemoizedElasticNet(ElasticNet):
+    """
+    ElasticNet whose fits are stored on disk, keyed by its parameters, the rows of the fold, and the merged dataset.
+    A search that is interrupted, or extended with new candidates, refits only the (candidate, fold) pairs it has
+    not fitted yet, the stored ones are loaded and scored again, which only costs a prediction.
+
+
+    cache_dir: Directory of the fits, resolved by the search once, see dataset_dir, which is called on each fit otherwise.
+    """
+
+    def __init__(
+            self,
+            alpha: float = 1.0,
+            *,
+            l1_ratio: float = 0.5,
+            fit_intercept: bool = True,
+            precompute: bool = False,
+            max_iter: int = 1000,
+            copy_X: bool = True,
+            tol: float = 1e-4,
+            warm_start: bool = False,
+            positive: bool = False,
+            random_state: int | None = None,
+            selection: str = 'cyclic',
+            cache_dir: str | None = None
+    ) -> None:
+        """
+
+        Args:
+            alpha: See ElasticNet.
+            l1_ratio: See ElasticNet.
+            fit_intercept: See ElasticNet.
+            precompute: See ElasticNet.
+            max_iter: See ElasticNet.
+            copy_X: See ElasticNet.
+            tol: See ElasticNet.
+            warm_start: See ElasticNet.
+            positive: See ElasticNet.
+            random_state: See ElasticNet.
+            selection: See ElasticNet.
+            cache_dir: Directory of the fits, that of the current dataset by default.
+
+        """
+        # Listed one by one, scikit-learn reads the parameters of an estimator from the signature of its __init__
+        super().__init__(
+            alpha,
+            l1_ratio=l1_ratio,
+            fit_intercept=fit_intercept,
+            precompute=precompute,
+            max_iter=max_iter,
+            copy_X=copy_X,
+            tol=tol,
+            warm_start=warm_start,
+            positive=positive,
+            random_state=random_state,
+            selection=selection
+        )
+        self.cache_dir: str | None = cache_dir
+
+    def fit(self, X, y, sample_weight=None, check_input=True) -> MemoizedElasticNet:
+        """
+
+        Args:
+            X: Features.
+            y: Targets.
+            sample_weight: Weight of each row, weighted fits are not cached.
+            check_input: False to skip the validation of the input.
+
+        Returns:
+            The fitted estimator.
+
+        """
+        if sample_weight is not None:
+            return super().fit(X, y, sample_weight, check_input)
+
+        dest: str = self.cache_dir if self.cache_dir is not None else dataset_dir()
+
+        # The directory already identifies the dataset, the key is the same wherever the fits are stored
+        params: dict = {k: v for k, v in self.get_params().items() if k != 'cache_dir'}
+        entry: str = path.join(dest, f"{fit_key(params, X, y)}.npz")
+
+        if path.exists(entry):
+            with np_load(entry, allow_pickle=False) as data:
+                for name in fitted:
+                    # Each access reads the member from the archive again
+                    value: ndarray = data[name]
+                    setattr(self, name, value[()] if value.ndim == 0 else value)
+
+            # Set as fit sets them, from the columns of the input
+            self.n_features_in_ = X.shape[1]
+
+            if isinstance(X, DataFrame):
+                self.feature_names_in_ = asarray(X.columns, dtype=object)
+
+            return self
+
+        super().fit(X, y, check_input=check_input)
+
+        # Several search workers may store the same fit, each writes its own file before moving it in place
+        makedirs(dest, exist_ok=True)
+        tmp_path: str = f"{entry}.{getpid()}.tmp"
+
+        with open(tmp_path, 'wb') as file:
+            savez(file, **{name: asarray(getattr(self, name)) for name in fitted})
+
+        replace(tmp_path, entry)
+
+        return self
+
+
+def clear(keep_current: bool = True) -> None:
+    """
+
+    Deletes cached fits.
+
+    Args:
+        keep_current: True to only delete the fits of the datasets other than the current one.
+
+    """
+    if not path.isdir(cache_path):
+        return
+
+    current: str = path.basename(dataset_dir())
+
+    for name in listdir(cache_path):
+        if not keep_current or name != current:
+            rmtree(path.join(cache_path, name), ignore_errors=True)
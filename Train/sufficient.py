@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import reduce
+from math import ceil
+from numpy import asarray, finfo, ndarray, outer, sqrt, where, zeros
+from numpy.linalg import lstsq
+from os import cpu_count
+from pandas import Timedelta, Timestamp
+from pyarrow.dataset import Dataset, ParquetFileFragment, get_partition_keys
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from Data import batch_rows, feature_columns, from_epoch_minutes, iter_batches, target_labels
+from Data.batches import first_minute
+from Data.io import open_partitioned
+
+from .linear_regression import save
+
+
+# Fraction of the rows kept for testing, the last ones, same as linear_regression.train
+test_size: float = 0.3
+
+# Relative rounding error of the statistics
+eps: float = float(finfo('float64').eps)
+
+
+@dataclass
+class Moments:
+    """
+    Sufficient statistics of a linear regression over a set of rows.
+    Statistics of disjoint sets of rows are merged, and a subset is removed, without going over the rows again.
+
+
+    n: Number of rows.
+
+    mean_x: Mean of each feature.
+
+    mean_y: Mean of each target.
+
+    cxx: Centered cross-products of the features, X'X once the means are removed.
+
+    cxy: Centered cross-products of the features and the targets.
+    """
+    n: int
+    mean_x: ndarray
+    mean_y: ndarray
+    cxx: ndarray
+    cxy: ndarray
+
+    @classmethod
+    def empty(cls, features: int, targets: int) -> Moments:
+        """
+
+        Args:
+            features: Number of features.
+            targets: Number of targets.
+
+        Returns:
+            The statistics of no rows.
+
+        """
+        return cls(0, zeros(features), zeros(targets), zeros((features, features)), zeros((features, targets)))
+
+    @classmethod
+    def of(cls, x: ndarray, y: ndarray) -> Moments:
+        """
+
+        Args:
+            x: Features of the rows.
+            y: Targets of the rows.
+
+        Returns:
+            The statistics of the rows.
+
+        """
+        mean_x: ndarray = x.mean(axis=0)
+        mean_y: ndarray = y.mean(axis=0)
+        xc: ndarray = x - mean_x
+
+        return cls(len(x), mean_x, mean_y, xc.T @ xc, xc.T @ (y - mean_y))
+
+    def merge(self, other: Moments) -> Moments:
+        """
+
+        Pairwise update of Chan et al., numerically stable unlike summing raw cross-products.
+
+        Args:
+            other: Statistics of rows disjoint from these.
+
+        Returns:
+            The statistics of both sets of rows.
+
+        """
+        if not other.n:
+            return self
+
+        if not self.n:
+            return other
+
+        n: int = self.n + other.n
+        dx: ndarray = other.mean_x - self.mean_x
+        dy: ndarray = other.mean_y - self.mean_y
+        w: float = self.n * other.n / n
+
+        return Moments(
+            n,
+            self.mean_x + dx * other.n / n,
+            self.mean_y + dy * other.n / n,
+            self.cxx + other.cxx + outer(dx, dx) * w,
+            self.cxy + other.cxy + outer(dx, dy) * w,
+        )
+
+    def remove(self, other: Moments) -> Moments:
+        """
+
+        Inverse of merge.
+
+        Args:
+            other: Statistics of a subset of these rows.
+
+        Returns:
+            The statistics of the remaining rows.
+
+        Raises:
+            ValueError: If other holds more rows than these.
+
+        """
+        if other.n > self.n:
+            raise ValueError(f"Cannot remove {other.n} rows out of {self.n}")
+
+        if not other.n:
+            return self
+
+        n: int = self.n - other.n
+
+        if not n:
+            return Moments.empty(len(self.mean_x), len(self.mean_y))
+
+        # Means of the remaining rows
+        mean_x: ndarray = (self.n * self.mean_x - other.n * other.mean_x) / n
+        mean_y: ndarray = (self.n * self.mean_y - other.n * other.mean_y) / n
+        dx: ndarray = other.mean_x - mean_x
+        dy: ndarray = other.mean_y - mean_y
+        w: float = n * other.n / self.n
+
+        return Moments(
+            n,
+            mean_x,
+            mean_y,
+            self.cxx - other.cxx - outer(dx, dx) * w,
+            self.cxy - other.cxy - outer(dx, dy) * w,
+        )
+
+    def standardized(self) -> tuple[ndarray, ndarray, ndarray]:
+        """
+
+        Returns:
+            The scale of each feature as StandardScaler computes it, along with the centered cross-products
+            of the standardized features, and of the standardized features and the targets.
+
+        """
+        var: ndarray = self.cxx.diagonal() / self.n
+
+        # Constant features are left unscaled as StandardScaler does, with the same bound on the rounding errors
+        constant: ndarray = var <= self.n * eps * var + (self.n * self.mean_x * eps) ** 2
+        scale: ndarray = where(constant, 1.0, sqrt(var))
+
+        return scale, self.cxx / outer(scale, scale), self.cxy / scale[:, None]
+
+
+def year_ranges(
+        start: Timestamp | str | None = None,
+        end: Timestamp | str | None = None
+) -> list[tuple[Timestamp, Timestamp]]:
+    """
+
+    Args:
+        start: First timestamp, inclusive.
+        end: Last timestamp, inclusive.
+
+    Returns:
+        The time range of each year of the merged dataset within the bounds, each accumulated by its own process.
+
+    """
+    years: set[int] = {
+        int(get_partition_keys(fragment.partition_expression)['year'])
+        for fragment in open_partitioned().get_fragments()
+    }
+    ranges: list[tuple[Timestamp, Timestamp]] = []
+
+    for year in sorted(years):
+        first: Timestamp = Timestamp(year=year, month=1, day=1)
+        last: Timestamp = Timestamp(year=year + 1, month=1, day=1) - Timedelta(minutes=1)
+
+        # Clip to the bounds
+        first = max(first, Timestamp(start)) if start is not None else first
+        last = min(last, Timestamp(end)) if end is not None else last
+
+        if first <= last:
+            ranges.append((first, last))
+
+    return ranges
+
+
+def accumulate(
+        start: Timestamp | str | None = None,
+        end: Timestamp | str | None = None,
+        batch_size: int = batch_rows
+) -> Moments:
+    """
+
+    Args:
+        start: First timestamp, inclusive.
+        end: Last timestamp, inclusive.
+        batch_size: Number of rows read at once.
+
+    Returns:
+        The statistics of the rows within the bounds, streamed one block at a time.
+
+    """
+    stats: Moments = Moments.empty(len(feature_columns()), len(target_labels))
+
+    for x, y in iter_batches(batch_size, start, end):
+        stats = stats.merge(Moments.of(x, y))
+
+    return stats
+
+
+def fit(
+        start: Timestamp | str | None = None,
+        end: Timestamp | str | None = None,
+        workers: int = cpu_count() or 1,
+        batch_size: int = batch_rows
+) -> Moments:
+    """
+
+    Accumulates the statistics of each year in its own process, and merges them.
+
+    Args:
+        start: First timestamp, inclusive.
+        end: Last timestamp, inclusive.
+        workers: Maximum number of worker processes, 1 reads the years one after another in this process.
+        batch_size: Number of rows read at once.
+
+    Returns:
+        The statistics of the rows within the bounds.
+
+    """
+    # Built once here if missing or stale, before the workers read it
+    features: list[str] = feature_columns()
+    ranges: list[tuple[Timestamp, Timestamp]] = year_ranges(start, end)
+
+    if workers <= 1 or len(ranges) <= 1:
+        parts: list[Moments] = [accumulate(first, last, batch_size) for first, last in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            parts = list(executor.map(
+                accumulate, *zip(*ranges), [batch_size] * len(ranges)
+            ))
+
+    return reduce(Moments.merge, parts, Moments.empty(len(features), len(target_labels)))
+
+
+def add_range(stats: Moments, start: Timestamp | str, end: Timestamp | str) -> Moments:
+    """
+
+    Args:
+        stats: Statistics of rows outside the range.
+        start: First timestamp of the range, inclusive.
+        end: Last timestamp of the range, inclusive.
+
+    Returns:
+        The statistics including the rows of the range, only the range is read.
+
+    """
+    return stats.merge(accumulate(start, end))
+
+
+def remove_range(stats: Moments, start: Timestamp | str, end: Timestamp | str) -> Moments:
+    """
+
+    Args:
+        stats: Statistics including all the rows of the range.
+        start: First timestamp of the range, inclusive.
+        end: Last timestamp of the range, inclusive.
+
+    Returns:
+        The statistics without the rows of the range, only the range is read.
+
+    """
+    return stats.remove(accumulate(start, end))
+
+
+def to_pipeline(stats: Moments, features: list[str] | None = None) -> Pipeline:
+    """
+
+    Solves the least squares problem on the standardized features in one step,
+    and builds the same pipeline as linear_regression.simple_train would have fitted on the rows.
+
+    Args:
+        stats: Statistics of the training rows.
+        features: Names of the features, those of the merged dataset by default.
+
+    Returns:
+        The fitted scaler and linear regression pipeline.
+
+    """
+    features = features if features is not None else feature_columns()
+
+    scale, czz, czy = stats.standardized()
+
+    # Normal equations of the standardized features, the minimum norm solution if they are collinear
+    coef, _, rank, singular = lstsq(czz, czy, rcond=None)
+
+    scaler: StandardScaler = StandardScaler().set_output(transform="pandas")
+    scaler.mean_ = stats.mean_x.copy()
+    scaler.var_ = stats.cxx.diagonal() / stats.n
+    scaler.scale_ = scale
+    scaler.n_samples_seen_ = stats.n
+    scaler.n_features_in_ = len(features)
+    scaler.feature_names_in_ = asarray(features, dtype=object)
+
+    # The standardized features have zero mean, so the intercept is the mean of the targets
+    model: LinearRegression = LinearRegression()
+    model.coef_ = coef.T
+    model.intercept_ = stats.mean_y.copy()
+    model.rank_ = int(rank)
+    model.singular_ = sqrt(singular)
+    model.n_features_in_ = len(features)
+    model.feature_names_in_ = scaler.feature_names_in_
+
+    return Pipeline([('scaler', scaler), ('model', model)])
+
+
+def split_timestamp(fraction: float = 1 - test_size) -> Timestamp:
+    """
+
+    Args:
+        fraction: Fraction of the rows before the split.
+
+    Returns:
+        The timestamp of the first row after the split, the same rows as train_test_split without shuffling.
+
+    """
+    data: Dataset = open_partitioned()
+    fragments: list[ParquetFileFragment] = sorted(data.get_fragments(), key=first_minute)
+    rows: int = sum(fragment.metadata.num_rows for fragment in fragments)
+    offset: int = rows - ceil((1 - fraction) * rows)
+
+    # Only the timestamps of the file holding the split are read
+    for fragment in fragments:
+        if offset < fragment.metadata.num_rows:
+            minute: int = fragment.to_table(schema=data.schema, columns=['timestamp']).column('timestamp')[offset].as_py()
+
+            return from_epoch_minutes(asarray([minute]))[0]
+
+        offset -= fragment.metadata.num_rows
+
+    raise ValueError("The merged dataset is empty")
+
+
+def score(pipeline: Pipeline, start: Timestamp | str | None = None, end: Timestamp | str | None = None) -> float:
+    """
+
+    Args:
+        pipeline: Fitted pipeline.
+        start: First timestamp, inclusive.
+        end: Last timestamp, inclusive.
+
+    Returns:
+        The root mean squared error of the pipeline over the rows within the bounds, averaged over the targets.
+
+    """
+    scaler: StandardScaler = pipeline['scaler']
+    model: LinearRegression = pipeline['model']
+    errors: ndarray | float = 0.0
+    n: int = 0
+
+    # Predicted from the fitted coefficients, the batches are arrays in the order of the features,
+    # which the estimators fitted on named features would warn about
+    for x, y in iter_batches(start=start, end=end):
+        z: ndarray = (x - scaler.mean_) / scaler.scale_
+        errors = errors + ((z @ model.coef_.T + model.intercept_ - y) ** 2).sum(axis=0)
+        n += len(x)
+
+    return float(sqrt(errors / n).mean())
+
+
+def train(no_save: bool = False, workers: int = cpu_count() or 1) -> tuple[Pipeline, float]:
+    """
+
+    Same as linear_regression.train, without ever loading the whole dataset.
+
+    Args:
+        no_save: True to not save the trained model.
+        workers: Maximum number of worker processes accumulating the statistics.
+
+    Returns:
+        The trained model along with its root mean squared error score.
+
+    """
+    feature_columns()
+
+    split: Timestamp = split_timestamp()
+    pipeline: Pipeline = to_pipeline(fit(end=split - Timedelta(minutes=1), workers=workers))
+
+    if not no_save:
+        save(pipeline)
+
+    return pipeline, score(pipeline, start=split)
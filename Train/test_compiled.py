@@ -0,0 +1,67 @@
+from numpy import allclose, array_equal
+from pandas import DataFrame, Series
+from pathlib import Path
+from pytest import mark
+from sklearn.linear_model import ElasticNet, LinearRegression, LogisticRegression
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .compiled import CompiledModel, compilable, compile_pipeline, read, write
+
+
+def fitted(model: object, x: DataFrame, y: DataFrame) -> Pipeline:
+    """
+
+    Args:
+        model: Linear model, or a search over one.
+        x: Features.
+        y: Targets.
+
+    Returns:
+        The pipeline of a scaler and the model, as the train functions fit it.
+
+    """
+    return Pipeline([
+        ('scaler', StandardScaler().set_output(transform="pandas")),
+        ('model', model),
+    ]).fit(x, y)
+
+
+@mark.parametrize('model', [
+    LinearRegression(),
+    GridSearchCV(ElasticNet(), {'alpha': [0.05, 1], 'l1_ratio': [0.5, 1]}, cv=3),
+])
+def test_regression(candle_data: tuple[DataFrame, DataFrame], model: object, tmp_path: Path) -> None:
+    """
+
+    The compiled regression, also once written and read back, predicts as its pipeline.
+
+    """
+    x, y = candle_data
+    pipeline: Pipeline = fitted(model, x, y)
+
+    assert compilable(pipeline)
+
+    dest: str = str(tmp_path / "model.npz")
+    write(compile_pipeline(pipeline), dest)
+    compiled: CompiledModel = read(dest)
+
+    assert allclose(compiled.predict(x.to_numpy()), pipeline.predict(x))
+    assert allclose(compiled.predict_row(x.iloc[0].to_dict()), pipeline.predict(x.iloc[:1]))
+
+
+def test_logistic(candle_data: tuple[DataFrame, DataFrame]) -> None:
+    """
+
+    The compiled logistic model predicts the classes and probabilities of its pipeline.
+
+    """
+    x, y = candle_data
+    labels: Series = (y['close'] > x['open']).map({True: 'up', False: 'down'})
+    pipeline: Pipeline = fitted(LogisticRegression(), x, labels)
+    compiled: CompiledModel = compile_pipeline(pipeline)
+
+    assert compiled.logistic
+    assert array_equal(compiled.predict(x.to_numpy()), pipeline.predict(x))
+    assert allclose(compiled.predict_proba(x.to_numpy()), pipeline.predict_proba(x))
@@ -0,0 +1,56 @@
+from numpy import logaddexp, ndarray, zeros
+from numpy.random import default_rng
+from pytest import approx
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from Benchmark.synthetic import candles
+
+from .conftest import features
+from .fast_logistic import sgd_fit
+
+
+# Number of synthetic minute candles, several minibatches per epoch
+rows: int = 50_000
+
+# Coefficients and intercept the labels are drawn from
+true_coef: list[float] = [1.0, -0.5, 0.5, 0.0]
+true_intercept: float = 0.2
+
+
+def objective(x: ndarray, y: ndarray, w: ndarray, b: float) -> float:
+    """
+
+    Args:
+        x: Standardized features.
+        y: Labels, 0 or 1.
+        w: Coefficients.
+        b: Intercept.
+
+    Returns:
+        The mean log loss with the L2 penalty of LogisticRegression, for C = 1.
+
+    """
+    z: ndarray = x @ w + b
+
+    return float((logaddexp(0, z) - y * z).mean() + 0.5 * (w @ w) / len(x))
+
+
+def test_sgd_fit() -> None:
+    """
+
+    Cold and warm-started, SGD reaches the minimum of the objective L-BFGS finds.
+
+    """
+    x: ndarray = StandardScaler().fit_transform(candles(rows, default_rng(0))[features].astype(float))
+    y: ndarray = (default_rng(1).random(rows) < expit(x @ true_coef + true_intercept)).astype(float)
+
+    exact: LogisticRegression = LogisticRegression(tol=1e-10, max_iter=10_000).fit(x, y)
+    best: float = objective(x, y, exact.coef_[0], exact.intercept_[0])
+
+    cold_w, cold_b, _ = sgd_fit(x, y, zeros(x.shape[1]), 0.0)
+    warm_w, warm_b, _ = sgd_fit(x, y, exact.coef_[0], exact.intercept_[0])
+
+    assert objective(x, y, cold_w, cold_b) == approx(best, rel=1e-3)
+    assert objective(x, y, warm_w, warm_b) == approx(best, rel=1e-4)
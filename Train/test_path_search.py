@@ -0,0 +1,33 @@
+from numpy import allclose
+from pandas import DataFrame
+from sklearn.linear_model import ElasticNet
+from sklearn.model_selection import GridSearchCV
+from sklearn.preprocessing import StandardScaler
+
+from .elastic_linear import alpha_values
+from .path_search import path_search
+
+
+# Number of folds of the tests
+folds: int = 4
+
+
+def test_path_search(candle_data: tuple[DataFrame, DataFrame]) -> None:
+    """
+
+    The path search scores the grid as GridSearchCV does, and selects the same candidate.
+
+    """
+    x, y = candle_data
+    z: DataFrame = StandardScaler().set_output(transform="pandas").fit_transform(x)
+
+    best, scores = path_search(z.to_numpy(), y.to_numpy(), alpha_values['alpha'], alpha_values['l1_ratio'], folds, 1)
+    grid: GridSearchCV = GridSearchCV(
+        ElasticNet(),
+        alpha_values,
+        scoring='neg_root_mean_squared_error',
+        cv=folds
+    ).fit(z, y)
+
+    assert best == grid.best_params_
+    assert allclose(scores.ravel(), grid.cv_results_['mean_test_score'], rtol=1e-4)
@@ -0,0 +1,43 @@
+from numpy import allclose
+from pandas import DataFrame
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from .sufficient import Moments, to_pipeline
+
+
+def test_merge_remove(candle_data: tuple[DataFrame, DataFrame]) -> None:
+    """
+
+    Statistics merged from two halves, or left once a half is removed, are those of the rows themselves.
+
+    """
+    x, y = (df.to_numpy() for df in candle_data)
+    half: int = len(x) // 2
+
+    whole: Moments = Moments.of(x, y)
+    merged: Moments = Moments.of(x[:half], y[:half]).merge(Moments.of(x[half:], y[half:]))
+    removed: Moments = whole.remove(Moments.of(x[:half], y[:half]))
+    rest: Moments = Moments.of(x[half:], y[half:])
+
+    for a, b in ((merged, whole), (removed, rest)):
+        assert a.n == b.n
+        assert allclose(a.mean_x, b.mean_x) and allclose(a.mean_y, b.mean_y)
+        assert allclose(a.cxx, b.cxx) and allclose(a.cxy, b.cxy)
+
+
+def test_to_pipeline(candle_data: tuple[DataFrame, DataFrame]) -> None:
+    """
+
+    The pipeline solved from the statistics predicts as the pipeline fitted on the rows.
+
+    """
+    x, y = candle_data
+
+    pipeline = to_pipeline(Moments.of(x.to_numpy(), y.to_numpy()), list(x.columns))
+    scaler: StandardScaler = StandardScaler().fit(x)
+    model: LinearRegression = LinearRegression().fit(scaler.transform(x), y)
+
+    assert allclose(pipeline['scaler'].scale_, scaler.scale_)
+    assert allclose(pipeline['model'].coef_, model.coef_)
+    assert allclose(pipeline.predict(x), model.predict(scaler.transform(x)))
@@ -0,0 +1,49 @@
+from numpy import allclose, ndarray, zeros
+from numpy.linalg import lstsq
+from pandas import DataFrame
+from sklearn.linear_model import ElasticNet, LinearRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from . import walk_forward
+
+
+# Number of folds of the tests
+folds: int = 5
+
+# Hyperparameters of the elastic net of the tests
+params: dict = {'alpha': 0.08, 'l1_ratio': 0.5}
+
+
+def test_walk_ols(candle_data: tuple[DataFrame, DataFrame]) -> None:
+    """
+
+    Each fold solved from the grown statistics predicts as a linear regression refitted on its training rows.
+
+    """
+    x, y = (df.to_numpy() for df in candle_data)
+
+    for stats, start, end in walk_forward.walk(x, y, folds):
+        scale, czz, czy = stats.standardized()
+        coef: ndarray = lstsq(czz, czy, rcond=None)[0]
+        refit = make_pipeline(StandardScaler(), LinearRegression()).fit(x[:stats.n], y[:stats.n])
+
+        assert allclose(walk_forward.predict(stats, scale, coef, x[start:end]), refit.predict(x[start:end]))
+
+
+def test_walk_elastic_net(candle_data: tuple[DataFrame, DataFrame]) -> None:
+    """
+
+    Each fold warm-started from the previous one predicts as an elastic net refitted on its training rows.
+
+    """
+    x, y = (df.to_numpy() for df in candle_data)
+    coef: ndarray = zeros((x.shape[1], y.shape[1]))
+
+    for stats, start, end in walk_forward.walk(x, y, folds):
+        scale, czz, czy = stats.standardized()
+        coef = walk_forward.enet_gram(czz / stats.n, czy / stats.n, params['alpha'], params['l1_ratio'], coef)
+        refit = make_pipeline(StandardScaler(), ElasticNet(**params, tol=1e-10, max_iter=100_000))
+        refit.fit(x[:stats.n], y[:stats.n])
+
+        assert allclose(walk_forward.predict(stats, scale, coef, x[start:end]), refit.predict(x[start:end]))
@@ -0,0 +1,236 @@
+from numpy import abs as np_abs, maximum, ndarray, sign, sqrt, zeros
+from numpy.linalg import lstsq
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import brier_score_loss
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.preprocessing import StandardScaler
+from typing import Iterator
+
+from Data import get_split_features
+
+from .elastic_linear import alpha_values, cv_folds
+from .logistic_regression import get_split_data
+from .path_search import path_search
+from .sufficient import Moments
+
+
+# Tolerance of the coordinate descent, on the largest coefficient update relative to the largest coefficient
+enet_tol: float = 1e-6
+
+# Maximum number of coordinate descent sweeps per fold
+enet_max_iter: int = 1000
+
+
+def folds(rows: int, n: int) -> Iterator[tuple[int, int, int]]:
+    """
+
+    Args:
+        rows: Number of rows.
+        n: Number of folds.
+
+    Returns:
+        Iterator over the end of the training rows, and the bounds of the testing rows, of each fold.
+        The same folds as TimeSeriesSplit, whose training rows always start from the first row.
+
+    """
+    for train, test in TimeSeriesSplit(n_splits=n).split(zeros((rows, 1))):
+        yield len(train), int(test[0]), int(test[-1]) + 1
+
+
+def rmse(y_true: ndarray, y_pred: ndarray) -> float:
+    """
+
+    Args:
+        y_true: True targets.
+        y_pred: Predicted targets.
+
+    Returns:
+        The root mean squared error averaged over the targets, as root_mean_squared_error does.
+
+    """
+    return float(sqrt(((y_pred - y_true) ** 2).mean(axis=0)).mean())
+
+
+def walk(x: ndarray, y: ndarray, n: int) -> Iterator[tuple[Moments, int, int]]:
+    """
+
+    Grows the statistics of the training rows from one fold to the next,
+    merging only the rows added since the previous fold.
+
+    Args:
+        x: Features.
+        y: Targets.
+        n: Number of folds.
+
+    Returns:
+        Iterator over the statistics of the training rows, and the bounds of the testing rows, of each fold.
+
+    """
+    stats: Moments = Moments.empty(x.shape[1], y.shape[1])
+    seen: int = 0
+
+    for end, test_start, test_end in folds(len(x), n):
+        stats = stats.merge(Moments.of(x[seen:end], y[seen:end]))
+        seen = end
+
+        yield stats, test_start, test_end
+
+
+def predict(stats: Moments, scale: ndarray, coef: ndarray, x: ndarray) -> ndarray:
+    """
+
+    Args:
+        stats: Statistics of the training rows.
+        scale: Scale of each feature.
+        coef: Coefficients of the standardized features.
+        x: Features.
+
+    Returns:
+        The predicted targets, the intercept being the mean of the targets as the standardized features have zero mean.
+
+    """
+    return ((x - stats.mean_x) / scale) @ coef + stats.mean_y
+
+
+def enet_gram(
+        gram: ndarray,
+        xy: ndarray,
+        alpha: float,
+        l1_ratio: float,
+        coef: ndarray
+) -> ndarray:
+    """
+
+    Cyclic coordinate descent of the ElasticNet objective, written on the Gram matrix so that it never reads the rows.
+    All the targets are updated at once, each has its own coefficients.
+
+    Args:
+        gram: Cross-products of the centered features, divided by the number of rows.
+        xy: Cross-products of the centered features and targets, divided by the number of rows.
+        alpha: Penalty.
+        l1_ratio: Mix of the L1 and L2 penalties.
+        coef: Initial coefficients, one column per target. Updated in place.
+
+    Returns:
+        The coefficients minimizing the objective.
+
+    """
+    l1: float = alpha * l1_ratio
+    l2: float = alpha * (1 - l1_ratio)
+
+    for _ in range(enet_max_iter):
+        w_max: float = 0.0
+        d_max: float = 0.0
+
+        for j in range(len(gram)):
+            prev: ndarray = coef[j].copy()
+
+            # Correlation of feature j with the residual of the other features
+            rho: ndarray = xy[j] - gram[j] @ coef + gram[j, j] * prev
+            coef[j] = sign(rho) * maximum(np_abs(rho) - l1, 0) / (gram[j, j] + l2)
+
+            w_max = max(w_max, float(np_abs(coef[j]).max()))
+            d_max = max(d_max, float(np_abs(coef[j] - prev).max()))
+
+        if w_max == 0 or d_max / w_max < enet_tol:
+            break
+
+    return coef
+
+
+def test_ols(n: int) -> list[float]:
+    """
+
+    Same folds and scores as linear_regression.test. Each fold adds the rows of the previous testing window
+    to the normal equations, a rank-k update, and solves them, instead of refitting on the whole window.
+
+    Args:
+        n: Number of folds.
+
+    Returns:
+        List of root mean squared error scores for each fold.
+
+    """
+    X, y = get_split_features()
+    x: ndarray = X.to_numpy()
+    y_: ndarray = y.to_numpy()
+    res: list[float] = []
+
+    for stats, start, end in walk(x, y_, n):
+        scale, czz, czy = stats.standardized()
+        coef: ndarray = lstsq(czz, czy, rcond=None)[0]
+
+        res.append(rmse(y_[start:end], predict(stats, scale, coef, x[start:end])))
+
+    return res
+
+
+def test_elastic_net(n: int, params: dict | None = None) -> list[float]:
+    """
+
+    Same folds as elastic_linear.test, with fixed hyperparameters.
+    Each fold updates the normal equations as test_ols does, and warm-starts from the coefficients of the previous fold.
+    The scores are not comparable to those of elastic_linear.test, which searches the hyperparameters again on each fold,
+    they are those of a model whose hyperparameters are kept as it is retrained on more rows.
+
+    Args:
+        n: Number of folds.
+        params: Alpha and l1_ratio of the model. By default, they are searched once on the training rows of the first fold,
+            so that no fold is scored with hyperparameters chosen on its own testing rows.
+
+    Returns:
+        List of root mean squared error scores for each fold.
+
+    """
+    X, y = get_split_features()
+    x: ndarray = X.to_numpy()
+    y_: ndarray = y.to_numpy()
+    res: list[float] = []
+
+    if params is None:
+        first: int = next(folds(len(x), n))[0]
+        scaled: ndarray = StandardScaler().fit_transform(x[:first])
+        params, _ = path_search(scaled, y_[:first], alpha_values['alpha'], alpha_values['l1_ratio'], cv_folds)
+
+    coef: ndarray = zeros((x.shape[1], y_.shape[1]))
+
+    for stats, start, end in walk(x, y_, n):
+        scale, czz, czy = stats.standardized()
+        coef = enet_gram(czz / stats.n, czy / stats.n, params['alpha'], params['l1_ratio'], coef)
+
+        res.append(rmse(y_[start:end], predict(stats, scale, coef, x[start:end])))
+
+    return res
+
+
+def test_logistic(n: int) -> list[float]:
+    """
+
+    Same folds and scores as logistic_regression.test. The scaler is updated with the rows added since the previous fold,
+    and the model warm-starts from the coefficients of the previous fold. The L2 objective is the same,
+    solved with L-BFGS instead of SAGA, as it needs only a few iterations from a nearby solution while SAGA does not.
+
+    Args:
+        n: Number of folds.
+
+    Returns:
+        List of brier score loss values for each fold.
+
+    """
+    X, y = get_split_data()
+    x: ndarray = X.to_numpy()
+    res: list[float] = []
+
+    scaler: StandardScaler = StandardScaler()
+    model: LogisticRegression = LogisticRegression(max_iter=400, solver='lbfgs', warm_start=True)
+    seen: int = 0
+
+    for end, start, test_end in folds(len(x), n):
+        scaler.partial_fit(x[seen:end])
+        seen = end
+
+        model.fit(scaler.transform(x[:end]), y[:end])
+
+        res.append(brier_score_loss(y[start:test_end], model.predict(scaler.transform(x[start:test_end]))))
+
+    return res
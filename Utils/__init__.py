@@ -1 +1 @@
-from .utils import convert_to_dataclass, read_json, every, join_jsons, format_sse
+from .utils import convert_to_dataclass, read_json, every, join_jsons, format_sse, lazy_exports
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from functools import reduce
+from importlib import import_module
+from sys import modules
 from threading import Thread
 from time import time, sleep
 from traceback import print_exc
@@ -107,3 +109,37 @@ def format_sse(data: str) -> str:
 
     """
     return f"data: {data}\n\n"
+
+
+def lazy_exports(package: str, exports: dict[str, tuple[str, str]]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+
+    Builds the module __getattr__ and __dir__ of a package whose exports are only imported on first use,
+    so that importing the package does not import its heavy dependencies.
+
+    Args:
+        package: Name of the package.
+        exports: Exported names, along with the submodule defining each (relative to the package)
+            and its name in that submodule.
+
+    Returns:
+        The __getattr__ and __dir__ functions of the package.
+
+    """
+
+    def get_attr(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        module, attr = exports[name]
+        value: Any = getattr(import_module(module, package), attr)
+
+        # Later accesses do not go through __getattr__
+        setattr(modules[package], name, value)
+
+        return value
+
+    def dir_attrs() -> list[str]:
+        return sorted({*vars(modules[package]), *exports})
+
+    return get_attr, dir_attrs
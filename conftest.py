@@ -0,0 +1,13 @@
+from os import chdir, path
+from shutil import copy
+from tempfile import mkdtemp
+
+
+# Root of the repository
+root_path: str = path.dirname(path.realpath(__file__))
+
+# The config is read from the working directory once Config is imported, the tests run with the example one if none is there
+if not path.exists("config.json"):
+    config_dir: str = mkdtemp()
+    copy(path.join(root_path, "example_config.json"), path.join(config_dir, "config.json"))
+    chdir(config_dir)